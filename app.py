@@ -1,459 +1,1033 @@
+import os
+import sys
+import time
+from functools import lru_cache
+
 import dash
-from dash import dcc, html
+from dash import Patch, dash_table, dcc, html
 import dash_bootstrap_components as dbc
-from dash.dependencies import Input, Output
-import pandas as pd
-import plotly.express as px
+from dash.dependencies import MATCH, Input, Output, State
+from flask import Response, abort, g, request
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import numpy as np
+from nvda_analysis import backtest, compact, downsample, instrument, metrics, payload, shared
+from nvda_analysis.figcache import FigureCache, encode_layout, frame_version
+from nvda_analysis.histogram import histogram
+from nvda_analysis.indicators import DEFAULT_COLUMNS, add_indicators
+from nvda_analysis.loader import load_ohlcv
+from nvda_analysis.panel import load_panel
+from nvda_analysis.parallel import compute_parallel
+from nvda_analysis.registry import LazyRegistry, eager_mode
+from nvda_analysis.reload import FileWatcher
+from nvda_analysis.rollup import Rollups
+from nvda_analysis.table import PagedTable
+
+
+# Dữ liệu, figure và layout của từng tab chỉ được dựng khi được dùng lần đầu
+# (ghi nhớ theo từng worker), thay vì dựng tất cả lúc import app.py
+data = LazyRegistry("data")
+figures = LazyRegistry("figures")
+tab_layouts = LazyRegistry("tab_layouts")
+
+# Figure không nằm trong layout của tab: trình duyệt tải JSON đã mã hoá sẵn của từng figure
+# (theo phiên bản dữ liệu, kèm ETag) từ /_figures/<tên>.json. NVDA_FIGURE_CACHE=0 để nhúng
+# figure vào layout như cũ.
+FIGURE_CACHE = os.environ.get("NVDA_FIGURE_CACHE", "1").lower() not in ("0", "false", "no")
+figure_cache = FigureCache()
+
+# Các figure nhiều điểm: dữ liệu gửi lên trình duyệt được giảm theo độ rộng khung nhìn và
+# tổng số điểm tối đa của figure, lấy lại khi zoom. Giá trị: (dữ liệu nguồn, các cột vẽ
+# theo thứ tự trace); cột trong HISTOGRAMS là trace cột, còn lại là trace đường.
+RESAMPLED = {
+    "fig_SMA_EMA": ("df_analysis", ['Close', 'SMA20', 'SMA50', 'EMA20']),
+    "fig_RSI": ("df_analysis", ['RSI']),
+    "fig_volatility": ("df_analysis", ['Volatility']),
+    "fig_bollinger": ("df_analysis", ['Close', 'Upper Band', 'Lower Band']),
+    "fig_macd": ("df_analysis", ['MACD', 'Signal Line', 'MACD Histogram']),
+}
 
+# Trace cột (tô màu theo dấu), tính từ các cột có sẵn nếu df_analysis không có cột đó
+HISTOGRAMS = {
+    "MACD Histogram": lambda df: df['MACD'] - df['Signal Line'],
+}
 
-# Load dữ liệu
-df_raw = pd.read_csv("nvda_stock_data.csv")
-
-df_raw['Date'] = pd.to_datetime(df_raw['Date'], utc=True)
-df_raw.set_index('Date', inplace=True)
-
-fig_raw_candlestick = go.Figure(data=[go.Candlestick(
-    x=df_raw.index,
-    open=df_raw['Open'],
-    high=df_raw['High'],
-    low=df_raw['Low'],
-    close=df_raw['Close'],
-    name='Candlestick'
-)])
-fig_raw_candlestick.update_layout(
-    title='Candlestick Chart for NVDA (1 Year)',
-    title_font=dict(
-        color='white',
-        size=24, 
-        family="Arial, sans-serif", 
-        weight='bold'  
-    ),
-    xaxis_title='Date',
-    yaxis_title='Price (USD)',
-    xaxis_rangeslider_visible=False,
-    plot_bgcolor='black', 
-    paper_bgcolor='black',
-    font=dict(color="white"),
-    xaxis=dict(
-        gridcolor='white', 
-        color='white',   
-        ticks="outside",   
-        ticklen=6, 
-        tickwidth=1,
-    ),
-    yaxis=dict(
-        gridcolor='white',
-        color='white',
-        ticks="outside", 
-        ticklen=6, 
-        tickwidth=2, 
-    ),
-    shapes=[
-        dict(
-            type='line',
-            x0=df_raw.index[0],
-            x1=df_raw.index[-1],
-            y0=df_raw['Low'].min(),
-            y1=df_raw['Low'].min(),
-            line=dict(color='white', width=1)
-        ),
-        dict(
-            type='line',
-            x0=df_raw.index[0],
-            x1=df_raw.index[-1],
-            y0=df_raw['High'].max(),
-            y1=df_raw['High'].max(),
-            line=dict(color='white', width=1)
-        ),
+# Các figure OHLCV vẽ từ bản gộp tính sẵn (nvda_analysis.rollup: 5m/1h/1D/1W/1M) có độ phân
+# giải thô nhất vẫn lấp đầy khung nhìn. Giá trị: (dữ liệu nguồn, các trace theo thứ tự),
+# None nghĩa là một trace nến OHLC, tên cột là một trace (x, y).
+ROLLED = {
+    "fig_raw_candlestick": ("df_raw", [None]),
+    "fig_cleaned_candlestick": ("df_cleaned", [None]),
+    "fig_raw_price_volume": ("df_raw", ['Volume', 'Close']),
+    "fig_cleaned_price_volume": ("df_cleaned", ['Volume', 'Close']),
+}
+
+# Bộ dữ liệu dùng chung giữa các worker (nvda_analysis.shared): khi đặt NVDA_SHARED, worker
+# ánh xạ df_raw, df_cleaned, df_analysis từ thư mục này (ghi bởi python app.py --preload)
+# thay vì tự đọc CSV và tính chỉ số. DATASET_SOURCES: các CSV nguồn của từng bộ dữ liệu
+# (kiểm tra bản ánh xạ còn mới, và là các file được theo dõi để nạp lại dữ liệu).
+SHARED_DIR = os.environ.get("NVDA_SHARED")
+DATASET_SOURCES = {
+    "df_raw": ["nvda_stock_data.csv"],
+    "df_cleaned": ["nvda_stock_data_cleaned.csv"],
+    "df_analysis": ["nvda_stock_data_cleaned.csv"],
+}
+# Phiên bản đã ghi cùng bộ dữ liệu ánh xạ (không cần băm lại dữ liệu)
+shared_versions = {}
+
+
+def rolled_traces(name, x_range=None, width=None):
+    # Nến/cột của bản gộp được chọn, chỉ cắt theo x_range (không gộp lại ở mỗi request)
+    source, columns = ROLLED[name]
+    _, bars = data.get("rollups:" + source).select(x_range, downsample.candle_budget(width))
+    return [
+        dict(x=bars.index, open=bars['Open'], high=bars['High'], low=bars['Low'], close=bars['Close'])
+        if column is None else dict(x=bars.index, y=bars[column])
+        for column in columns
     ]
-)
 
-fig_raw_price_distribution = px.histogram(df_raw, x='Close', nbins=50, title="Price Distribution Chart for NVDA (1 Year)", labels={"Close": "Price (USD)"})
-fig_raw_price_distribution.update_layout(
-    plot_bgcolor='black',
-    paper_bgcolor='black',
-    font_color='white', 
-    title_font=dict(
-        color='white', 
-        size=24, 
-        family="Arial, sans-serif",  
-        weight='bold'  
-    ),
-    xaxis_title="Price (USD)",
-    yaxis_title="Frequency",
-    xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
-    yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
-)
 
-fig_raw_price_volume = go.Figure()
-fig_raw_price_volume.add_trace(go.Bar(
-    x=df_raw.index, 
-    y=df_raw['Volume'], 
-    name='Volume',
-    marker=dict(color='mediumpurple'),
-    yaxis='y' 
-))
-fig_raw_price_volume.add_trace(go.Scatter(
-    x=df_raw.index, 
-    y=df_raw['Close'], 
-    mode='lines', 
-    name='Price (USD)',
-    line=dict(color='deepskyblue'), 
-    yaxis='y2'
-))
-fig_raw_price_volume.update_layout(
-    title="Price and Volume Chart for NVDA (1 Year)",
-    xaxis_title="Date",  # Đảm bảo trục x là 'Date'
-    title_font=dict(
-        color='white',
-        size=24, 
-        family="Arial, sans-serif",
-        weight='bold'
-    ),
-    yaxis=dict(  # Trục Volume
-        title="Volume (Shares)",
-        showgrid=False,
-        side="left"
-    ),
-    yaxis2=dict(  # Trục Price
-        title="Price (USD)",
-        overlaying="y",
-        side="right",
-        showgrid=False
-    ),
-    legend=dict(  # Chỉ khai báo legend 1 lần
-        x=0.9, 
-        y=1.25,
-        xanchor='left',
-        yanchor='top',  
-        bgcolor='rgba(0, 0, 0, 0)',  
-        font=dict(color='white')  
-    ),
-    bargap=0.1,
-    template="plotly_dark",
-    xaxis=dict(
-        title="Date",  # Đảm bảo tiêu đề trục x là 'Date'
-        showgrid=True,
-        gridcolor='rgba(255,255,255,0.2)'  
-    )
-)
+def resampled_traces(name, x_range=None, width=None):
+    # Dữ liệu (x, y hoặc x, open, high, low, close) của từng trace trong khoảng x_range
+    if name in ROLLED:
+        return rolled_traces(name, x_range, width)
+    source, columns = RESAMPLED[name]
+    df = downsample.window(data.get(source), x_range)
+    budget = downsample.figure_budget(len(columns), width)
+    traces = []
+    for column in columns:
+        if column in HISTOGRAMS:
+            # min/max theo nhóm: giữ các cột cao nhất và thấp nhất
+            series = df[column] if column in df else HISTOGRAMS[column](df)
+            x, y = downsample.line(series, budget, method="minmax")
+            traces.append(dict(x=x, y=y, marker=dict(color=np.where(y > 0, 'green', 'red'))))
+        else:
+            x, y = downsample.line(df[column], budget)
+            traces.append(dict(x=x, y=y))
+    return traces
+
+
+def line_type(points):
+    # Trace đường: WebGL (scattergl) khi có nhiều điểm hơn downsample.WEBGL_THRESHOLD
+    return "scattergl" if downsample.use_webgl(points) else "scatter"
+
+
+def line_trace(x, y, **kwargs):
+    trace = go.Scattergl if line_type(len(x)) == "scattergl" else go.Scatter
+    return trace(x=x, y=y, **kwargs)
+
+
+def cached_graph(name, kind="cached-graph"):
+    # Graph rỗng; figure được tải bởi clientside callback load_figure
+    graph_id = {"type": kind, "figure": name}
+    if not FIGURE_CACHE:
+        return dcc.Graph(id=graph_id, figure=payload.optimize(figures.get(name)))
+    return dcc.Graph(id=graph_id)
+
+
+def resampled_graph(name):
+    return cached_graph(name, kind="resampled-graph")
+
+
+def histogram_bar(values, bins=50, **kwargs):
+    # Histogram đếm sẵn ở server: chỉ gửi số đếm và cạnh của từng bin
+    counts, edges = histogram(values, bins)
+    return go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), **kwargs)
+
+
+# Dữ liệu nguồn của từng figure; figure và JSON của nó đổi khi phiên bản dữ liệu này đổi
+FIGURE_SOURCES = {
+    "fig_raw_candlestick": "df_raw",
+    "fig_raw_price_distribution": "df_raw",
+    "fig_raw_price_volume": "df_raw",
+    "fig_cleaned_candlestick": "df_cleaned",
+    "fig_cleaned_price_distribution": "df_cleaned",
+    "fig_cleaned_price_volume": "df_cleaned",
+    "fig_SMA_EMA": "df_analysis",
+    "fig_RSI": "df_analysis",
+    "fig_returns": "df_analysis",
+    "fig_volatility": "df_analysis",
+    "fig_bollinger": "df_analysis",
+    "fig_macd": "df_analysis",
+    "fig_drawdown": "df_analysis",
+    "fig_rolling_risk": "df_analysis",
+}
+
+
+def figure_version(name):
+    return data.get("versions:" + FIGURE_SOURCES[name])
+
+
+def figure_json(name):
+    # Bytes JSON và ETag của figure, mã hoá một lần cho mỗi phiên bản dữ liệu nguồn. Nếu dữ
+    # liệu được thay giữa lúc đọc phiên bản và lúc dựng figure (reload_generation đổi), mục
+    # vừa ghi có thể lệch phiên bản: bỏ và làm lại
+    while True:
+        generation = reload_generation
+        entry = figure_cache.get(name, figure_version(name), lambda: figures.get(name))
+        if generation == reload_generation:
+            return entry
+        figure_cache.invalidate([name])
+
+
+# JSON của layout từng tab kèm phiên bản của các figure trong tab (xem RENDER_TAB)
+tab_cache = FigureCache(max_entries=16, encode=encode_layout, stage_name="tab_encode")
+
+
+def tab_figures(node):
+    # Tên các figure tải qua /_figures/ (Graph có id {"figure": tên}) trong cây component
+    if isinstance(node, (list, tuple)):
+        return [name for child in node for name in tab_figures(child)]
+    graph_id = getattr(node, "id", None)
+    names = [graph_id["figure"]] if isinstance(graph_id, dict) and "figure" in graph_id else []
+    return names + tab_figures(getattr(node, "children", None) or [])
+
+
+def tab_json(tab):
+    # Layout và phiên bản các figure phải cùng một lần nạp dữ liệu (xem figure_json)
+    while True:
+        generation = reload_generation
+        layout = tab_layouts.get(tab)
+        versions = {name: figure_version(name) for name in tab_figures(layout)}
+        key = ",".join(f"{name}={version}" for name, version in sorted(versions.items()))
+        entry = tab_cache.get(tab, key, lambda: {"layout": layout, "versions": versions})
+        if generation == reload_generation:
+            return entry
+        tab_cache.invalidate([tab])
 
-df_cleaned = pd.read_csv("nvda_stock_data_cleaned.csv")
-df_cleaned['Date'] = pd.to_datetime(df_cleaned['Date'], utc=True)
-df_cleaned.set_index('Date', inplace=True)
-df_cleaned_head = df_cleaned.head(1000)
-
-fig_cleaned_candlestick = go.Figure(data=[go.Candlestick(
-    x=df_cleaned.index,
-    open=df_cleaned['Open'],
-    high=df_cleaned['High'],
-    low=df_cleaned['Low'],
-    close=df_cleaned['Close'],
-    name='Candlestick'
-)])
-fig_cleaned_candlestick.update_layout(
-    title='Candlestick Chart for NVDA (1 Year)',
-    title_font=dict(
-        color='white',
-        size=24, 
-        family="Arial, sans-serif", 
-        weight='bold'  
-    ),
-    xaxis_title='Date',
-    yaxis_title='Price (USD)',
-    xaxis_rangeslider_visible=False,
-    plot_bgcolor='black', 
-    paper_bgcolor='black',
-    font=dict(color="white"),
-    xaxis=dict(
-        gridcolor='white', 
-        color='white',   
-        ticks="outside",   
-        ticklen=6, 
-        tickwidth=1,
-    ),
-    yaxis=dict(
-        gridcolor='white',
-        color='white',
-        ticks="outside", 
-        ticklen=6, 
-        tickwidth=2, 
-    ),
-    shapes=[
-        dict(
-            type='line',
-            x0=df_cleaned.index[0],
-            x1=df_cleaned.index[-1],
-            y0=df_cleaned['Low'].min(),
-            y1=df_cleaned['Low'].min(),
-            line=dict(color='white', width=1)
+
+def keep(name, df):
+    # Ghi số byte của bộ dữ liệu giữ trong worker (nvda_dataset_bytes) rồi trả lại df
+    instrument.DATASET_BYTES.set(name, value=compact.frame_bytes(df))
+    return df
+
+
+def open_dataset(name, build):
+    # (df, phiên bản đã ghi): bản ánh xạ dùng chung nếu có và còn mới, ngược lại tự dựng
+    # bằng build() (phiên bản None: tính từ dữ liệu)
+    if SHARED_DIR:
+        attached = shared.attach(SHARED_DIR, name, DATASET_SOURCES[name])
+        if attached is not None:
+            return attached
+    return build(), None
+
+
+def load_dataset(name, build):
+    df, version = open_dataset(name, build)
+    if version is None:
+        shared_versions.pop(name, None)
+    else:
+        shared_versions[name] = version
+    return keep(name, df)
+
+
+def publish_shared():
+    # Tiến trình nạp: dựng các bộ dữ liệu một lần rồi ghi ra SHARED_DIR cho các worker
+    os.makedirs(SHARED_DIR, exist_ok=True)
+    for name, sources in DATASET_SOURCES.items():
+        path = shared.publish(SHARED_DIR, name, data.get(name), data.get("versions:" + name), sources)
+        print(f"{name}: {path}")
+
+
+# Load dữ liệu
+def build_df_raw():
+    # Đọc CSV (lần đầu) hoặc bộ đệm .arrow đã parse sẵn cột Date (các lần sau). df_raw chỉ
+    # dùng để vẽ nên giá cũng ở dạng gọn (nvda_analysis.compact)
+    return compact.compact_frame(load_ohlcv("nvda_stock_data.csv"), display=["Open", "High", "Low", "Close"])
+
+
+@data.register("df_raw")
+def load_df_raw():
+    return load_dataset("df_raw", build_df_raw)
+
+
+@figures.register("fig_raw_candlestick")
+def build_fig_raw_candlestick():
+    df_raw = data.get("df_raw")
+    fig_raw_candlestick = go.Figure(data=[go.Candlestick(
+        **resampled_traces("fig_raw_candlestick")[0],
+        name='Candlestick'
+    )])
+    fig_raw_candlestick.update_layout(
+        title='Candlestick Chart for NVDA (1 Year)',
+        title_font=dict(
+            color='white',
+            size=24, 
+            family="Arial, sans-serif", 
+            weight='bold'  
         ),
-        dict(
-            type='line',
-            x0=df_cleaned.index[0],
-            x1=df_cleaned.index[-1],
-            y0=df_cleaned['High'].max(),
-            y1=df_cleaned['High'].max(),
-            line=dict(color='white', width=1)
+        xaxis_title='Date',
+        yaxis_title='Price (USD)',
+        xaxis_rangeslider_visible=False,
+        plot_bgcolor='black', 
+        paper_bgcolor='black',
+        font=dict(color="white"),
+        xaxis=dict(
+            gridcolor='white', 
+            color='white',   
+            ticks="outside",   
+            ticklen=6, 
+            tickwidth=1,
         ),
-    ]
-)
+        yaxis=dict(
+            gridcolor='white',
+            color='white',
+            ticks="outside", 
+            ticklen=6, 
+            tickwidth=2, 
+        ),
+        shapes=[
+            dict(
+                type='line',
+                x0=df_raw.index[0],
+                x1=df_raw.index[-1],
+                y0=df_raw['Low'].min(),
+                y1=df_raw['Low'].min(),
+                line=dict(color='white', width=1)
+            ),
+            dict(
+                type='line',
+                x0=df_raw.index[0],
+                x1=df_raw.index[-1],
+                y0=df_raw['High'].max(),
+                y1=df_raw['High'].max(),
+                line=dict(color='white', width=1)
+            ),
+        ]
+    )
+    return fig_raw_candlestick
+
+
+@figures.register("fig_raw_price_distribution")
+def build_fig_raw_price_distribution():
+    df_raw = data.get("df_raw")
+    fig_raw_price_distribution = go.Figure(histogram_bar(
+        df_raw['Close'], bins=50, hovertemplate="Price (USD)=%{x}<br>count=%{y}<extra></extra>"
+    ))
+    fig_raw_price_distribution.update_layout(
+        title="Price Distribution Chart for NVDA (1 Year)",
+        bargap=0,
+        plot_bgcolor='black',
+        paper_bgcolor='black',
+        font_color='white', 
+        title_font=dict(
+            color='white', 
+            size=24, 
+            family="Arial, sans-serif",  
+            weight='bold'  
+        ),
+        xaxis_title="Price (USD)",
+        yaxis_title="Frequency",
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
+    )
+    return fig_raw_price_distribution
+
+
+@figures.register("fig_raw_price_volume")
+def build_fig_raw_price_volume():
+    volume, close = resampled_traces("fig_raw_price_volume")
+    fig_raw_price_volume = go.Figure()
+    fig_raw_price_volume.add_trace(go.Bar(
+        **volume,
+        name='Volume',
+        marker=dict(color='mediumpurple'),
+        yaxis='y' 
+    ))
+    fig_raw_price_volume.add_trace(go.Scatter(
+        **close,
+        mode='lines', 
+        name='Price (USD)',
+        line=dict(color='deepskyblue'), 
+        yaxis='y2'
+    ))
+    fig_raw_price_volume.update_layout(
+        title="Price and Volume Chart for NVDA (1 Year)",
+        xaxis_title="Date",  # Đảm bảo trục x là 'Date'
+        title_font=dict(
+            color='white',
+            size=24, 
+            family="Arial, sans-serif",
+            weight='bold'
+        ),
+        yaxis=dict(  # Trục Volume
+            title="Volume (Shares)",
+            showgrid=False,
+            side="left"
+        ),
+        yaxis2=dict(  # Trục Price
+            title="Price (USD)",
+            overlaying="y",
+            side="right",
+            showgrid=False
+        ),
+        legend=dict(  # Chỉ khai báo legend 1 lần
+            x=0.9, 
+            y=1.25,
+            xanchor='left',
+            yanchor='top',  
+            bgcolor='rgba(0, 0, 0, 0)',  
+            font=dict(color='white')  
+        ),
+        bargap=0.1,
+        template="plotly_dark",
+        xaxis=dict(
+            title="Date",  # Đảm bảo tiêu đề trục x là 'Date'
+            showgrid=True,
+            gridcolor='rgba(255,255,255,0.2)'  
+        )
+    )
+    return fig_raw_price_volume
 
-fig_cleaned_price_distribution = px.histogram(df_cleaned, x='Close', nbins=50, title="Price Distribution Chart for NVDA (1 Year)", labels={"Close": "Price (USD)"})
-fig_cleaned_price_distribution.update_layout(
-    plot_bgcolor='black',
-    paper_bgcolor='black',
-    font_color='white', 
-    title_font=dict(
-        color='white', 
-        size=24, 
-        family="Arial, sans-serif",  
-        weight='bold'  
-    ),
-    xaxis_title="Price (USD)",
-    yaxis_title="Frequency",
-    xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
-    yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
-)
 
-fig_cleaned_price_volume = go.Figure()
-fig_cleaned_price_volume.add_trace(go.Bar(
-    x=df_cleaned.index, 
-    y=df_cleaned['Volume'], 
-    name='Volume',
-    marker=dict(color='mediumpurple'),
-    yaxis='y' 
-))
-fig_cleaned_price_volume.add_trace(go.Scatter(
-    x=df_cleaned.index, 
-    y=df_cleaned['Close'], 
-    mode='lines', 
-    name='Price (USD)',
-    line=dict(color='deepskyblue'), 
-    yaxis='y2'
-))
-fig_cleaned_price_volume.update_layout(
-    title="Price and Volume Chart for NVDA (1 Year)",
-    xaxis_title="Date",  # Đảm bảo trục x là 'Date'
-    title_font=dict(
-        color='white',
-        size=24, 
-        family="Arial, sans-serif",
-        weight='bold'
-    ),
-    yaxis=dict(  # Trục Volume
-        title="Volume (Shares)",
-        showgrid=False,
-        side="left"
-    ),
-    yaxis2=dict(  # Trục Price
-        title="Price (USD)",
-        overlaying="y",
-        side="right",
-        showgrid=False
-    ),
-    legend=dict(  # Chỉ khai báo legend 1 lần
-        x=0.9, 
-        y=1.25,
-        xanchor='left',
-        yanchor='top',  
-        bgcolor='rgba(0, 0, 0, 0)',  
-        font=dict(color='white')  
-    ),
-    bargap=0.1,
-    template="plotly_dark",
-    xaxis=dict(
-        title="Date",  # Đảm bảo tiêu đề trục x là 'Date'
-        showgrid=True,
-        gridcolor='rgba(255,255,255,0.2)'  
-    )
-)
+def build_df_cleaned():
+    # Giá giữ float64 (nguồn của chỉ số, backtest và bảng dữ liệu); Volume và các cột sự
+    # kiện doanh nghiệp ở dạng gọn
+    return compact.compact_frame(load_ohlcv("nvda_stock_data_cleaned.csv"))
 
-# 1. Tính SMA, EMA
-# Tính SMA (Simple Moving Average) với khoảng 20 ngày và 50 ngày
-df_cleaned['SMA20'] = df_cleaned['Close'].rolling(window=20).mean()
-df_cleaned['SMA50'] = df_cleaned['Close'].rolling(window=50).mean()
-
-# Tính EMA (Exponential Moving Average) với khoảng 20 ngày
-df_cleaned['EMA20'] = df_cleaned['Close'].ewm(span=20, adjust=False).mean()    
-fig_SMA_EMA = go.Figure()
-fig_SMA_EMA.add_trace(go.Scatter(x=df_cleaned.index, y=df_cleaned['Close'], mode='lines', name='NVDA Close Price', line=dict(color='blue', width=2.75)))
-fig_SMA_EMA.add_trace(go.Scatter(x=df_cleaned.index, y=df_cleaned['SMA20'], mode='lines', name='SMA 20', line=dict(color='orange')))
-fig_SMA_EMA.add_trace(go.Scatter(x=df_cleaned.index, y=df_cleaned['SMA50'], mode='lines', name='SMA 50', line=dict(color='green')))
-fig_SMA_EMA.add_trace(go.Scatter(x=df_cleaned.index, y=df_cleaned['EMA20'], mode='lines', name='EMA 20', line=dict(color='red')))
-fig_SMA_EMA.update_layout(
-    title="NVDA Stock Price with SMA and EMA",
-    title_font=dict(
-        color='white',  
-        size=24,
-        family="Arial, sans-serif", 
-        weight='bold'
-    ),
-    xaxis_title="Date",
-    yaxis_title="Price",
-    hovermode="x unified",
-    template="plotly_dark",
-    xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
-    yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
-)
 
-# 2. Tính RSI (Relative Strength Index)
-delta = df_cleaned['Close'].diff()
-gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-rs = gain / loss
-rsi = 100 - (100 / (1 + rs))
-df_cleaned['RSI'] = rsi
-fig_RSI = go.Figure()
-# Vẽ RSI
-fig_RSI.add_trace(go.Scatter(x=df_cleaned.index, y=df_cleaned['RSI'], mode='lines', name='RSI', line=dict(color='purple', width=2.5)))
-# Vẽ đường Overbought (70) và Oversold (30)
-fig_RSI.add_trace(go.Scatter(x=df_cleaned.index, y=[70]*len(df_cleaned), mode='lines', name='Overbought (70)', line=dict(color='red', dash='dash')))
-fig_RSI.add_trace(go.Scatter(x=df_cleaned.index, y=[30]*len(df_cleaned), mode='lines', name='Oversold (30)', line=dict(color='green', dash='dash')))
-fig_RSI.update_layout(
-    title="RSI of NVDA with Overbought and Oversold Levels",
-    title_font=dict(
-        color='white',
-        size=24,
-        family="Arial, sans-serif",
-        weight='bold'
-    ),
-    xaxis_title="Date",
-    yaxis_title="RSI Value",
-    template="plotly_dark",
-    hovermode="x unified",
-    xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
-    yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
-)
+@data.register("df_cleaned")
+def load_df_cleaned():
+    return load_dataset("df_cleaned", build_df_cleaned)
 
-# 3. Tính lợi suất hàng ngày
-df_cleaned['Return'] = df_cleaned['Close'].pct_change()
-fig_returns = go.Figure()
-
-fig_returns.add_trace(go.Histogram(
-    x=df_cleaned['Return'].dropna(),
-    nbinsx=50,
-    name="Daily Returns",
-    marker_color='blue',
-    opacity=0.75
-))
-fig_returns.add_annotation(
-    x=df_cleaned['Return'].mean(),  
-    y=10,  
-    text="Mean Return",  
-    showarrow=True, 
-    arrowhead=2,
-    ax=0,
-    ay=-50,
-    font=dict(size=12, color="white"),
-    bgcolor="black", 
-)
 
-fig_returns.update_layout(
-    title="Distribution of NVDA Daily Returns",
-    title_font=dict(
-        color='white', 
-        size=24,
-        family="Arial, sans-serif", 
-        weight='bold'
-    ),
-    xaxis_title="Daily Return",
-    yaxis_title="Frequency",
-    template="plotly_dark", 
-    hovermode="closest",
-    xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
-    yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)')
-)
+def dataset_version(source):
+    df = data.get(source)
+    return shared_versions.get(source) or frame_version(df)
 
-# 4. Tính độ biến động (Volatility) theo tháng
-df_cleaned['Volatility'] = df_cleaned['Return'].rolling(window=30).std()  # rolling 30 ngày
-fig_volatility = go.Figure()
-
-# Vẽ biểu đồ độ biến động (Volatility)
-fig_volatility.add_trace(go.Scatter(x=df_cleaned.index, y=df_cleaned['Volatility'], mode='lines', name='30-day Volatility', line=dict(color='red')))
-
-fig_volatility.update_layout(
-    title="Volatility of NVDA Stock Price",
-    title_font=dict(
-        color='white',
-        size=24,
-        family="Arial, sans-serif", 
-        weight='bold'
-    ),
-    xaxis_title="Date",
-    yaxis_title="Volatility",
-    template="plotly_dark",
-    hovermode="x unified",
-    xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
-    yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
-)
 
-df_cleaned['SMA20'] = df_cleaned['Close'].rolling(window=20).mean()
-df_cleaned['Upper Band'] = df_cleaned['SMA20'] + (df_cleaned['Close'].rolling(window=20).std() * 2)
-df_cleaned['Lower Band'] = df_cleaned['SMA20'] - (df_cleaned['Close'].rolling(window=20).std() * 2)
-# Tạo figure mới
-fig_bollinger = go.Figure()
-# Vẽ giá cổ phiếu NVDA
-fig_bollinger.add_trace(go.Scatter(x=df_cleaned.index, y=df_cleaned['Close'], mode='lines', name='NVDA Close Price', line=dict(color='blue', width=2.5)))
-# Vẽ Upper Band và Lower Band
-fig_bollinger.add_trace(go.Scatter(x=df_cleaned.index, y=df_cleaned['Upper Band'], mode='lines', name='Upper Band', line=dict(color='green', dash='dash')))
-fig_bollinger.add_trace(go.Scatter(x=df_cleaned.index, y=df_cleaned['Lower Band'], mode='lines', name='Lower Band', line=dict(color='red', dash='dash')))
-fig_bollinger.update_layout(
-    title="Bollinger Bands of NVDA Stock Price",
-    title_font=dict(
-        color='white',
-        size=24,
-        family="Arial, sans-serif",
-        weight='bold' 
-    ),
-    xaxis_title="Date",
-    yaxis_title="Price",
-    template="plotly_dark",
-    hovermode="x unified",
-    xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
-    yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
-)
+# Phiên bản (mã băm nội dung) của từng bộ dữ liệu nguồn, tính một lần
+for _source in ("df_raw", "df_cleaned", "df_analysis"):
+    data.register("versions:" + _source)(lambda source=_source: dataset_version(source))
 
-# 10. Vẽ biểu đồ MACD và Signal Line
-# Tính MACD và Signal Line
-df_cleaned['EMA12'] = df_cleaned['Close'].ewm(span=12, adjust=False).mean()
-df_cleaned['EMA26'] = df_cleaned['Close'].ewm(span=26, adjust=False).mean()
-df_cleaned['MACD'] = df_cleaned['EMA12'] - df_cleaned['EMA26']
-df_cleaned['Signal Line'] = df_cleaned['MACD'].ewm(span=9, adjust=False).mean()
-
-histogram = df_cleaned['MACD'] - df_cleaned['Signal Line']
-
-# Tạo figure mới
-fig_macd = go.Figure()
-# Vẽ MACD và Signal Line
-fig_macd.add_trace(go.Scatter(x=df_cleaned.index, y=df_cleaned['MACD'], mode='lines', name='MACD', line=dict(color='blue')))
-fig_macd.add_trace(go.Scatter(x=df_cleaned.index, y=df_cleaned['Signal Line'], mode='lines', name='Signal Line', line=dict(color='orange')))
-fig_macd.add_trace(go.Bar(
-    x=df_cleaned.index,
-    y=histogram,
-    name='MACD Histogram',
-    marker_color=np.where(histogram > 0, 'green', 'red'),  # Màu xanh nếu MACD > Signal, ngược lại là đỏ
-    opacity=0.3
-))
-fig_macd.update_layout(
-    title="MACD and Signal Line of NVDA",
-    title_font=dict(
-        color='white',
-        size=24,
-        family="Arial, sans-serif",
-        weight='bold' 
-    ),
-    xaxis_title="Date",
-    yaxis_title="MACD Value",
-    template="plotly_dark", 
-    hovermode="x unified",
-    xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'), 
-    yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)')
-)
+# Bản gộp nến 5m/1h/1D/1W/1M (theo giờ New York) của dữ liệu giá, tính sẵn một lần
+for _source in ("df_raw", "df_cleaned"):
+    data.register("rollups:" + _source)(lambda source=_source: Rollups(data.get(source)))
+
+
+@data.register("table_cleaned")
+def build_table_cleaned():
+    # Bảng phân trang phía server: mỗi request chỉ chuyển các dòng của trang đang xem
+    return PagedTable(data.get("df_cleaned"))
 
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+
+# Các chỉ số kỹ thuật (SMA, EMA, RSI, Return, Volatility, Bollinger, MACD) được tính
+# bởi nvda_analysis.indicators trên bản sao nông của df_cleaned. Ở dạng gọn, EMA12/EMA26
+# (chỉ là bước trung gian của MACD) không được giữ lại, engine không được lưu lại sau khi
+# tính, và các cột chỉ số để vẽ là float32; Return giữ float64 cho các phép tính rủi ro.
+ANALYSIS_COLUMNS = [name for name in DEFAULT_COLUMNS
+                    if not compact.ENABLED or name not in ("EMA12", "EMA26")]
+DISPLAY_COLUMNS = [name for name in ANALYSIS_COLUMNS if name != "Return"]
+
+
+def build_df_analysis(df_cleaned):
+    return compact.compact_frame(
+        add_indicators(df_cleaned, ANALYSIS_COLUMNS, cache=not compact.ENABLED), display=DISPLAY_COLUMNS)
+
+
+@data.register("df_analysis")
+def compute_df_analysis():
+    return load_dataset("df_analysis", lambda: build_df_analysis(data.get("df_cleaned")))
+
+
+# Nhiều mã: mỗi file <MÃ>.csv trong TICKERS_DIR (tải bằng nvda_data_download.ipynb) cùng
+# NVDA đã làm sạch tạo thành một panel (thời gian x mã); chỉ số được tính cho mọi mã
+# trong một lượt, chia cho NVDA_WORKERS tiến trình (mặc định mọi lõi) khi có nhiều mã
+TICKERS_DIR = os.environ.get("NVDA_TICKERS_DIR", os.path.join("data", "tickers"))
+
+
+@data.register("panel_engine")
+def compute_panel_engine():
+    panel = load_panel(TICKERS_DIR, extra={"NVDA": data.get("df_cleaned")})
+    return compute_parallel(panel, workers=int(os.environ.get("NVDA_WORKERS", 0)) or None)
+
+
+# Nạp lại dữ liệu khi đang chạy: một thread nền (nvda_analysis.reload) hỏi các CSV nguồn
+# (và file con trỏ của NVDA_SHARED) mỗi NVDA_RELOAD_INTERVAL giây (mặc định 5, 0 để tắt).
+# Khi có file đổi, các bộ dữ liệu dựng từ nó (chỉ những bộ worker đã nạp) được dựng lại
+# ngoài registry, trong lúc request vẫn dùng bản cũ; bộ nào thật sự khác phiên bản mới được
+# thay, cùng lúc với việc bỏ các mục phụ thuộc (DATASET_DEPENDENTS, figure và layout tab
+# dùng bộ đó) khi giữ khoá của cả ba registry, rồi các figure bị bỏ được dựng lại ngay.
+# Thread được tạo ở request đầu tiên của mỗi worker (start_dataset_watcher), không phải lúc
+# import: tiến trình import app rồi fork ra các worker (gunicorn --preload) không truyền
+# thread sang chúng, còn --preload và các benchmark không cần thread.
+RELOAD_INTERVAL = float(os.environ.get("NVDA_RELOAD_INTERVAL", 5))
+
+# Các mục của data dựng từ từng bộ dữ liệu
+DATASET_DEPENDENTS = {
+    "df_raw": ["rollups:df_raw"],
+    "df_cleaned": ["rollups:df_cleaned", "table_cleaned", "panel_engine"],
+    "df_analysis": [],
+}
+
+# Tăng mỗi lần thay dữ liệu (xem figure_json, tab_json)
+reload_generation = 0
+
+
+# Hàm dựng của các bộ dữ liệu chỉ đọc từ file (df_analysis dựng từ df_cleaned)
+DATASET_BUILDERS = {"df_raw": build_df_raw, "df_cleaned": build_df_cleaned}
+
+
+def watched_files():
+    # Đường dẫn tuyệt đối của file theo dõi -> các bộ dữ liệu dựng từ file đó
+    files = {}
+    for name, sources in DATASET_SOURCES.items():
+        paths = sources + ([shared.pointer_path(SHARED_DIR, name)] if SHARED_DIR else [])
+        for path in paths:
+            files.setdefault(os.path.abspath(path), []).append(name)
+    return files
+
+
+def reload_datasets(names):
+    """Dựng lại và thay các bộ dữ liệu names; trả về tên các figure đã bị bỏ."""
+    global reload_generation
+    new = {}
+    for name in DATASET_SOURCES:
+        if name not in names or not data.is_built(name):
+            continue
+        if name == "df_analysis":
+            cleaned = new["df_cleaned"][0] if "df_cleaned" in new else data.get("df_cleaned")
+            df, stored = open_dataset(name, lambda: build_df_analysis(cleaned))
+        else:
+            df, stored = open_dataset(name, DATASET_BUILDERS[name])
+        version = stored or frame_version(df)
+        if version != data.get("versions:" + name):
+            new[name] = (df, stored, version)
+    if not new:
+        return []
+    stale = [name for name, source in FIGURE_SOURCES.items() if source in new]
+    with tab_layouts.lock, figures.lock, data.lock:
+        tabs = [tab for tab in tab_layouts.keys()
+                if tab_layouts.is_built(tab) and set(tab_figures(tab_layouts.get(tab))) & set(stale)]
+        for name, (df, stored, version) in new.items():
+            data.set(name, keep(name, df))
+            data.set("versions:" + name, version)
+            if stored is None:
+                shared_versions.pop(name, None)
+            else:
+                shared_versions[name] = stored
+            data.invalidate(DATASET_DEPENDENTS[name])
+        figures.invalidate(stale)
+        tab_layouts.invalidate(tabs)
+        figure_cache.invalidate(stale)
+        tab_cache.invalidate(tabs)
+        reload_generation += 1
+    # dựng sẵn các figure vừa bị bỏ, để request đầu tiên không phải chờ
+    for name in stale:
+        if FIGURE_CACHE:
+            figure_json(name)
+        else:
+            figures.get(name)
+    return stale
+
+
+def reload_changed(paths):
+    files = watched_files()
+    reload_datasets({name for path in paths for name in files[os.path.abspath(path)]})
+
+
+dataset_watcher = FileWatcher(list(watched_files()), reload_changed, RELOAD_INTERVAL)
+
+
+@figures.register("fig_cleaned_candlestick")
+def build_fig_cleaned_candlestick():
+    df_cleaned = data.get("df_cleaned")
+    fig_cleaned_candlestick = go.Figure(data=[go.Candlestick(
+        **resampled_traces("fig_cleaned_candlestick")[0],
+        name='Candlestick'
+    )])
+    fig_cleaned_candlestick.update_layout(
+        title='Candlestick Chart for NVDA (1 Year)',
+        title_font=dict(
+            color='white',
+            size=24, 
+            family="Arial, sans-serif", 
+            weight='bold'  
+        ),
+        xaxis_title='Date',
+        yaxis_title='Price (USD)',
+        xaxis_rangeslider_visible=False,
+        plot_bgcolor='black', 
+        paper_bgcolor='black',
+        font=dict(color="white"),
+        xaxis=dict(
+            gridcolor='white', 
+            color='white',   
+            ticks="outside",   
+            ticklen=6, 
+            tickwidth=1,
+        ),
+        yaxis=dict(
+            gridcolor='white',
+            color='white',
+            ticks="outside", 
+            ticklen=6, 
+            tickwidth=2, 
+        ),
+        shapes=[
+            dict(
+                type='line',
+                x0=df_cleaned.index[0],
+                x1=df_cleaned.index[-1],
+                y0=df_cleaned['Low'].min(),
+                y1=df_cleaned['Low'].min(),
+                line=dict(color='white', width=1)
+            ),
+            dict(
+                type='line',
+                x0=df_cleaned.index[0],
+                x1=df_cleaned.index[-1],
+                y0=df_cleaned['High'].max(),
+                y1=df_cleaned['High'].max(),
+                line=dict(color='white', width=1)
+            ),
+        ]
+    )
+    return fig_cleaned_candlestick
+
+
+@figures.register("fig_cleaned_price_distribution")
+def build_fig_cleaned_price_distribution():
+    df_cleaned = data.get("df_cleaned")
+    fig_cleaned_price_distribution = go.Figure(histogram_bar(
+        df_cleaned['Close'], bins=50, hovertemplate="Price (USD)=%{x}<br>count=%{y}<extra></extra>"
+    ))
+    fig_cleaned_price_distribution.update_layout(
+        title="Price Distribution Chart for NVDA (1 Year)",
+        bargap=0,
+        plot_bgcolor='black',
+        paper_bgcolor='black',
+        font_color='white', 
+        title_font=dict(
+            color='white', 
+            size=24, 
+            family="Arial, sans-serif",  
+            weight='bold'  
+        ),
+        xaxis_title="Price (USD)",
+        yaxis_title="Frequency",
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
+    )
+    return fig_cleaned_price_distribution
+
+
+@figures.register("fig_cleaned_price_volume")
+def build_fig_cleaned_price_volume():
+    volume, close = resampled_traces("fig_cleaned_price_volume")
+    fig_cleaned_price_volume = go.Figure()
+    fig_cleaned_price_volume.add_trace(go.Bar(
+        **volume,
+        name='Volume',
+        marker=dict(color='mediumpurple'),
+        yaxis='y' 
+    ))
+    fig_cleaned_price_volume.add_trace(go.Scatter(
+        **close,
+        mode='lines', 
+        name='Price (USD)',
+        line=dict(color='deepskyblue'), 
+        yaxis='y2'
+    ))
+    fig_cleaned_price_volume.update_layout(
+        title="Price and Volume Chart for NVDA (1 Year)",
+        xaxis_title="Date",  # Đảm bảo trục x là 'Date'
+        title_font=dict(
+            color='white',
+            size=24, 
+            family="Arial, sans-serif",
+            weight='bold'
+        ),
+        yaxis=dict(  # Trục Volume
+            title="Volume (Shares)",
+            showgrid=False,
+            side="left"
+        ),
+        yaxis2=dict(  # Trục Price
+            title="Price (USD)",
+            overlaying="y",
+            side="right",
+            showgrid=False
+        ),
+        legend=dict(  # Chỉ khai báo legend 1 lần
+            x=0.9, 
+            y=1.25,
+            xanchor='left',
+            yanchor='top',  
+            bgcolor='rgba(0, 0, 0, 0)',  
+            font=dict(color='white')  
+        ),
+        bargap=0.1,
+        template="plotly_dark",
+        xaxis=dict(
+            title="Date",  # Đảm bảo tiêu đề trục x là 'Date'
+            showgrid=True,
+            gridcolor='rgba(255,255,255,0.2)'  
+        )
+    )
+    return fig_cleaned_price_volume
+
+
+@figures.register("fig_SMA_EMA")
+def build_fig_SMA_EMA():
+    close, sma20, sma50, ema20 = resampled_traces("fig_SMA_EMA")
+    fig_SMA_EMA = go.Figure()
+    fig_SMA_EMA.add_trace(line_trace(**close, mode='lines', name='NVDA Close Price', line=dict(color='blue', width=2.75)))
+    fig_SMA_EMA.add_trace(line_trace(**sma20, mode='lines', name='SMA 20', line=dict(color='orange')))
+    fig_SMA_EMA.add_trace(line_trace(**sma50, mode='lines', name='SMA 50', line=dict(color='green')))
+    fig_SMA_EMA.add_trace(line_trace(**ema20, mode='lines', name='EMA 20', line=dict(color='red')))
+    fig_SMA_EMA.update_layout(
+        title="NVDA Stock Price with SMA and EMA",
+        title_font=dict(
+            color='white',  
+            size=24,
+            family="Arial, sans-serif", 
+            weight='bold'
+        ),
+        xaxis_title="Date",
+        yaxis_title="Price",
+        hovermode="x unified",
+        template="plotly_dark",
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
+    )
+    return fig_SMA_EMA
+
+
+@figures.register("fig_RSI")
+def build_fig_RSI():
+    rsi, = resampled_traces("fig_RSI")
+    fig_RSI = go.Figure()
+    # Vẽ RSI
+    fig_RSI.add_trace(line_trace(**rsi, mode='lines', name='RSI', line=dict(color='purple', width=2.5)))
+    # Vẽ đường Overbought (70) và Oversold (30): shape ngang phủ cả trục x, kể cả khi zoom
+    fig_RSI.add_hline(y=70, line=dict(color='red', dash='dash'), name='Overbought (70)', showlegend=True)
+    fig_RSI.add_hline(y=30, line=dict(color='green', dash='dash'), name='Oversold (30)', showlegend=True)
+    fig_RSI.update_layout(
+        title="RSI of NVDA with Overbought and Oversold Levels",
+        title_font=dict(
+            color='white',
+            size=24,
+            family="Arial, sans-serif",
+            weight='bold'
+        ),
+        xaxis_title="Date",
+        yaxis_title="RSI Value",
+        template="plotly_dark",
+        hovermode="x unified",
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
+    )
+    return fig_RSI
+
+
+@figures.register("fig_returns")
+def build_fig_returns():
+    df_cleaned = data.get("df_analysis")
+    fig_returns = go.Figure()
+
+    fig_returns.add_trace(histogram_bar(
+        df_cleaned['Return'],
+        bins=50,
+        name="Daily Returns",
+        marker_color='blue',
+        opacity=0.75
+    ))
+    fig_returns.add_annotation(
+        x=df_cleaned['Return'].mean(),  
+        y=10,  
+        text="Mean Return",  
+        showarrow=True, 
+        arrowhead=2,
+        ax=0,
+        ay=-50,
+        font=dict(size=12, color="white"),
+        bgcolor="black", 
+    )
+
+    fig_returns.update_layout(
+        title="Distribution of NVDA Daily Returns",
+        title_font=dict(
+            color='white', 
+            size=24,
+            family="Arial, sans-serif", 
+            weight='bold'
+        ),
+        xaxis_title="Daily Return",
+        yaxis_title="Frequency",
+        template="plotly_dark", 
+        hovermode="closest",
+        bargap=0,
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)')
+    )
+    return fig_returns
+
+
+@figures.register("fig_volatility")
+def build_fig_volatility():
+    volatility, = resampled_traces("fig_volatility")
+    fig_volatility = go.Figure()
+
+    # Vẽ biểu đồ độ biến động (Volatility)
+    fig_volatility.add_trace(line_trace(**volatility, mode='lines', name='30-day Volatility', line=dict(color='red')))
+
+    fig_volatility.update_layout(
+        title="Volatility of NVDA Stock Price",
+        title_font=dict(
+            color='white',
+            size=24,
+            family="Arial, sans-serif", 
+            weight='bold'
+        ),
+        xaxis_title="Date",
+        yaxis_title="Volatility",
+        template="plotly_dark",
+        hovermode="x unified",
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
+    )
+    return fig_volatility
+
+
+@figures.register("fig_bollinger")
+def build_fig_bollinger():
+    close, upper, lower = resampled_traces("fig_bollinger")
+    # Tạo figure mới
+    fig_bollinger = go.Figure()
+    # Vẽ giá cổ phiếu NVDA
+    fig_bollinger.add_trace(line_trace(**close, mode='lines', name='NVDA Close Price', line=dict(color='blue', width=2.5)))
+    # Vẽ Upper Band và Lower Band
+    fig_bollinger.add_trace(line_trace(**upper, mode='lines', name='Upper Band', line=dict(color='green', dash='dash')))
+    fig_bollinger.add_trace(line_trace(**lower, mode='lines', name='Lower Band', line=dict(color='red', dash='dash')))
+    fig_bollinger.update_layout(
+        title="Bollinger Bands of NVDA Stock Price",
+        title_font=dict(
+            color='white',
+            size=24,
+            family="Arial, sans-serif",
+            weight='bold' 
+        ),
+        xaxis_title="Date",
+        yaxis_title="Price",
+        template="plotly_dark",
+        hovermode="x unified",
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)') 
+    )
+    return fig_bollinger
+
+
+@figures.register("fig_macd")
+def build_fig_macd():
+    macd, signal, histogram = resampled_traces("fig_macd")
+
+    # Tạo figure mới
+    fig_macd = go.Figure()
+    # Vẽ MACD và Signal Line
+    fig_macd.add_trace(line_trace(**macd, mode='lines', name='MACD', line=dict(color='blue')))
+    fig_macd.add_trace(line_trace(**signal, mode='lines', name='Signal Line', line=dict(color='orange')))
+    # Màu xanh nếu MACD > Signal, ngược lại là đỏ (marker.color của trace)
+    fig_macd.add_trace(go.Bar(
+        **histogram,
+        name='MACD Histogram',
+        opacity=0.3
+    ))
+    fig_macd.update_layout(
+        title="MACD and Signal Line of NVDA",
+        title_font=dict(
+            color='white',
+            size=24,
+            family="Arial, sans-serif",
+            weight='bold' 
+        ),
+        xaxis_title="Date",
+        yaxis_title="MACD Value",
+        template="plotly_dark", 
+        hovermode="x unified",
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'), 
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)')
+    )
+    return fig_macd
+
+
+# Cửa sổ (số phiên) của các chỉ số rủi ro trượt: một quý giao dịch
+RISK_WINDOW = 63
+
+
+@figures.register("fig_drawdown")
+def build_fig_drawdown():
+    df_cleaned = data.get("df_analysis")
+    drawdown = metrics.drawdown(df_cleaned['Return'])
+    duration = metrics.drawdown_duration(df_cleaned['Return'])
+    # min/max theo nhóm để giữ đúng đáy sâu nhất
+    x, y = downsample.line(drawdown, downsample.figure_budget(1), method="minmax")
+    fig_drawdown = go.Figure()
+    fig_drawdown.add_trace(line_trace(
+        x=x, y=y, mode='lines', name='Drawdown', fill='tozeroy',
+        line=dict(color='red'), customdata=duration.reindex(x),
+        hovertemplate="%{y:.1%} (%{customdata} trading days below peak)<extra></extra>"
+    ))
+    # Đánh dấu đáy sâu nhất
+    bottom = drawdown.idxmin()
+    fig_drawdown.add_annotation(
+        x=bottom,
+        y=drawdown[bottom],
+        text=f"Max Drawdown {drawdown[bottom]:.1%}, longest {duration.max()} trading days below peak",
+        showarrow=True,
+        arrowhead=2,
+        font=dict(size=12, color="white"),
+        bgcolor="black",
+    )
+    fig_drawdown.update_layout(
+        title="Drawdown of NVDA from Previous Peak",
+        title_font=dict(
+            color='white',
+            size=24,
+            family="Arial, sans-serif",
+            weight='bold'
+        ),
+        xaxis_title="Date",
+        yaxis_title="Drawdown",
+        yaxis_tickformat=".0%",
+        template="plotly_dark",
+        hovermode="x unified",
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)')
+    )
+    return fig_drawdown
+
+
+@figures.register("fig_rolling_risk")
+def build_fig_rolling_risk():
+    df_cleaned = data.get("df_analysis")
+    periods = metrics.periods_per_year(df_cleaned.index)
+    budget = downsample.figure_budget(2)
+    fig_rolling_risk = go.Figure()
+    for series, color in [(metrics.rolling_sharpe(df_cleaned['Return'], RISK_WINDOW, periods), 'deepskyblue'),
+                          (metrics.rolling_sortino(df_cleaned['Return'], RISK_WINDOW, periods), 'orange')]:
+        x, y = downsample.line(series, budget)
+        fig_rolling_risk.add_trace(line_trace(x=x, y=y, mode='lines', name=series.name, line=dict(color=color)))
+    fig_rolling_risk.add_hline(y=0, line=dict(color='gray', dash='dash'))
+    fig_rolling_risk.update_layout(
+        title=f"Rolling {RISK_WINDOW}-day Sharpe and Sortino Ratios (annualized)",
+        title_font=dict(
+            color='white',
+            size=24,
+            family="Arial, sans-serif",
+            weight='bold'
+        ),
+        xaxis_title="Date",
+        yaxis_title="Ratio",
+        template="plotly_dark",
+        hovermode="x unified",
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)')
+    )
+    return fig_rolling_risk
+
+
+def risk_summary_table():
+    # Bảng các chỉ số rủi ro/lợi nhuận của cả giai đoạn
+    returns = data.get("df_analysis")['Return']
+    stats = metrics.summary(returns, metrics.periods_per_year(returns.index))
+    formats = {"Sharpe Ratio": "{:.2f}", "Sortino Ratio": "{:.2f}", "Calmar Ratio": "{:.2f}",
+               "Max Drawdown Duration": "{:.0f} trading days"}
+    rows = [html.Tr([html.Td(name), html.Td(formats.get(name, "{:.1%}").format(value), className="text-end")])
+            for name, value in stats.items()]
+    return dbc.Table(html.Tbody(rows), bordered=False, color="dark", size="sm", className="mb-0")
+
+
+@lru_cache(maxsize=32)
+def build_ticker_figure(symbol, version):
+    # Giá + SMA/Bollinger, RSI và MACD của một mã, đọc từ panel đã tính sẵn
+    df = data.get("panel_engine").frame(symbol)
+    budget = downsample.figure_budget(8)
+    fig = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.05, row_heights=[0.6, 0.2, 0.2])
+    for column, color, dash_style in [('Close', 'deepskyblue', None), ('SMA20', 'orange', None), ('SMA50', 'green', None),
+                                      ('Upper Band', 'gray', 'dash'), ('Lower Band', 'gray', 'dash')]:
+        x, y = downsample.line(df[column], budget)
+        fig.add_trace(line_trace(x=x, y=y, mode='lines', name=column, line=dict(color=color, dash=dash_style)), row=1, col=1)
+    x, y = downsample.line(df['RSI'], budget)
+    fig.add_trace(line_trace(x=x, y=y, mode='lines', name='RSI', line=dict(color='purple')), row=2, col=1)
+    fig.add_hline(y=70, line=dict(color='red', dash='dash'), row=2, col=1)
+    fig.add_hline(y=30, line=dict(color='green', dash='dash'), row=2, col=1)
+    for column, color in [('MACD', 'blue'), ('Signal Line', 'orange')]:
+        x, y = downsample.line(df[column], budget)
+        fig.add_trace(line_trace(x=x, y=y, mode='lines', name=column, line=dict(color=color)), row=3, col=1)
+    fig.update_layout(
+        title=f"{symbol}: Price, Bollinger Bands, RSI and MACD",
+        title_font=dict(
+            color='white',
+            size=24,
+            family="Arial, sans-serif",
+            weight='bold'
+        ),
+        height=800,
+        template="plotly_dark",
+        hovermode="x unified",
+    )
+    fig.update_xaxes(showgrid=True, gridcolor='rgba(255,255,255,0.2)')
+    fig.update_yaxes(showgrid=True, gridcolor='rgba(255,255,255,0.2)')
+    fig.update_yaxes(title_text="Price", row=1, col=1)
+    fig.update_yaxes(title_text="RSI", row=2, col=1)
+    fig.update_yaxes(title_text="MACD", row=3, col=1)
+    return payload.optimize(fig)
+
+
+@lru_cache(maxsize=16)
+def run_backtest_sweep(strategy, version):
+    # Quét toàn bộ lưới tham số của một chiến lược trên giá đóng cửa đã làm sạch
+    return backtest.sweep(data.get("df_cleaned")['Close'], strategy)
+
+
+@lru_cache(maxsize=32)
+def build_backtest_figure(strategy, metric, version):
+    # Heatmap của metric theo hai tham số đầu (tốt nhất qua các tham số còn lại) và đường vốn
+    result = run_backtest_sweep(strategy, version)
+    close = data.get("df_cleaned")['Close']
+    names = list(result.axes)
+    fig = make_subplots(rows=1, cols=2, column_widths=[0.45, 0.55], horizontal_spacing=0.08,
+                        subplot_titles=[f"{metric} by {names[0]} x {names[1]}", "Equity (start = 1)"])
+    fig.add_trace(go.Heatmap(
+        z=result.surface(metric), y=result.axes[names[0]], x=result.axes[names[1]],
+        colorscale='RdYlGn', colorbar=dict(title=metric, x=0.43),
+        hovertemplate=f"{names[0]}=%{{y}}<br>{names[1]}=%{{x}}<br>{metric}=%{{z:.3f}}<extra></extra>"
+    ), row=1, col=1)
+    current = backtest.DASHBOARD_PARAMS[strategy]
+    fig.add_trace(go.Scatter(
+        x=[current[names[1]]], y=[current[names[0]]], mode='markers', name='Dashboard setting',
+        marker=dict(symbol='x', size=12, color='white'), showlegend=False
+    ), row=1, col=1)
+    best = result.best(metric)
+    curves = [("Buy & Hold", close / close.iloc[0], 'gray'),
+              ("Dashboard setting", backtest.backtest(close, strategy), 'deepskyblue')]
+    if best is not None:
+        label = "Best: " + ", ".join(f"{k}={v:g}" for k, v in best.items())
+        curves.append((label, backtest.backtest(close, strategy, best), 'orange'))
+    for name, equity, color in curves:
+        fig.add_trace(go.Scatter(x=equity.index, y=equity, mode='lines', name=name, line=dict(color=color)), row=1, col=2)
+    fig.update_layout(
+        title=f"{backtest.STRATEGY_LABELS[strategy]}: {len(result):,} parameter combinations",
+        title_font=dict(
+            color='white',
+            size=24,
+            family="Arial, sans-serif",
+            weight='bold'
+        ),
+        height=550,
+        template="plotly_dark",
+        legend=dict(orientation="h", y=-0.15)
+    )
+    fig.update_xaxes(title_text=names[1], row=1, col=1)
+    fig.update_yaxes(title_text=names[0], row=1, col=1)
+    fig.update_xaxes(showgrid=True, gridcolor='rgba(255,255,255,0.2)', row=1, col=2)
+    fig.update_yaxes(showgrid=True, gridcolor='rgba(255,255,255,0.2)', row=1, col=2)
+    return payload.optimize(fig)
+
+
+# Một số component (bảng dữ liệu, ...) chỉ xuất hiện khi mở tab tương ứng
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], suppress_callback_exceptions=True)
 
 # # Header
 # header = dbc.Navbar(
@@ -675,8 +1249,10 @@ def tab_content(title, text):
         html.P(text, className="text-center")
     ], style={"backgroundColor": "#ffffff", "padding": "30px"})
 
-tab_layouts = {
-   "Introduction": html.Div([
+
+@tab_layouts.register("Introduction")
+def layout_introduction():
+    return html.Div([
 
         # Khung 1 - Chứa text
         dbc.Card([
@@ -752,9 +1328,12 @@ tab_layouts = {
             ])
         ], style={"backgroundColor": "black", "marginBottom": "20px", "padding": "20px"}),
 
-    ], style={"padding": "20px"}),
+    ], style={"padding": "20px"})
 
-    "Data Processing": html.Div([
+
+@tab_layouts.register("Data Processing")
+def layout_data_processing():
+    return html.Div([
 
         # Khung 1 - thu thập dữ liệu
         dbc.Card([
@@ -809,19 +1388,19 @@ tab_layouts = {
         dbc.Row([
             dbc.Col(dbc.Card([
                 dbc.CardBody([
-                    dcc.Graph(figure=fig_raw_candlestick)
+                    resampled_graph("fig_raw_candlestick")
                 ])
             ], style={"backgroundColor": "black", "height": "auto", "marginBottom": "20px"}), width=6),
             
             dbc.Col(dbc.Card([
                 dbc.CardBody([
-                    dcc.Graph(figure=fig_raw_price_distribution)
+                    cached_graph("fig_raw_price_distribution")
                 ])
             ], style={"backgroundColor": "black", "height": "auto", "marginBottom": "20px"}), width=6),
         ]),
         dbc.Card([
             dbc.CardBody([
-                dcc.Graph(figure=fig_raw_price_volume)
+                resampled_graph("fig_raw_price_volume")
             ])
         ], style={"marginBottom": "20px", "backgroundColor": "black"}),
 
@@ -884,46 +1463,51 @@ tab_layouts = {
         ], style={"marginBottom": "20px", "backgroundColor": "black"}),
 
         html.H1("A Portion of the Cleaned NVDA Stock Data", style={'textAlign': 'center'}),  # Tiêu đề
-        html.Table(
-            # Tạo bảng từ DataFrame
-            # Dùng các cột làm tiêu đề
-            # Tạo các dòng dữ liệu từ DataFrame
-            [html.Tr([html.Th(col) for col in df_cleaned_head.columns])] +
-            [html.Tr([html.Td(df_cleaned_head.iloc[i][col]) for col in df_cleaned_head.columns]) for i in range(len(df_cleaned_head))],
-            style={
-                'width': '100%',
-                'border-collapse': 'collapse',  # Đảm bảo bảng không bị dính vào nhau
-                'border': '1px solid black',  # Đường viền của bảng
-                'margin': '20px auto',  # Căn giữa bảng
-                'padding': '10px',  # Khoảng cách giữa các ô
-            },
+        dash_table.DataTable(
+            # Dữ liệu được lọc, sắp xếp và phân trang phía server (callback update_cleaned_table)
+            id="cleaned-table",
+            columns=data.get("table_cleaned").columns(),
+            page_current=0,
+            page_size=25,
+            page_action="custom",
+            sort_action="custom",
+            sort_mode="multi",
+            sort_by=[],
+            filter_action="custom",
+            filter_query="",
+            style_table={'width': '100%', 'overflowX': 'auto', 'margin': '20px auto'},
+            style_cell={'border': '1px solid black', 'padding': '10px', 'textAlign': 'left'},
+            style_header={'fontWeight': 'bold'},
         ),
             
-    ], style={"padding": "20px"}),
+    ], style={"padding": "20px"})
 
-    "Data Analysis": html.Div([
+
+@tab_layouts.register("Data Analysis")
+def layout_data_analysis():
+    return html.Div([
         # Dữ liệu sau khi làm sạch
         dbc.Card([
             dbc.CardBody([
                 html.H2("The Cleaned NVDA Stock Data", className="text-white"),
                 html.P("Data Following Cleaning and Preprocessing.", className="text-white"),
-                # dcc.Graph(figure=fig_raw_candlestick)
+                # dcc.Graph(figure=figures.get("fig_raw_candlestick"))
                 dbc.Row([
                     dbc.Col(dbc.Card([
                         dbc.CardBody([
-                            dcc.Graph(figure=fig_cleaned_candlestick)
+                            resampled_graph("fig_cleaned_candlestick")
                         ])
                     ], style={"backgroundColor": "black", "height": "auto", "marginBottom": "20px"}), width=6),
                     
                     dbc.Col(dbc.Card([
                         dbc.CardBody([
-                            dcc.Graph(figure=fig_cleaned_price_distribution)
+                            cached_graph("fig_cleaned_price_distribution")
                         ])
                     ], style={"backgroundColor": "black", "height": "auto", "marginBottom": "20px"}), width=6),
                 ]),
                 dbc.Card([
                     dbc.CardBody([
-                        dcc.Graph(figure=fig_cleaned_price_volume)
+                        resampled_graph("fig_cleaned_price_volume")
                     ])
                 ], style={"marginBottom": "20px", "backgroundColor": "black"}),
             ])
@@ -978,7 +1562,7 @@ tab_layouts = {
                         # Phần bên phải: Logo
                         dbc.Card([
                             dbc.CardBody([
-                                dcc.Graph(figure=fig_SMA_EMA)
+                                resampled_graph("fig_SMA_EMA")
                             ])
                         ], style={
                             "marginBottom": "20px",
@@ -1048,7 +1632,7 @@ tab_layouts = {
                         # Phần bên phải: Logo
                         dbc.Card([
                             dbc.CardBody([
-                                dcc.Graph(figure=fig_RSI)
+                                resampled_graph("fig_RSI")
                             ])
                         ], style={
                             "marginBottom": "20px",
@@ -1069,30 +1653,67 @@ tab_layouts = {
             dbc.Row([
                 dbc.Col(dbc.Card([
                     dbc.CardBody([
-                        dcc.Graph(figure=fig_returns)
+                        cached_graph("fig_returns")
                     ])
                 ], style={"backgroundColor": "black", "height": "auto", "marginBottom": "20px"}), width=6),
                 
                 dbc.Col(dbc.Card([
                     dbc.CardBody([
-                        dcc.Graph(figure=fig_volatility)
+                        resampled_graph("fig_volatility")
                     ])
                 ], style={"backgroundColor": "black", "height": "auto", "marginBottom": "20px"}), width=6),
             ]),
             dbc.Card([
                 dbc.CardBody([
-                    dcc.Graph(figure=fig_bollinger)
+                    resampled_graph("fig_bollinger")
                 ])
             ], style={"marginBottom": "20px", "backgroundColor": "black"}),
             dbc.Card([
                 dbc.CardBody([
-                    dcc.Graph(figure=fig_macd)
+                    resampled_graph("fig_macd")
+                ])
+            ], style={"marginBottom": "20px", "backgroundColor": "black"}),
+            # Rủi ro: drawdown, Sharpe/Sortino trượt và bảng chỉ số của cả giai đoạn
+            dbc.Row([
+                dbc.Col(dbc.Card([
+                    dbc.CardBody([
+                        html.H4("Risk & Return Metrics", className="text-white"),
+                        risk_summary_table()
+                    ])
+                ], style={"backgroundColor": "black", "height": "100%", "marginBottom": "20px"}), width=4),
+
+                dbc.Col(dbc.Card([
+                    dbc.CardBody([
+                        cached_graph("fig_drawdown")
+                    ])
+                ], style={"backgroundColor": "black", "height": "auto", "marginBottom": "20px"}), width=8),
+            ], className="mb-3"),
+            dbc.Card([
+                dbc.CardBody([
+                    cached_graph("fig_rolling_risk")
+                ])
+            ], style={"marginBottom": "20px", "backgroundColor": "black"}),
+            # Chọn mã: đọc từ panel nhiều mã đã tính sẵn chỉ số
+            dbc.Card([
+                dbc.CardBody([
+                    html.H2("Ticker Explorer", className="text-white"),
+                    dcc.Dropdown(
+                        id="ticker-select",
+                        options=data.get("panel_engine").panel.symbols,
+                        value="NVDA",
+                        clearable=False,
+                        style={"width": "300px", "marginBottom": "10px"}
+                    ),
+                    dcc.Graph(id="ticker-graph")
                 ])
             ], style={"marginBottom": "20px", "backgroundColor": "black"}),
     
-        ], style={"padding": "20px"}),
-    
-    "Interpretation & Conclusing": html.Div([
+        ], style={"padding": "20px"})
+
+
+@tab_layouts.register("Interpretation & Conclusing")
+def layout_interpretation():
+    return html.Div([
         # diễn giải
         dbc.Card([
             dbc.CardBody([
@@ -1138,7 +1759,7 @@ tab_layouts = {
                         # Phần bên phải: Logo
                         dbc.Card([
                             dbc.CardBody([
-                                dcc.Graph(figure=fig_SMA_EMA)
+                                resampled_graph("fig_SMA_EMA")
                             ])
                         ], style={
                             "marginBottom": "20px",
@@ -1160,7 +1781,7 @@ tab_layouts = {
                         # Phần bên trái: Biểu đồ
                         dbc.Card([ 
                             dbc.CardBody([ 
-                                dcc.Graph(figure=fig_RSI)
+                                resampled_graph("fig_RSI")
                             ])
                         ], style={
                             "marginBottom": "20px",
@@ -1257,7 +1878,7 @@ tab_layouts = {
                         # Phần bên phải: Logo
                         dbc.Card([
                             dbc.CardBody([
-                                dcc.Graph(figure=fig_returns)
+                                cached_graph("fig_returns")
                             ])
                         ], style={
                             "marginBottom": "20px",
@@ -1279,7 +1900,7 @@ tab_layouts = {
                         # Phần bên trái: Biểu đồ
                         dbc.Card([ 
                             dbc.CardBody([ 
-                                dcc.Graph(figure=fig_volatility)
+                                resampled_graph("fig_volatility")
                             ])
                         ], style={
                             "marginBottom": "20px",
@@ -1372,7 +1993,7 @@ tab_layouts = {
                         # Phần bên phải: Logo
                         dbc.Card([
                             dbc.CardBody([
-                                dcc.Graph(figure=fig_bollinger)
+                                resampled_graph("fig_bollinger")
                             ])
                         ], style={
                             "marginBottom": "20px",
@@ -1394,7 +2015,7 @@ tab_layouts = {
                         # Phần bên trái: Biểu đồ
                         dbc.Card([ 
                             dbc.CardBody([ 
-                                dcc.Graph(figure=fig_macd)
+                                resampled_graph("fig_macd")
                             ])
                         ], style={
                             "marginBottom": "20px",
@@ -1451,6 +2072,30 @@ tab_layouts = {
             ]),
 
         ], style={"marginBottom": "20px", "backgroundColor": "black"}),
+
+        # Backtest các tín hiệu ở trên trên toàn bộ lưới tham số
+        dbc.Card([
+            dbc.CardBody([
+                html.H4("Strategy Backtest", className="card-title fw-bold text-white"),
+                html.Div([
+                    dcc.Dropdown(
+                        id="backtest-strategy",
+                        options=[{"label": label, "value": key} for key, label in backtest.STRATEGY_LABELS.items()],
+                        value="sma",
+                        clearable=False,
+                        style={"width": "480px"}
+                    ),
+                    dcc.Dropdown(
+                        id="backtest-metric",
+                        options=list(backtest.METRICS),
+                        value="sharpe",
+                        clearable=False,
+                        style={"width": "200px"}
+                    ),
+                ], style={"display": "flex", "gap": "10px", "marginBottom": "10px"}),
+                dcc.Graph(id="backtest-graph")
+            ])
+        ], style={"marginBottom": "20px", "backgroundColor": "black"}),
         
         dbc.Card(
             dbc.CardBody([
@@ -1480,9 +2125,12 @@ tab_layouts = {
             }
         )
     
-        ], style={"padding": "20px"}),
+        ], style={"padding": "20px"})
+
 
-    "Future Works": html.Div([
+@tab_layouts.register("Future Works")
+def layout_future_works():
+    return html.Div([
 
         dbc.Card(
             dbc.CardBody([
@@ -1515,8 +2163,26 @@ tab_layouts = {
             }
         )
 
-    ], style={"padding": "20px"}),
-}
+    ], style={"padding": "20px"})
+
+
+if eager_mode():
+    # Chế độ cũ: dựng toàn bộ figure và layout ngay lúc import
+    figures.build_all()
+    tab_layouts.build_all()
+    if FIGURE_CACHE:
+        for _name in FIGURE_SOURCES:
+            figure_json(_name)
+
+
+def __getattr__(name):
+    # Giữ tương thích với code cũ dùng app.fig_SMA_EMA, app.df_cleaned...
+    if name in figures:
+        return figures.get(name)
+    if name in data:
+        return data.get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Nội dung
 tab_contents = html.Div(
@@ -1533,16 +2199,283 @@ app.layout = html.Div([
     header,
     logo,
     tabs_bar,
-    tab_contents
+    tab_contents,
+    dcc.Store(id="viewport-width"),
+    # Phiên bản dữ liệu của các figure trong tab đang mở: {tên figure: phiên bản}
+    dcc.Store(id="figure-versions"),
+    # Phiên bản các bộ dữ liệu, chỉ đổi khi server đã nạp dữ liệu mới (xem POLL_DATASETS)
+    dcc.Store(id="dataset-token"),
+    *([dcc.Interval(id="dataset-poll", interval=int(RELOAD_INTERVAL * 1000))] if RELOAD_INTERVAL > 0 else [])
 ])
 
-# Callback
-@app.callback(
-    Output("tab-content", "children"),
+# Độ rộng cửa sổ trình duyệt, dùng để tính số điểm tối đa của các figure nhiều điểm
+app.clientside_callback(
+    "function(tab) { return window.innerWidth; }",
+    Output("viewport-width", "data"),
     Input("tabs", "value")
 )
-def render_content(tab):
-    return tab_layouts.get(tab, html.P("Tab không tồn tại.", className="text-center"))
+
+# JSON đã mã hoá của figure; trình duyệt gửi If-None-Match và nhận 304 nếu không đổi
+@app.server.route(app.config.routes_pathname_prefix + "_figures/<name>.json")
+def serve_figure(name):
+    if name not in FIGURE_SOURCES:
+        abort(404)
+    entry = figure_json(name)
+    response = Response(entry.body, mimetype="application/json")
+    response.set_etag(entry.etag)
+    if request.args.get("v") == figure_version(name):
+        # URL có đúng phiên bản hiện tại: nội dung không bao giờ đổi, trình duyệt giữ luôn
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        # luôn hỏi lại server (rẻ: chỉ so ETag), để dữ liệu mới được tải ngay khi có
+        response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+
+def dataset_token():
+    return ",".join(data.get("versions:" + name) for name in DATASET_SOURCES)
+
+
+@app.server.route(app.config.routes_pathname_prefix + "_datasets.json")
+def serve_datasets():
+    response = Response(f'{{"token": "{dataset_token()}"}}', mimetype="application/json")
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@app.server.before_request
+def start_dataset_watcher():
+    # Một thread mỗi tiến trình (FileWatcher.start kiểm tra pid), tạo ở request đầu tiên
+    if RELOAD_INTERVAL > 0:
+        dataset_watcher.start()
+
+
+@app.server.route(app.config.routes_pathname_prefix + "_tabs/<tab>.json")
+def serve_tab(tab):
+    if tab not in tab_layouts:
+        abort(404)
+    entry = tab_json(tab)
+    response = Response(entry.body, mimetype="application/json")
+    response.set_etag(entry.etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+
+# Số liệu đo (nvda_analysis.instrument): thời gian/bộ nhớ của từng đoạn xử lý, độ trễ và kích
+# thước response của từng callback Dash và các request khác, xuất ở /metrics theo định dạng
+# text của Prometheus
+DASH_UPDATE = app.config.routes_pathname_prefix + "_dash-update-component"
+
+
+@app.server.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.server.after_request
+def record_request(response):
+    start = g.pop("request_start", None)
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    # file tĩnh (direct_passthrough) không đọc được body: dùng Content-Length
+    size = (response.content_length if response.direct_passthrough else response.calculate_content_length()) or 0
+    if request.path == DASH_UPDATE:
+        # "output" là id.thuộc_tính của output, giống nhau giữa các lần gọi của một callback
+        body = request.get_json(silent=True) or {}
+        instrument.observe_request(body.get("output", "unknown"), elapsed, size)
+    else:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        instrument.observe_http(route, response.status_code, elapsed, size)
+    return response
+
+
+@app.server.route(app.config.routes_pathname_prefix + "metrics")
+def serve_metrics():
+    return Response(instrument.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# NVDA_PROFILER=1 bật /_profile?seconds=10: lấy mẫu stack của mọi thread trong 10 giây, trả về
+# dạng collapsed stacks (đọc bằng flamegraph.pl hoặc speedscope)
+PROFILER = os.environ.get("NVDA_PROFILER", "0").lower() in ("1", "true", "yes")
+profiler = instrument.SamplingProfiler()
+
+
+@app.server.route(app.config.routes_pathname_prefix + "_profile")
+def serve_profile():
+    if not PROFILER:
+        abort(404)
+    if profiler.running:
+        abort(409)
+    seconds = min(request.args.get("seconds", 10.0, type=float), 300.0)
+    return Response(profiler.profile(seconds), mimetype="text/plain")
+
+
+# Bộ nhớ đệm trong trình duyệt, giữ suốt phiên: layout của mỗi tab tải từ /_tabs/<tab>.json
+# một lần (chuyển tab sau đó không gọi server), mỗi figure tải một lần cho mỗi phiên bản dữ
+# liệu (khoá tên@phiên_bản, dùng chung giữa các tab có cùng figure). Lưu văn bản JSON và
+# parse lại mỗi lần dùng: plotly.js sửa trực tiếp figure được truyền vào. Request lỗi bị
+# xoá khỏi bộ đệm để lần sau tải lại.
+RENDER_TAB = """
+function(tab, token) {
+    var tabs = window.nvdaTabs = window.nvdaTabs || {};
+    if (!tabs[tab]) {
+        tabs[tab] = fetch("%s" + encodeURIComponent(tab) + ".json").then(function(response) {
+            if (!response.ok) { throw new Error("HTTP " + response.status); }
+            return response.text();
+        });
+        tabs[tab].catch(function() { delete tabs[tab]; });
+    }
+    return tabs[tab].then(function(text) {
+        var payload = JSON.parse(text);
+        return [payload.layout, payload.versions];
+    });
+}
+""" % app.get_relative_path("/_tabs/")
+
+# Tải figure cho các Graph vừa xuất hiện trong tab (Input là id: chỉ chạy một lần khi render)
+LOAD_FIGURE = """
+function(id, versions) {
+    var figures = window.nvdaFigures = window.nvdaFigures || {};
+    var version = (versions || {})[id.figure] || "";
+    var key = id.figure + "@" + version;
+    if (!figures[key]) {
+        var url = "%s" + encodeURIComponent(id.figure) + ".json?v=" + encodeURIComponent(version);
+        figures[key] = fetch(url).then(function(response) {
+            if (!response.ok) { throw new Error("HTTP " + response.status); }
+            return response.text();
+        });
+        figures[key].catch(function() { delete figures[key]; });
+    }
+    return figures[key].then(JSON.parse);
+}
+""" % app.get_relative_path("/_figures/")
+
+
+# Hỏi /_datasets.json định kỳ; khi phiên bản dữ liệu khác lần trước, bỏ bộ đệm của trình
+# duyệt và đổi dataset-token để RENDER_TAB/render_content vẽ lại tab đang mở. Lần hỏi đầu chỉ
+# ghi nhận phiên bản hiện tại.
+POLL_DATASETS = """
+function(n) {
+    return fetch("%s").then(function(response) {
+        if (!response.ok) { throw new Error("HTTP " + response.status); }
+        return response.json();
+    }).then(function(payload) {
+        var known = window.nvdaDatasets;
+        window.nvdaDatasets = payload.token;
+        if (known === undefined || known === payload.token) {
+            return window.dash_clientside.no_update;
+        }
+        window.nvdaTabs = {};
+        window.nvdaFigures = {};
+        return payload.token;
+    }).catch(function() { return window.dash_clientside.no_update; });
+}
+""" % app.get_relative_path("/_datasets.json")
+
+if RELOAD_INTERVAL > 0:
+    app.clientside_callback(
+        POLL_DATASETS,
+        Output("dataset-token", "data"),
+        Input("dataset-poll", "n_intervals")
+    )
+
+
+def render_content(tab, token=None):
+    # Layout của tab (và các figure bên trong) được dựng ở lần mở tab đầu tiên
+    if tab not in tab_layouts:
+        return html.P("Tab không tồn tại.", className="text-center")
+    return tab_layouts.get(tab)
+
+
+if FIGURE_CACHE:
+    app.clientside_callback(
+        RENDER_TAB,
+        Output("tab-content", "children"),
+        Output("figure-versions", "data"),
+        Input("tabs", "value"),
+        Input("dataset-token", "data")
+    )
+    for _kind in ("cached-graph", "resampled-graph"):
+        app.clientside_callback(
+            LOAD_FIGURE,
+            Output({"type": _kind, "figure": MATCH}, "figure"),
+            Input({"type": _kind, "figure": MATCH}, "id"),
+            State("figure-versions", "data")
+        )
+else:
+    # Figure nằm trong layout: layout dựng ở server mỗi lần chuyển tab như cũ
+    app.callback(
+        Output("tab-content", "children"),
+        Input("tabs", "value"),
+        Input("dataset-token", "data")
+    )(render_content)
+
+
+@app.callback(
+    Output({"type": "resampled-graph", "figure": MATCH}, "figure", allow_duplicate=True),
+    Input({"type": "resampled-graph", "figure": MATCH}, "relayoutData"),
+    State({"type": "resampled-graph", "figure": MATCH}, "id"),
+    State("viewport-width", "data"),
+    prevent_initial_call=True
+)
+def resample_on_zoom(relayout, graph_id, width):
+    # Zoom/reset trục x: lấy lại dữ liệu của khoảng đang xem, chỉ gửi phần data thay đổi
+    x_range = downsample.parse_relayout(relayout)
+    if x_range is False:
+        raise dash.exceptions.PreventUpdate
+    name = graph_id["figure"]
+    patched = Patch()
+    for i, trace in enumerate(resampled_traces(name, x_range, width)):
+        for key, values in trace.items():
+            patched["data"][i][key] = payload.compact_array(values)
+        if name in RESAMPLED and RESAMPLED[name][1][i] not in HISTOGRAMS:
+            # số điểm đổi theo khung nhìn: đổi cả SVG <-> WebGL nếu vượt ngưỡng
+            patched["data"][i]["type"] = line_type(len(trace["x"]))
+    if x_range is None:
+        patched["layout"]["xaxis"]["autorange"] = True
+    else:
+        patched["layout"]["xaxis"]["range"] = list(x_range)
+    return patched
+
+
+@app.callback(
+    Output("cleaned-table", "data"),
+    Output("cleaned-table", "page_count"),
+    Input("cleaned-table", "page_current"),
+    Input("cleaned-table", "page_size"),
+    Input("cleaned-table", "sort_by"),
+    Input("cleaned-table", "filter_query")
+)
+def update_cleaned_table(page_current, page_size, sort_by, filter_query):
+    return data.get("table_cleaned").page(page_current, page_size, sort_by, filter_query)
+
+
+@app.callback(
+    Output("ticker-graph", "figure"),
+    Input("ticker-select", "value")
+)
+def update_ticker_graph(symbol):
+    engine = data.get("panel_engine")
+    if symbol not in engine.panel:
+        raise dash.exceptions.PreventUpdate
+    return build_ticker_figure(symbol, engine.version)
+
+
+@app.callback(
+    Output("backtest-graph", "figure"),
+    Input("backtest-strategy", "value"),
+    Input("backtest-metric", "value")
+)
+def update_backtest_graph(strategy, metric):
+    if strategy not in backtest.STRATEGY_LABELS or metric not in backtest.METRICS:
+        raise dash.exceptions.PreventUpdate
+    return build_backtest_figure(strategy, metric, data.get("versions:df_cleaned"))
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    if sys.argv[1:] == ["--preload"]:
+        if not SHARED_DIR:
+            sys.exit("Đặt NVDA_SHARED (thư mục dữ liệu dùng chung) trước khi chạy --preload")
+        publish_shared()
+    else:
+        app.run(debug=True)
@@ -0,0 +1,61 @@
+"""Tải nhiều mã bằng Downloader (nvda_analysis.download): tuần tự (workers=1) so với thread
+pool, rồi chạy lại lần hai khi file đã có (chỉ tải phần còn thiếu). Dữ liệu lấy từ
+CannedProvider với độ trễ giả lập mỗi lần gọi, nên không cần mạng; mỗi mã là một bản sao
+nvda_stock_data.csv.
+
+    python benchmarks/bench_download.py --symbols 32 --delay 0.2
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nvda_analysis.download import CannedProvider, Downloader  # noqa: E402
+
+
+def run(provider, directory, symbols, workers, start):
+    t0 = time.perf_counter()
+    stats = Downloader(provider, directory, workers=workers).update(symbols, start=start)
+    elapsed = time.perf_counter() - t0
+    if stats["error"].notna().any():
+        sys.exit(stats[stats["error"].notna()].to_string())
+    return elapsed, int(stats["rows_added"].sum()), int(stats["attempts"].sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=32)
+    parser.add_argument("--delay", type=float, default=0.2, help="độ trễ giả lập mỗi lần gọi (giây)")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    source = os.path.join(ROOT, "nvda_stock_data.csv")
+    start = pd.read_csv(source, usecols=["Date"], nrows=1)["Date"].iloc[0]
+    symbols = [f"S{i:03d}" for i in range(args.symbols)]
+    with tempfile.TemporaryDirectory() as tmp:
+        canned = os.path.join(tmp, "canned")
+        os.makedirs(canned)
+        for symbol in symbols:
+            shutil.copy(source, os.path.join(canned, f"{symbol}.csv"))
+        provider = CannedProvider(canned, delay=args.delay)
+
+        print(f"  {args.symbols} symbols, {args.delay * 1000:.0f} ms per request")
+        print(f"  {'run':<32}{'time (s)':>10}{'rows':>10}{'requests':>10}")
+        for label, workers in (("sequential (workers=1)", 1), (f"pooled (workers={args.workers})", args.workers)):
+            directory = os.path.join(tmp, f"w{workers}")
+            elapsed, rows, attempts = run(provider, directory, symbols, workers, start)
+            print(f"  {label:<32}{elapsed:>10.2f}{rows:>10,}{attempts:>10}")
+        # Lần hai: file đã đủ, chỉ hỏi provider phần sau dòng cuối
+        elapsed, rows, attempts = run(provider, directory, symbols, args.workers, start)
+        print(f"  {'incremental re-run':<32}{elapsed:>10.2f}{rows:>10,}{attempts:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Histogram đếm sẵn ở server (nvda_analysis.histogram) so với gửi toàn bộ giá trị cho
+go.Histogram: kích thước JSON của figure và thời gian tính, kèm kiểm tra số đếm với
+np.histogram và StreamingHistogram gộp từ nhiều chunk.
+
+    python benchmarks/bench_histogram.py --rows 10000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nvda_analysis.figcache import encode_figure  # noqa: E402
+from nvda_analysis.histogram import StreamingHistogram, histogram  # noqa: E402
+
+
+def timed(func, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = func(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--chunks", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    returns = rng.standard_t(3, args.rows) * 0.02
+    returns[rng.random(args.rows) < 0.01] = np.nan
+
+    raw, raw_time = timed(encode_figure, go.Figure(go.Histogram(x=returns[~np.isnan(returns)], nbinsx=50)))
+    print(f"  {args.rows:,} returns")
+    print(f"  {'method':<30}{'time (s)':>10}{'JSON (KB)':>12}")
+    print(f"  {'go.Histogram, raw values':<30}{raw_time:>10.3f}{len(raw) / 1024:>12.1f}")
+    for bins in (50, "fd"):
+        (counts, edges), elapsed = timed(histogram, returns, bins)
+        expected, _ = np.histogram(returns[~np.isnan(returns)], edges)
+        if not np.array_equal(counts, expected):
+            sys.exit(f"counts differ from np.histogram (bins={bins})")
+        fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+        label = f"histogram(bins={bins!r}), {len(counts)} bins"
+        print(f"  {label:<30}{elapsed:>10.3f}{len(encode_figure(fig)) / 1024:>12.1f}")
+
+    t0 = time.perf_counter()
+    merged = StreamingHistogram()
+    for chunk in np.array_split(returns, args.chunks):
+        merged.merge(StreamingHistogram().add(chunk))
+    elapsed = time.perf_counter() - t0
+    counts, edges = merged.histogram()
+    if merged.total != int(np.isfinite(returns).sum()):
+        sys.exit("StreamingHistogram lost values")
+    label = f"streaming, {args.chunks} chunks merged"
+    print(f"  {label:<30}{elapsed:>10.3f}{'':>12}   {len(counts)} bins of width 2**{merged.exponent}")
+
+
+if __name__ == "__main__":
+    main()
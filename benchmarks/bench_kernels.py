@@ -0,0 +1,141 @@
+"""So sánh kernel NumPy (nvda_analysis.kernels) với cách tính bằng pandas trong app.py:
+thời gian chạy và độ khớp của kết quả (Bollinger rolling mean/std, RSI, Volatility).
+
+Mặc định chạy trên 10 triệu dòng giá tổng hợp (dữ liệu phút nhiều năm), và kiểm tra
+độ khớp trên nvda_stock_data_cleaned.csv.
+
+    python benchmarks/bench_kernels.py --rows 10000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nvda_analysis import kernels  # noqa: E402
+
+
+def synthetic_close(rows, seed=0):
+    # Giá dạng random walk log-normal quanh 100 USD
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, rows)))
+
+
+def pandas_bollinger(close):
+    s = pd.Series(close)
+    sma = s.rolling(window=20).mean()
+    upper = sma + (s.rolling(window=20).std() * 2)
+    lower = sma - (s.rolling(window=20).std() * 2)
+    return sma.to_numpy(), upper.to_numpy(), lower.to_numpy()
+
+
+def pandas_rsi(close):
+    delta = pd.Series(close).diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    return (100 - (100 / (1 + rs))).to_numpy()
+
+
+def pandas_volatility(close):
+    return pd.Series(close).pct_change().rolling(window=30).std().to_numpy()
+
+
+def kernel_bollinger(close, sma, upper, lower):
+    # lower giữ tạm 2 * std
+    kernels.rolling_mean_std(close, 20, out_mean=sma, out_std=lower)
+    np.multiply(lower, 2, out=lower)
+    np.add(sma, lower, out=upper)
+    np.subtract(sma, lower, out=lower)
+
+
+def kernel_volatility(close, ret, out):
+    kernels.pct_change(close, out=ret)
+    kernels.rolling_std(ret, 30, out=out)
+
+
+def timed(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def exact_std(x, window, idx):
+    # Độ lệch chuẩn tính trực tiếp (hai lượt) trên các cửa sổ được chọn
+    windows = sliding_window_view(x, window)[idx - window + 1]
+    return windows.std(axis=1, ddof=1)
+
+
+def check_parity(close, label):
+    n = len(close)
+    sma, upper, lower = (np.empty(n) for _ in range(3))
+    kernel_bollinger(close, sma, upper, lower)
+    ref_sma, ref_upper, ref_lower = pandas_bollinger(close)
+    rsi = kernels.rsi(close, 14, out=np.empty(n))
+    vol = np.empty(n)
+    kernel_volatility(close, np.empty(n), vol)
+
+    rows = [
+        ("SMA20", sma, ref_sma),
+        ("Upper Band", upper, ref_upper),
+        ("Lower Band", lower, ref_lower),
+        ("RSI", rsi, pandas_rsi(close)),
+        ("Volatility", vol, pandas_volatility(close)),
+    ]
+    print(f"\nParity ({label}, {n:,} rows): max |kernel - pandas|")
+    ok = True
+    for name, got, ref in rows:
+        same_nan = np.array_equal(np.isnan(got), np.isnan(ref))
+        close_enough = np.allclose(got, ref, rtol=1e-6, atol=1e-8, equal_nan=True)
+        ok &= same_nan and close_enough
+        print(f"  {name:<12}{np.nanmax(np.abs(got - ref)):>12.3e}  {'ok' if same_nan and close_enough else 'MISMATCH'}")
+
+    # pandas cộng/trừ dồn trên cả chuỗi nên sai số tăng dần; so thêm với std tính trực tiếp
+    idx = np.linspace(19, n - 1, num=min(n - 19, 10000), dtype=np.int64)
+    _, std = kernels.rolling_mean_std(close, 20)
+    exact = exact_std(close, 20, idx)
+    ref_std = pd.Series(close).rolling(window=20).std().to_numpy()[idx]
+    print(f"  rolling std rel. error vs exact: kernel {np.max(np.abs(std[idx] - exact) / exact):.1e}, "
+          f"pandas {np.max(np.abs(ref_std - exact) / exact):.1e}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = pd.read_csv(os.path.join(ROOT, "nvda_stock_data_cleaned.csv"))
+    ok = check_parity(df["Close"].to_numpy(dtype=np.float64), "nvda_stock_data_cleaned.csv")
+
+    close = synthetic_close(args.rows)
+    n = len(close)
+    bufs = [np.empty(n) for _ in range(4)]
+    print(f"\nTiming ({n:,} rows, best of {args.repeat})")
+    print(f"  {'indicator':<12}{'pandas (s)':>12}{'kernel (s)':>12}{'speedup':>10}")
+    for name, ref, fast in [
+        ("Bollinger", lambda: pandas_bollinger(close), lambda: kernel_bollinger(close, *bufs[:3])),
+        ("RSI", lambda: pandas_rsi(close), lambda: kernels.rsi(close, 14, out=bufs[0])),
+        ("Volatility", lambda: pandas_volatility(close), lambda: kernel_volatility(close, bufs[0], bufs[1])),
+    ]:
+        t_ref = timed(ref, repeat=args.repeat)
+        t_fast = timed(fast, repeat=args.repeat)
+        print(f"  {name:<12}{t_ref:>12.3f}{t_fast:>12.3f}{t_ref / t_fast:>9.1f}x")
+
+    ok &= check_parity(close, "synthetic")
+    if not ok:
+        sys.exit("parity check failed")
+
+
+if __name__ == "__main__":
+    main()
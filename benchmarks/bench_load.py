@@ -0,0 +1,94 @@
+"""Thời gian nạp dữ liệu: CSV + pd.to_datetime(utc=True) (cách cũ của app.py) so với
+bộ đệm .arrow của nvda_analysis.loader (lần đầu tạo bộ đệm, các lần sau memory-map).
+
+Ngoài hai file CSV của repo, script tạo một CSV nến phút giả lập (mặc định 1 triệu dòng)
+với Date có múi giờ -04:00/-05:00 như dữ liệu yfinance.
+
+    python benchmarks/bench_load.py --rows 1000000
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nvda_analysis.loader import load_ohlcv, read_csv, sidecar_path  # noqa: E402
+
+
+def write_synthetic_csv(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    # Nến phút trong giờ giao dịch, giờ New York (có đổi giờ mùa hè/đông)
+    days = pd.bdate_range("2015-01-02", periods=rows // 390 + 1, tz="America/New_York")
+    minutes = pd.to_timedelta(np.arange(390), unit="min") + pd.Timedelta(hours=9, minutes=30)
+    dates = (days.tz_localize(None).values[:, None] + minutes.values[None, :]).ravel()[:rows]
+    dates = pd.DatetimeIndex(dates).tz_localize("America/New_York")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, rows)))
+    df = pd.DataFrame({
+        "Date": dates.astype(str),
+        "Open": close * (1 + rng.normal(0, 0.0002, rows)),
+        "High": close * 1.001,
+        "Low": close * 0.999,
+        "Close": close,
+        "Volume": rng.integers(1_000, 100_000, rows),
+        "Dividends": 0.0,
+        "Stock Splits": 0.0,
+    })
+    df.to_csv(path, index=False)
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def bench(path, repeat):
+    cache = sidecar_path(path)
+    if os.path.exists(cache):
+        os.remove(cache)
+    csv_time = timed(lambda: read_csv(path), repeat)
+    t0 = time.perf_counter()
+    load_ohlcv(path)
+    first = time.perf_counter() - t0
+    warm = timed(lambda: load_ohlcv(path), repeat)
+    pd.testing.assert_frame_equal(read_csv(path), load_ohlcv(path))
+    name = os.path.basename(path)
+    print(f"  {name:<30}{csv_time:>10.3f}{first:>14.3f}{warm:>12.4f}{csv_time / warm:>10.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    try:
+        files = []
+        for name in ("nvda_stock_data.csv", "nvda_stock_data_cleaned.csv"):
+            shutil.copy(os.path.join(ROOT, name), tmp)
+            files.append(os.path.join(tmp, name))
+        synthetic = os.path.join(tmp, f"synthetic_{args.rows}.csv")
+        write_synthetic_csv(synthetic, args.rows)
+        files.append(synthetic)
+
+        print(f"  {'file':<30}{'CSV (s)':>10}{'first (s)':>14}{'cached (s)':>12}{'speedup':>11}")
+        for path in files:
+            bench(path, args.repeat)
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Bộ nhớ của một worker: bộ dữ liệu float64 đầy đủ (NVDA_COMPACT=0, cách cũ) so với dạng
+gọn của nvda_analysis.compact (float32 cho cột hiển thị, Volume int32, cột sự kiện doanh
+nghiệp thưa, bỏ EMA12/EMA26 và kết quả trung gian sau khi tính).
+
+Mỗi chế độ và mỗi cỡ dữ liệu (synthetic.py, ghi một lần vào .cache/bench/) chạy trong một
+tiến trình mới như một worker: import app, nạp df_raw, df_cleaned, df_analysis (đã có bộ
+đệm .arrow), rồi dựng mọi figure. In số byte của từng bộ dữ liệu (cột dùng chung giữa
+df_cleaned và df_analysis được tính ở cả hai) và RSS sau mỗi bước, đo sau gc.collect() và
+malloc_trim (glibc) để chỉ tính bộ nhớ còn giữ, không tính phần heap đã giải phóng.
+
+    python benchmarks/bench_memory.py --rows 250,100000,1000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import synthetic  # noqa: E402
+
+SNIPPET = """
+import ctypes, gc, json
+from nvda_analysis.instrument import current_rss
+from nvda_analysis.loader import load_ohlcv
+
+try:
+    _trim = ctypes.CDLL("libc.so.6").malloc_trim
+except (OSError, AttributeError):
+    _trim = None
+
+
+def rss():
+    gc.collect()
+    if _trim is not None:
+        _trim(0)
+    return current_rss()
+
+
+# Tạo bộ đệm .arrow trước, để RSS không tính phần parse CSV
+load_ohlcv("nvda_stock_data.csv"), load_ohlcv("nvda_stock_data_cleaned.csv")
+import app
+from nvda_analysis.compact import frame_bytes
+
+result = {"rss": {"import": rss()}, "bytes": {}}
+for name in ("df_raw", "df_cleaned", "df_analysis"):
+    result["bytes"][name] = frame_bytes(app.data.get(name))
+result["rss"]["datasets"] = rss()
+app.figures.build_all()
+result["rss"]["figures"] = rss()
+print(json.dumps(result))
+"""
+
+MODES = (("float64 (NVDA_COMPACT=0)", "0"), ("compact", "1"))
+
+
+def run(directory, enabled):
+    env = dict(os.environ, PYTHONPATH=ROOT, NVDA_EAGER="0", NVDA_COMPACT=enabled)
+    out = subprocess.run([sys.executable, "-c", SNIPPET], cwd=directory, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="250,100000", help="các cỡ dữ liệu, cách nhau bởi dấu phẩy")
+    args = parser.parse_args()
+
+    mb = 2 ** 20
+    for rows in (int(text) for text in args.rows.split(",")):
+        directory = synthetic.write_csvs(rows, os.path.join(ROOT, ".cache", "bench", f"{rows}-0"))
+        print(f"  {rows:,} rows")
+        print(f"    {'mode':<26}{'df_raw':>9}{'df_cleaned':>12}{'df_analysis':>13}"
+              f"{'RSS import':>12}{'+ datasets':>12}{'+ figures':>11}   (MB)")
+        for label, enabled in MODES:
+            result = run(directory, enabled)
+            sizes, rss = result["bytes"], result["rss"]
+            print(f"    {label:<26}{sizes['df_raw'] / mb:>9.1f}{sizes['df_cleaned'] / mb:>12.1f}"
+                  f"{sizes['df_analysis'] / mb:>13.1f}{rss['import'] / mb:>12.1f}"
+                  f"{rss['datasets'] / mb:>12.1f}{rss['figures'] / mb:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
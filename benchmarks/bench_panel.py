@@ -0,0 +1,71 @@
+"""Chỉ số cho nhiều mã: PanelEngine (một lượt trên ma trận thời gian x mã) so với vòng lặp
+add_indicators() qua từng mã, kèm kiểm tra sai lệch giữa hai cách.
+
+    python benchmarks/bench_panel.py --symbols 500 --days 2520
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nvda_analysis.indicators import DEFAULT_COLUMNS, add_indicators  # noqa: E402
+from nvda_analysis.panel import Panel, PanelEngine  # noqa: E402
+
+
+def synthetic_panel(symbols, days, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2015-01-02", periods=days, tz="UTC", name="Date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (days, symbols)), axis=0))
+    # một phần các mã niêm yết muộn (NaN ở đầu)
+    listed = rng.integers(0, days // 2, symbols) * (rng.random(symbols) < 0.2)
+    close[np.arange(days)[:, None] < listed] = np.nan
+    fields = {
+        "Open": close * (1 + rng.normal(0, 0.002, close.shape)),
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(1_000, 1_000_000, close.shape).astype(np.float64),
+    }
+    return Panel(index, [f"S{i:04d}" for i in range(symbols)], fields)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=2520)
+    args = parser.parse_args()
+
+    panel = synthetic_panel(args.symbols, args.days)
+    t0 = time.perf_counter()
+    engine = PanelEngine(panel).compute()
+    batched = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    frames = {symbol: add_indicators(panel.frame(symbol)) for symbol in panel.symbols}
+    loop = time.perf_counter() - t0
+
+    worst = 0.0
+    for symbol, expected in frames.items():
+        got = engine.frame(symbol)
+        for name in DEFAULT_COLUMNS:
+            a, b = got[name].to_numpy(), expected[name].to_numpy()
+            if not np.array_equal(np.isnan(a), np.isnan(b)):
+                sys.exit(f"NaN mismatch: {symbol} {name}")
+            ok = ~np.isnan(a)
+            if ok.any():
+                worst = max(worst, float(np.max(np.abs(a[ok] - b[ok]) / np.maximum(1.0, np.abs(b[ok])))))
+
+    print(f"  {args.symbols} symbols x {args.days} bars, {len(DEFAULT_COLUMNS)} columns")
+    print(f"  {'per-symbol loop (s)':<24}{loop:>10.3f}")
+    print(f"  {'PanelEngine (s)':<24}{batched:>10.3f}   {loop / batched:.1f}x")
+    print(f"  {'max rel. difference':<24}{worst:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Khả năng mở rộng theo số lõi của nvda_analysis.parallel.compute_parallel (1..N tiến trình),
+so với cách tính bằng pandas trong app.py chạy tuần tự từng mã.
+
+Thời gian của compute_parallel đo với ProcessPoolExecutor đã khởi động sẵn (không tính
+thời gian tạo tiến trình). Kết quả với mọi số lõi được kiểm tra trùng từng bit với
+PanelEngine tính trong một tiến trình.
+
+    python benchmarks/bench_parallel.py --symbols 500 --days 2520 --max-workers 8
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_panel import synthetic_panel  # noqa: E402
+from nvda_analysis.indicators import DEFAULT_COLUMNS  # noqa: E402
+from nvda_analysis.panel import PanelEngine  # noqa: E402
+from nvda_analysis.parallel import compute_parallel, make_executor  # noqa: E402
+
+
+def pandas_indicators(df):
+    # Đúng các dòng tính chỉ số của app.py trước khi có nvda_analysis.indicators
+    df = df.copy()
+    df['SMA20'] = df['Close'].rolling(window=20).mean()
+    df['SMA50'] = df['Close'].rolling(window=50).mean()
+    df['EMA20'] = df['Close'].ewm(span=20, adjust=False).mean()
+    delta = df['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    df['RSI'] = 100 - (100 / (1 + gain / loss))
+    df['Return'] = df['Close'].pct_change()
+    df['Volatility'] = df['Return'].rolling(window=30).std()
+    df['Upper Band'] = df['SMA20'] + (df['Close'].rolling(window=20).std() * 2)
+    df['Lower Band'] = df['SMA20'] - (df['Close'].rolling(window=20).std() * 2)
+    df['EMA12'] = df['Close'].ewm(span=12, adjust=False).mean()
+    df['EMA26'] = df['Close'].ewm(span=26, adjust=False).mean()
+    df['MACD'] = df['EMA12'] - df['EMA26']
+    df['Signal Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    panel = synthetic_panel(args.symbols, args.days)
+    frames = [panel.frame(symbol) for symbol in panel.symbols]
+    t0 = time.perf_counter()
+    for df in frames:
+        pandas_indicators(df)
+    baseline = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    expected = PanelEngine(panel).compute()
+    single = time.perf_counter() - t0
+
+    print(f"  {args.symbols} symbols x {args.days} bars ({os.cpu_count()} CPUs)")
+    print(f"  {'method':<28}{'time (s)':>10}{'vs pandas':>12}")
+    print(f"  {'pandas, per symbol':<28}{baseline:>10.3f}{1.0:>11.1f}x")
+    print(f"  {'PanelEngine, in-process':<28}{single:>10.3f}{baseline / single:>11.1f}x")
+    ok = True
+    for workers in range(1, args.max_workers + 1):
+        with make_executor(workers) as executor:
+            # khởi động các tiến trình trước khi đo
+            list(executor.map(abs, range(workers)))
+            t0 = time.perf_counter()
+            engine = compute_parallel(panel, workers=workers, executor=executor)
+            elapsed = time.perf_counter() - t0
+        ok &= all(np.array_equal(engine.get(name), expected.get(name), equal_nan=True)
+                  for name in DEFAULT_COLUMNS)
+        label = f"compute_parallel, {workers} proc"
+        print(f"  {label:<28}{elapsed:>10.3f}{baseline / elapsed:>11.1f}x")
+    if not ok:
+        sys.exit("parallel results differ from the in-process PanelEngine")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Số byte JSON của từng figure: mã hoá thẳng bằng plotly so với sau nvda_analysis.payload
+(làm tròn số, mảng kiểu base64 float32, thời gian dạng ngắn, bớt template), cùng thời gian
+mã hoá và phần trăm tiết kiệm của mỗi figure.
+
+Mặc định dùng dữ liệu thật (nvda_stock_data*.csv ở thư mục gốc); --rows N dùng dữ liệu giả
+lập N dòng của synthetic.py (ghi một lần vào .cache/bench/).
+
+    python benchmarks/bench_payload.py --rows 100000 --precision 6
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import synthetic  # noqa: E402
+
+
+def timed(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = func()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, help="dùng dữ liệu giả lập thay vì CSV thật")
+    parser.add_argument("--precision", type=int, default=None, help="số chữ số có nghĩa")
+    args = parser.parse_args()
+
+    directory = ROOT
+    if args.rows:
+        directory = synthetic.write_csvs(args.rows, os.path.join(ROOT, ".cache", "bench", f"{args.rows}-0"))
+    os.chdir(directory)
+    import app
+    from nvda_analysis import payload
+    from nvda_analysis.figcache import ENGINE
+    from plotly.io.json import to_json_plotly
+
+    precision = args.precision or payload.PRECISION
+    print(f"  {'figure':<32}{'plotly (KB)':>12}{'optimized (KB)':>16}{'saved':>8}"
+          f"{'plotly (ms)':>13}{'optimized (ms)':>16}")
+    totals = [0, 0]
+    for name in app.FIGURE_SOURCES:
+        fig = app.figures.get(name)
+        raw, raw_time = timed(lambda: to_json_plotly(fig, engine=ENGINE).encode())
+        body, time_ = timed(lambda: to_json_plotly(payload.optimize(fig, precision), engine=ENGINE).encode())
+        totals[0] += len(raw)
+        totals[1] += len(body)
+        print(f"  {name:<32}{len(raw) / 1024:>12.1f}{len(body) / 1024:>16.1f}{1 - len(body) / len(raw):>8.0%}"
+              f"{raw_time * 1000:>13.2f}{time_ * 1000:>16.2f}")
+    print(f"  {'total':<32}{totals[0] / 1024:>12.1f}{totals[1] / 1024:>16.1f}{1 - totals[1] / totals[0]:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Nạp lại dữ liệu khi đang chạy (NVDA_RELOAD_INTERVAL) so với khởi động lại app: thời gian
+đến khi dữ liệu mới được dùng, và độ trễ request (p50/p99) trước và trong lúc nạp lại.
+
+Chạy trên bản sao của dữ liệu giả lập (synthetic.py) trong thư mục tạm: dựng sẵn mọi figure
+và JSON của chúng, đo các request /_tabs/<tab>.json + /_figures/<tên>.json?v=<phiên bản>
+của tab Data Analysis, rồi ghi lại CSV sạch (đổi giá đóng cửa phiên cuối) và đo tiếp cho
+đến khi watcher đã thay dữ liệu và dựng lại các figure. Khởi động lại là import app rồi
+dựng mọi figure trong một tiến trình mới (như cách cũ: sửa CSV rồi chạy lại app.py).
+
+    python benchmarks/bench_reload.py --rows 100000
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import synthetic  # noqa: E402
+
+SNIPPET = """
+import json, sys, time
+t0 = time.perf_counter()
+import app
+
+client = app.app.server.test_client()
+STALE = [name for name, source in app.FIGURE_SOURCES.items() if source != "df_raw"]
+
+
+def request():
+    t0 = time.perf_counter()
+    payload = json.loads(client.get("/_tabs/Data Analysis.json").data)
+    for name, version in payload["versions"].items():
+        assert client.get(f"/_figures/{name}.json?v={version}").status_code == 200
+    return time.perf_counter() - t0
+
+
+def rebuilt():
+    return app.reload_generation and all(app.figures.is_built(name) for name in STALE)
+
+
+app.figures.build_all()
+for name in app.FIGURE_SOURCES:
+    app.figure_json(name)
+startup = time.perf_counter() - t0
+
+steady = [request() for _ in range(int(sys.argv[1]))]
+path = "nvda_stock_data_cleaned.csv"
+with open(path) as f:
+    lines = f.read().splitlines()
+fields = lines[-1].split(",")
+fields[4] = repr(float(fields[4]) * 1.01)
+lines[-1] = ",".join(fields)
+written = time.perf_counter()
+with open(path, "w") as f:
+    f.write("\\n".join(lines) + "\\n")
+during, swapped = [], None
+while time.perf_counter() - written < 600:
+    if swapped is None and app.reload_generation:
+        swapped = time.perf_counter() - written
+    if rebuilt():
+        break
+    during.append(request())
+ready = time.perf_counter() - written
+print(json.dumps({"startup": startup, "steady": steady, "during": during, "swapped": swapped,
+                  "ready": ready, "error": repr(app.dataset_watcher.last_error)}))
+"""
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))] if values else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--interval", type=float, default=0.5, help="NVDA_RELOAD_INTERVAL (giây)")
+    parser.add_argument("--requests", type=int, default=50, help="số request đo trước khi nạp lại")
+    args = parser.parse_args()
+
+    source = synthetic.write_csvs(args.rows, os.path.join(ROOT, ".cache", "bench", f"{args.rows}-0"))
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("nvda_stock_data.csv", "nvda_stock_data_cleaned.csv"):
+            shutil.copy(os.path.join(source, name), directory)
+        env = dict(os.environ, PYTHONPATH=ROOT, NVDA_EAGER="0", NVDA_RELOAD_INTERVAL=str(args.interval))
+        env.pop("NVDA_SHARED", None)
+        out = subprocess.run([sys.executable, "-c", SNIPPET, str(args.requests)], cwd=directory, env=env,
+                             capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.splitlines()[-1])
+
+    print(f"  {args.rows:,} rows, polling every {args.interval:g}s")
+    print(f"    restart (import + build every figure): {result['startup']:.2f}s")
+    print(f"    hot reload: new data served after {result['swapped'] or float('nan'):.2f}s, "
+          f"figures rebuilt after {result['ready']:.2f}s (includes waiting for the file to settle)")
+    print(f"    {'requests':<18}{'count':>7}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    for label in ("steady", "during"):
+        samples = result[label]
+        print(f"    {label:<18}{len(samples):>7}{percentile(samples, 50) * 1000:>10.2f}"
+              f"{percentile(samples, 99) * 1000:>10.2f}")
+    if result["error"] != "None":
+        print(f"    reload error: {result['error']}")
+
+
+if __name__ == "__main__":
+    main()
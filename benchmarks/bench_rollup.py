@@ -0,0 +1,78 @@
+"""Nến cho một khung nhìn: chọn bản gộp tính sẵn (nvda_analysis.rollup) so với gộp lại ở
+mỗi request (downsample.resample_ohlc trên các nến gốc trong khoảng đang xem, và
+DataFrame.resample theo lịch của pandas). Đo thời gian tính sẵn một lần, rồi thời gian mỗi
+request cho vài khung nhìn, từ toàn bộ lịch sử đến một ngày.
+
+Dữ liệu giả lập: nến 1 phút liên tục (UTC), qua nhiều lần đổi giờ mùa hè/mùa đông.
+
+    python benchmarks/bench_rollup.py --rows 10000000 --width 1200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nvda_analysis import downsample  # noqa: E402
+from nvda_analysis.rollup import Rollups  # noqa: E402
+
+AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+WINDOWS = [("all", None), ("1 year", pd.Timedelta(days=365)), ("1 month", pd.Timedelta(days=30)),
+           ("1 day", pd.Timedelta(days=1))]
+
+
+def synthetic(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 5e-4, rows)))
+    spread = np.abs(rng.normal(0, 2e-4, rows)) * close
+    index = pd.date_range("2000-01-03 14:30", periods=rows, freq="min", tz="UTC", name="Date")
+    return pd.DataFrame({"Open": np.roll(close, 1), "High": close + spread, "Low": close - spread,
+                         "Close": close, "Volume": rng.integers(1_000, 100_000, rows)}, index=index)
+
+
+def timed(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = func()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--width", type=int, default=1200)
+    args = parser.parse_args()
+
+    df = synthetic(args.rows)
+    budget = downsample.candle_budget(args.width)
+    rollups, build = timed(lambda: Rollups(df), repeat=1)
+    sizes = ", ".join(f"{name}={len(rollups.get(name)):,}" for name in rollups.resolutions)
+    print(f"  {args.rows:,} minute bars; rollups built once in {build:.2f}s ({sizes})")
+    print(f"  budget {budget} candles at {args.width}px")
+    print(f"  {'window':<10}{'rollup':>8}{'candles':>9}{'select (ms)':>13}"
+          f"{'resample_ohlc (ms)':>20}{'pandas (ms)':>13}")
+    end = df.index[-1]
+    for label, span in WINDOWS:
+        x_range = None if span is None else (end - span, end)
+        (resolution, bars), fast = timed(lambda: rollups.select(x_range, budget))
+        window = downsample.window(df, x_range)
+        _, merge = timed(lambda: downsample.resample_ohlc(window, budget))
+        rule = {"5m": "5min", "1h": "1h", "1D": "1D", "1W": "W-SUN", "1M": "MS"}.get(resolution, "1min")
+        local = window.tz_convert("America/New_York")
+        expected, slow = timed(lambda: local.resample(rule).agg(AGG).dropna(), repeat=1)
+        # pandas còn đếm nến gộp dở dang ở mép trái của khung nhìn (bắt đầu trước x0)
+        if resolution not in ("base", "1h", "5m") and abs(len(expected) - len(bars)) > 1:
+            sys.exit(f"{label}: {len(bars)} candles, pandas resample gives {len(expected)}")
+        print(f"  {label:<10}{resolution:>8}{len(bars):>9,}{fast * 1000:>13.3f}"
+              f"{merge * 1000:>20.2f}{slow * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Bộ nhớ và thời gian khởi động của N worker: mỗi worker tự đọc CSV/.arrow và tính chỉ số
+(cách cũ) so với ánh xạ bộ dữ liệu dùng chung do python app.py --preload ghi sẵn
+(NVDA_SHARED, nvda_analysis.shared).
+
+Mỗi worker là một tiến trình mới: import app, chờ mọi worker import xong, rồi nạp df_raw,
+df_cleaned, df_analysis và đọc hết mọi cột (như khi đã dựng xong các figure). Bộ nhớ tính
+bằng PSS (/proc/<pid>/smaps_rollup: trang dùng chung được chia đều cho các tiến trình dùng
+nó), nên tổng PSS là bộ nhớ thật của cả nhóm worker; in tổng PSS của phần dữ liệu (sau khi
+nạp trừ sau khi import) và thời gian nạp dữ liệu chậm nhất. Chỉ chạy trên Linux. Dữ liệu
+giả lập của synthetic.py (ghi một lần vào .cache/bench/).
+
+    python benchmarks/bench_shared.py --rows 1000000 --workers 1,2,4,8
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import synthetic  # noqa: E402
+
+WORKER = """
+import json, sys, time
+import app
+print("imported", flush=True)
+sys.stdin.readline()
+t0 = time.perf_counter()
+for name in ("df_raw", "df_cleaned", "df_analysis"):
+    for column, values in app.data.get(name).items():
+        values.sum()
+print(json.dumps({"load": time.perf_counter() - t0, "shared": sorted(app.shared_versions)}), flush=True)
+sys.stdin.read()
+"""
+
+
+def pss(pid):
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def run(directory, count, shared_dir=None):
+    env = dict(os.environ, PYTHONPATH=ROOT, NVDA_EAGER="0")
+    env.pop("NVDA_SHARED", None)
+    if shared_dir:
+        env["NVDA_SHARED"] = shared_dir
+    workers = [subprocess.Popen([sys.executable, "-c", WORKER], cwd=directory, env=env, text=True,
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE) for _ in range(count)]
+    try:
+        for worker in workers:
+            worker.stdout.readline()
+        before = sum(pss(worker.pid) for worker in workers)
+        for worker in workers:
+            worker.stdin.write("\n")
+            worker.stdin.flush()
+        reports = [json.loads(worker.stdout.readline()) for worker in workers]
+        total = sum(pss(worker.pid) for worker in workers) - before
+    finally:
+        for worker in workers:
+            worker.stdin.close()
+            worker.wait()
+    if shared_dir and any(len(report["shared"]) != 3 for report in reports):
+        raise RuntimeError("worker did not attach the shared datasets")
+    return total, max(report["load"] for report in reports)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", default="1,2,4,8", help="số worker, cách nhau bởi dấu phẩy")
+    args = parser.parse_args()
+
+    directory = synthetic.write_csvs(args.rows, os.path.join(ROOT, ".cache", "bench", f"{args.rows}-0"))
+    shared_dir = os.path.join(directory, ".cache", "shared")
+    shutil.rmtree(shared_dir, ignore_errors=True)
+    env = dict(os.environ, PYTHONPATH=ROOT, NVDA_EAGER="0", NVDA_SHARED=shared_dir)
+    subprocess.run([sys.executable, os.path.join(ROOT, "app.py"), "--preload"], cwd=directory, env=env,
+                   check=True, capture_output=True)
+
+    mb = 2 ** 20
+    print(f"  {args.rows:,} rows")
+    print(f"    {'workers':>8}{'own copy data PSS (MB)':>25}{'shared data PSS (MB)':>23}"
+          f"{'own copy load (s)':>20}{'shared load (s)':>18}")
+    for count in (int(text) for text in args.workers.split(",")):
+        own, own_load = run(directory, count)
+        mapped, mapped_load = run(directory, count, shared_dir)
+        print(f"    {count:>8}{own / mb:>25.1f}{mapped / mb:>23.1f}{own_load:>20.2f}{mapped_load:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""So sánh thời gian khởi động của app.py giữa chế độ eager (dựng mọi figure lúc import)
+và lazy (chỉ dựng figure khi tab được mở lần đầu).
+
+Mỗi lần đo chạy trong một tiến trình Python mới, giống một worker gunicorn vừa khởi động.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Đo riêng: import app và lần render tab đầu tiên (Introduction, Data Analysis)
+SNIPPET = """
+import time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+app.render_content("Introduction")
+t2 = time.perf_counter()
+app.render_content("Data Analysis")
+t3 = time.perf_counter()
+print(t1 - t0, t2 - t1, t3 - t2)
+"""
+
+
+def run_once(eager):
+    env = dict(os.environ, NVDA_EAGER="1" if eager else "0", PYTHONPATH=ROOT)
+    out = subprocess.run(
+        [sys.executable, "-c", SNIPPET], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return [float(v) for v in out.split()[-3:]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'import (s)':>12}{'Introduction (s)':>18}{'Data Analysis (s)':>19}")
+    for mode in ("eager", "lazy"):
+        samples = [run_once(mode == "eager") for _ in range(args.runs)]
+        medians = [statistics.median(col) for col in zip(*samples)]
+        print(f"{mode:<8}{medians[0]:>12.3f}{medians[1]:>18.3f}{medians[2]:>19.3f}")
+
+
+if __name__ == "__main__":
+    main()
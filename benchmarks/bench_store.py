@@ -0,0 +1,94 @@
+"""Đọc một cửa sổ (vd. 2 tháng) từ kho SQLite (nvda_analysis.store) so với đọc cả file CSV
+(parse lại, hoặc qua bộ đệm .arrow của load_ohlcv) rồi cắt: thời gian đọc cửa sổ, và đọc
+cửa sổ kèm tính các chỉ số (cộng các phiên khởi động) so với tính chỉ số trên toàn bộ lịch sử.
+
+Dữ liệu giả lập: nến phút theo giờ giao dịch của một mã, ghi ra CSV tạm rồi nhập vào kho.
+
+    python benchmarks/bench_store.py --rows 1000000 --days 60
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nvda_analysis.indicators import add_indicators  # noqa: E402
+from nvda_analysis.loader import load_ohlcv, read_csv  # noqa: E402
+from nvda_analysis.store import BarStore, import_csv, indicator_window  # noqa: E402
+
+
+def synthetic_minutes(rows, seed=0):
+    # Nến phút 9:30-16:00 giờ New York của các ngày làm việc liên tiếp
+    days = pd.bdate_range("2000-01-03", periods=rows // 390 + 1)
+    minutes = pd.to_timedelta(np.tile(np.arange(390), len(days)), unit="min")
+    index = (days.repeat(390) + pd.Timedelta(hours=9, minutes=30) + minutes)[:rows]
+    index = index.tz_localize("America/New_York")
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 5e-4, rows)))
+    spread = np.abs(rng.normal(0, 2e-4, rows)) * close
+    return pd.DataFrame({
+        "Open": np.roll(close, 1), "High": close + spread, "Low": close - spread, "Close": close,
+        "Volume": rng.integers(1_000, 100_000, rows), "Dividends": 0.0, "Stock Splits": 0.0,
+    }, index=pd.DatetimeIndex(index, name="Date"))
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=60, help="độ dài cửa sổ đọc (ngày)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = os.path.join(tmp, "SYN.csv")
+        df = synthetic_minutes(args.rows)
+        df.to_csv(csv)
+        store = BarStore(os.path.join(tmp, "bars.sqlite"))
+        (_, added), import_time = timed(import_csv, store, csv, repeat=1)
+        load_ohlcv(csv)  # tạo bộ đệm .arrow
+
+        end = df.index[-1].tz_convert("UTC")
+        start = end - pd.Timedelta(days=args.days)
+        print(f"  {args.rows:,} minute bars, window of {args.days} days, "
+              f"import {added:,} rows in {import_time:.1f}s "
+              f"({os.path.getsize(store.path) / 2 ** 20:.0f} MB)")
+        print(f"  {'method':<40}{'time (s)':>10}{'rows':>10}")
+        runs = [
+            ("CSV parse + slice", lambda: read_csv(csv).loc[start:end]),
+            ("Arrow sidecar + slice", lambda: load_ohlcv(csv).loc[start:end]),
+            ("store.read(window)", lambda: store.read("SYN", start, end)),
+            ("Arrow sidecar + indicators + slice", lambda: add_indicators(load_ohlcv(csv)).loc[start:end]),
+            ("indicator_window (store + warm-up)", lambda: indicator_window(store, "SYN", start, end)),
+        ]
+        results = {}
+        for label, func in runs:
+            out, elapsed = timed(func)
+            results[label] = out
+            print(f"  {label:<40}{elapsed:>10.3f}{len(out):>10,}")
+
+        full = results["Arrow sidecar + indicators + slice"]
+        window = results["indicator_window (store + warm-up)"]
+        if not np.array_equal(full.index.as_unit("ns").asi8, window.index.asi8):
+            sys.exit("store window and CSV slice differ")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            error = np.nanmax(np.abs(window[full.columns].to_numpy() / full.to_numpy() - 1))
+        print(f"  max relative difference of the windowed indicators: {error:.1e}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Bộ tính tăng dần (nvda_analysis.streaming) so với tính lại toàn bộ lịch sử khi có bar mới.
+
+1. Kiểm tra phát lại (replay) trùng từng bit với add_indicators() trên file CSV sạch và
+   trên dữ liệu giả lập (có NaN chen giữa).
+2. Đo chi phí thêm một bar: tính lại batch trên N dòng vs một lần update() O(1).
+
+    python benchmarks/bench_streaming.py --replay-bars 20000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nvda_analysis.indicators import DEFAULT_COLUMNS, add_indicators  # noqa: E402
+from nvda_analysis.streaming import StreamingIndicators, fake_feed, replay  # noqa: E402
+
+
+def bitwise_equal(a, b):
+    return all(
+        np.array_equal(np.asarray(a[c], dtype=np.float64).view(np.int64),
+                       np.asarray(b[c], dtype=np.float64).view(np.int64))
+        for c in DEFAULT_COLUMNS
+    )
+
+
+def feed_frame(bars, seed=0):
+    return pd.DataFrame(list(fake_feed(bars=bars, seed=seed))).set_index("Date")
+
+
+def check_replay(df, label):
+    t0 = time.perf_counter()
+    ok = bitwise_equal(add_indicators(df), replay(df))
+    print(f"  {label:<40}{len(df):>10,} bars  {'bit-identical' if ok else 'MISMATCH'}"
+          f"  ({time.perf_counter() - t0:.1f}s)")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replay-bars", type=int, default=20000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print("Replay vs batch")
+    df = pd.read_csv(os.path.join(ROOT, "nvda_stock_data_cleaned.csv"))
+    df["Date"] = pd.to_datetime(df["Date"], utc=True)
+    ok = check_replay(df.set_index("Date"), "nvda_stock_data_cleaned.csv")
+    bars = feed_frame(args.replay_bars)
+    ok &= check_replay(bars, "fake_feed")
+    gaps = bars.copy()
+    gaps.iloc[:3, gaps.columns.get_loc("Close")] = np.nan
+    gaps.iloc[len(gaps) // 2:len(gaps) // 2 + 5, gaps.columns.get_loc("Close")] = np.nan
+    ok &= check_replay(gaps, "fake_feed with NaN gaps")
+
+    # update() không phụ thuộc độ dài lịch sử: làm nóng bằng vài nghìn bar rồi đo
+    stream = StreamingIndicators()
+    feed = fake_feed(seed=1)
+    for _ in range(5000):
+        stream.update(next(feed))
+    samples = []
+    for _ in range(2000):
+        bar = next(feed)
+        t0 = time.perf_counter()
+        stream.update(bar)
+        samples.append(time.perf_counter() - t0)
+    update = statistics.median(samples)
+
+    print("\nCost of appending one bar")
+    print(f"  {'history':>12}{'batch recompute (ms)':>24}{'update() (ms)':>16}")
+    for size in args.sizes:
+        hist = feed_frame(size, seed=2)
+        t0 = time.perf_counter()
+        add_indicators(hist)
+        batch = time.perf_counter() - t0
+        print(f"  {size:>12,}{batch * 1e3:>24.2f}{update * 1e3:>16.3f}")
+
+    if not ok:
+        sys.exit("replay is not bit-identical to the batch path")
+
+
+if __name__ == "__main__":
+    main()
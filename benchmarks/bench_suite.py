@@ -0,0 +1,277 @@
+"""Bộ benchmark tái lập được cho toàn bộ đường xử lý: đọc CSV (parse + Date -> UTC, và qua bộ
+đệm .arrow), tính chỉ số (SMA, EMA, RSI, MACD, Bollinger, Volatility), dựng từng figure và
+mã hoá JSON của nó, và layout của từng tab qua test client (/_tabs/<tab>.json, hoặc callback
+render_content khi NVDA_FIGURE_CACHE=0; layout đã dựng sẵn, và dựng lại sau khi xoá bộ nhớ
+đệm của tab).
+
+Mỗi cỡ dữ liệu (250 nến ngày, 100k và 10M nến phút; sinh bởi synthetic.py với seed cố
+định, ghi một lần vào .cache/bench/) chạy trong một tiến trình mới với thư mục làm việc là
+thư mục dữ liệu đó, nên app.py đọc đúng file giả lập. Mỗi phép đo lặp đến khi đủ
+--min-time giây (tối đa --max-runs lần); kết quả (trung vị, nhỏ nhất, số lần, số byte)
+cùng commit git, phiên bản thư viện và máy chạy được ghi ra một file JSON để so giữa các
+commit bằng --compare (mã thoát 1 nếu có phép đo chậm đi quá --threshold).
+
+    python benchmarks/bench_suite.py --sizes 250,100k,10M --output before.json
+    python benchmarks/bench_suite.py --compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from importlib import metadata
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import synthetic  # noqa: E402
+
+SIZES = {"250": 250, "100k": 100_000, "10M": 10_000_000}
+LIBRARIES = ["numpy", "pandas", "pyarrow", "plotly", "dash", "flask", "orjson"]
+
+SNIPPET = """
+import json, statistics, sys, time
+
+MIN_TIME, MAX_RUNS = float(sys.argv[1]), int(sys.argv[2])
+
+
+def emit(name, stats):
+    # Mỗi phép đo một dòng JSON, để giữ được kết quả nếu tiến trình bị dừng giữa chừng
+    print(json.dumps({name: stats}), flush=True)
+
+
+def measure(name, func, setup=None):
+    # Lặp func đến khi đủ MIN_TIME giây (setup chạy trước mỗi lần, không tính giờ)
+    samples, size = [], None
+    try:
+        while len(samples) < MAX_RUNS and sum(samples) < MIN_TIME:
+            if setup is not None:
+                setup()
+            t0 = time.perf_counter()
+            out = func()
+            samples.append(time.perf_counter() - t0)
+            if isinstance(out, (bytes, str)):
+                size = len(out)
+    except Exception as exc:  # noqa: BLE001 - ghi lỗi, đo tiếp các phép khác
+        emit(name, {"error": f"{type(exc).__name__}: {exc}"})
+        return
+    stats = {"median": statistics.median(samples), "min": min(samples), "runs": len(samples)}
+    if size is not None:
+        stats["bytes"] = size
+    emit(name, stats)
+
+
+from nvda_analysis.indicators import IndicatorEngine
+from nvda_analysis.instrument import peak_rss
+from nvda_analysis.loader import load_ohlcv, read_csv
+
+measure("load:csv_parse", lambda: read_csv("nvda_stock_data_cleaned.csv"))
+load_ohlcv("nvda_stock_data_cleaned.csv")  # tạo bộ đệm .arrow
+measure("load:arrow_sidecar", lambda: load_ohlcv("nvda_stock_data_cleaned.csv"))
+
+df = load_ohlcv("nvda_stock_data_cleaned.csv")
+GROUPS = {
+    "SMA": ["SMA20", "SMA50"], "EMA": ["EMA20"], "RSI": ["RSI"], "MACD": ["MACD", "Signal Line"],
+    "Bollinger": ["Upper Band", "Lower Band"], "Volatility": ["Volatility"],
+}
+engine = None
+
+
+def fresh_engine():
+    global engine
+    engine = IndicatorEngine(df, version="bench")
+
+
+for group, names in GROUPS.items():
+    measure("indicators:" + group, lambda names=names: [engine.get(name) for name in names], fresh_engine)
+measure("indicators:all", lambda: engine.frame(), fresh_engine)
+
+t0 = time.perf_counter()
+import app
+from nvda_analysis.figcache import encode_figure
+elapsed = time.perf_counter() - t0
+emit("app:import", {"median": elapsed, "min": elapsed, "runs": 1})
+
+# Dựng sẵn dữ liệu nguồn (df_analysis, rollups...) để phép đo figure chỉ tính phần vẽ
+for name in app.FIGURE_SOURCES:
+    try:
+        app.figures.get(name)
+    except Exception:  # noqa: BLE001 - lỗi được ghi lại ở phép đo bên dưới
+        pass
+for name in app.FIGURE_SOURCES:
+    measure("figure_build:" + name, lambda name=name: app.figures.get(name),
+            lambda name=name: app.figures.invalidate([name]))
+    measure("figure_json:" + name, lambda name=name: encode_figure(app.figures.get(name)))
+
+client = app.app.server.test_client()
+
+
+def render(tab):
+    if app.FIGURE_CACHE:
+        response = client.get(f"/_tabs/{tab}.json")
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return response.data
+    body = {"output": "tab-content.children",
+            "outputs": {"id": "tab-content", "property": "children"},
+            "inputs": [{"id": "tabs", "property": "value", "value": tab},
+                       {"id": "dataset-token", "property": "data", "value": None}],
+            "changedPropIds": ["tabs.value"], "state": []}
+    response = client.post("/_dash-update-component", json=body)
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code}")
+    return response.data
+
+
+for tab in app.tab_layouts.keys():
+    render(tab)
+    measure("tab_layout:" + tab, lambda tab=tab: render(tab))
+    measure("tab_layout_cold:" + tab, lambda tab=tab: render(tab),
+            lambda tab=tab: (app.tab_layouts.invalidate([tab]), app.tab_cache.invalidate([tab])))
+emit("peak_rss", peak_rss())
+"""
+
+
+def parse_size(text):
+    if text in SIZES:
+        return SIZES[text]
+    scale = {"k": 10 ** 3, "M": 10 ** 6}.get(text[-1:])
+    return int(float(text[:-1]) * scale) if scale else int(text)
+
+
+def label(rows):
+    for name, value in SIZES.items():
+        if value == rows:
+            return name
+    return str(rows)
+
+
+def git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    versions = {}
+    for name in LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "libraries": versions,
+    }
+
+
+def run_size(rows, seed, min_time, max_runs, timeout):
+    directory = synthetic.write_csvs(rows, os.path.join(ROOT, ".cache", "bench", f"{rows}-{seed}"), seed)
+    env = dict(os.environ, PYTHONPATH=ROOT, NVDA_EAGER="0")
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-c", SNIPPET, str(min_time), str(max_runs)], cwd=directory, env=env,
+            capture_output=True, timeout=timeout,
+        )
+        stdout, error = proc.stdout, None
+        if proc.returncode != 0:
+            lines = proc.stderr.decode(errors="replace").strip().splitlines()
+            error = lines[-1] if lines else f"exit status {proc.returncode}"
+    except subprocess.TimeoutExpired as exc:
+        stdout, error = exc.stdout or b"", f"timeout after {timeout:g}s"
+    result = {"cases": {}, "peak_rss": None}
+    for line in stdout.decode().splitlines():
+        if line.startswith("{"):
+            ((name, stats),) = json.loads(line).items()
+            if name == "peak_rss":
+                result["peak_rss"] = stats
+            else:
+                result["cases"][name] = stats
+    if error is not None:
+        # các phép đo đã xong trước khi tiến trình dừng vẫn được giữ lại
+        result["error"] = error
+    return result
+
+
+def print_size(name, result):
+    rss = f"peak RSS {result['peak_rss'] / 2 ** 20:.0f} MB" if result["peak_rss"] else result["error"]
+    print(f"  {name} rows ({rss})")
+    print(f"    {'case':<52}{'median (ms)':>13}{'min (ms)':>11}{'runs':>6}{'KB':>10}")
+    for case, stats in result["cases"].items():
+        if "error" in stats:
+            print(f"    {case:<52}  {stats['error']}")
+            continue
+        kb = f"{stats['bytes'] / 1024:.1f}" if "bytes" in stats else ""
+        print(f"    {case:<52}{stats['median'] * 1000:>13.2f}{stats['min'] * 1000:>11.2f}"
+              f"{stats['runs']:>6}{kb:>10}")
+    if result["peak_rss"] and "error" in result:
+        print(f"    {result['error']}")
+
+
+def compare(base_path, new_path, threshold):
+    """In tỉ lệ thời gian (mới / cũ) của các phép đo chung; trả về số phép đo chậm đi."""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"  {base['environment']['commit'] or base_path} -> {new['environment']['commit'] or new_path}")
+    print(f"    {'case':<60}{'base (ms)':>11}{'new (ms)':>11}{'ratio':>8}")
+    regressions = 0
+    for size, result in new["sizes"].items():
+        old = base["sizes"].get(size, {}).get("cases", {})
+        for case, stats in result.get("cases", {}).items():
+            before = old.get(case)
+            if not before or "median" not in before or "median" not in stats:
+                continue
+            ratio = stats["median"] / before["median"]
+            flag = ""
+            if ratio > 1 + threshold:
+                flag, regressions = "  slower", regressions + 1
+            elif ratio < 1 - threshold:
+                flag = "  faster"
+            if before.get("bytes") is not None and stats.get("bytes") != before.get("bytes"):
+                flag += f"  ({before['bytes']:,} -> {stats.get('bytes', 0):,} B)"
+            print(f"    {size + ' ' + case:<60}{before['median'] * 1000:>11.2f}"
+                  f"{stats['median'] * 1000:>11.2f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="250,100k", help="vd. 250,100k,10M")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-time", type=float, default=0.5, help="giây đo tối thiểu mỗi phép")
+    parser.add_argument("--max-runs", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=3600, help="giây tối đa cho mỗi cỡ dữ liệu")
+    parser.add_argument("--output", help="mặc định benchmarks/results/<commit>.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    parser.add_argument("--threshold", type=float, default=0.10, help="tỉ lệ chậm đi bị coi là thoái lui")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    report = {"environment": environment(), "seed": args.seed, "sizes": {}}
+    for text in args.sizes.split(","):
+        rows = parse_size(text.strip())
+        result = run_size(rows, args.seed, args.min_time, args.max_runs, args.timeout)
+        report["sizes"][label(rows)] = result
+        print_size(label(rows), result)
+
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results", f"{(report['environment']['commit'] or 'unknown')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=1)
+    print(f"  results written to {os.path.relpath(output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Độ trễ chuyển tab (p50/p99), số request và số byte mỗi lần chuyển: figure nhúng trong
+layout (NVDA_FIGURE_CACHE=0, cách cũ) so với bộ đệm phía trình duyệt (mặc định).
+
+Cách cũ: mỗi lần chuyển tab là một request render_content của Dash trả cả layout lẫn
+figure. Bộ đệm phía trình duyệt: mô phỏng RENDER_TAB và LOAD_FIGURE của app.py, tức
+/_tabs/<tab>.json tải một lần cho mỗi tab, /_figures/<tên>.json?v=<phiên bản> một lần cho
+mỗi figure (dùng chung giữa các tab), còn các lần sau chỉ parse lại JSON đã giữ. Đo qua
+test client của Flask, sau một vòng mở mọi tab để dựng sẵn dữ liệu và figure; mỗi chế độ
+chạy trong một tiến trình mới. Dòng "first visit" là vòng mở đầu tiên đó.
+
+    python benchmarks/bench_tabs.py --switches 200
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = """
+import json, sys, time
+import app
+
+TABS = ["Data Processing", "Data Analysis", "Interpretation & Conclusing", "Introduction"]
+client = app.app.server.test_client()
+# Bộ đệm của trình duyệt (window.nvdaTabs, window.nvdaFigures): văn bản JSON
+tabs, figures = {}, {}
+
+
+def graphs(node, found):
+    # id của các Graph tải figure qua /_figures/ trong cây layout trả về
+    if isinstance(node, dict):
+        props = node.get("props", {})
+        graph_id = props.get("id")
+        if node.get("type") == "Graph" and isinstance(graph_id, dict) and "figure" not in props:
+            found.append(graph_id["figure"])
+        for value in props.values():
+            graphs(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            graphs(value, found)
+    return found
+
+
+def fetch(url):
+    response = client.get(url)
+    assert response.status_code == 200, (url, response.status_code)
+    return response.data
+
+
+def switch(tab):
+    # (số request, số byte) của một lần chuyển tab
+    if not app.FIGURE_CACHE:
+        body = {"output": "tab-content.children",
+                "outputs": {"id": "tab-content", "property": "children"},
+                "inputs": [{"id": "tabs", "property": "value", "value": tab},
+                           {"id": "dataset-token", "property": "data", "value": None}],
+                "changedPropIds": ["tabs.value"], "state": []}
+        response = client.post("/_dash-update-component", json=body)
+        json.loads(response.data)
+        return 1, len(response.data)
+    requests, size = 0, 0
+    if tab not in tabs:
+        tabs[tab] = fetch(f"/_tabs/{tab}.json")
+        requests, size = requests + 1, size + len(tabs[tab])
+    payload = json.loads(tabs[tab])
+    for name in graphs(payload["layout"], []):
+        key = f"{name}@{payload['versions'][name]}"
+        if key not in figures:
+            figures[key] = fetch(f"/_figures/{name}.json?v={payload['versions'][name]}")
+            requests, size = requests + 1, size + len(figures[key])
+        json.loads(figures[key])
+    return requests, size
+
+
+def run(switches):
+    samples, requests, sizes = [], [], []
+    for i in range(switches):
+        t0 = time.perf_counter()
+        count, size = switch(TABS[i % len(TABS)])
+        samples.append(time.perf_counter() - t0)
+        requests.append(count)
+        sizes.append(size)
+    return {"samples": samples, "requests": requests, "bytes": sizes}
+
+
+first = run(len(TABS))
+print(json.dumps({"first": first, "repeat": run(int(sys.argv[1]))}))
+"""
+
+
+def run(cache, switches):
+    env = dict(os.environ, NVDA_FIGURE_CACHE="1" if cache else "0", PYTHONPATH=ROOT)
+    out = subprocess.run(
+        [sys.executable, "-c", SNIPPET, str(switches)], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--switches", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'mode':<38}{'p50 (ms)':>10}{'p99 (ms)':>10}{'requests / switch':>19}{'KB / switch':>13}")
+    for label, cache in (("figures in layout", False), ("client-side store", True)):
+        result = run(cache, args.switches)
+        for phase in ("first", "repeat"):
+            stats = result[phase]
+            samples, count = stats["samples"], len(stats["samples"])
+            name = f"{label} ({'first visit' if phase == 'first' else 'revisits'})"
+            print(f"{name:<38}{percentile(samples, 50) * 1000:>10.2f}{percentile(samples, 99) * 1000:>10.2f}"
+                  f"{sum(stats['requests']) / count:>19.2f}{sum(stats['bytes']) / count / 1024:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
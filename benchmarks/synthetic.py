@@ -0,0 +1,83 @@
+"""Dữ liệu OHLCV giả lập, tái lập được (cùng rows, seed -> cùng file), cùng định dạng với
+nvda_stock_data.csv (Date có offset -04:00/-05:00 của giờ New York) và
+nvda_stock_data_cleaned.csv (Date theo UTC, +00:00).
+
+Dưới vài nghìn dòng là nến ngày như file thật; lớn hơn là nến phút trong giờ giao dịch
+(9:30-16:00 giờ New York), để 10 triệu dòng vẫn nằm trong khoảng của datetime64[ns].
+
+    python benchmarks/synthetic.py 100000 data/synthetic   # ghi 2 file CSV vào data/synthetic
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+EXCHANGE_TZ = "America/New_York"
+SESSION_MINUTES = 390
+# Tối đa bao nhiêu dòng thì sinh nến ngày (nhiều hơn: nến phút)
+MAX_DAILY_ROWS = 5_000
+
+
+def session_index(rows, start="1960-01-04"):
+    """Mốc thời gian (UTC) của rows nến: nến ngày lúc 0:00, hoặc nến phút trong phiên."""
+    if rows <= MAX_DAILY_ROWS:
+        days = pd.bdate_range(end="2025-06-17", periods=rows)
+        return days.tz_localize(EXCHANGE_TZ).tz_convert("UTC")
+    days = pd.bdate_range(start, periods=-(-rows // SESSION_MINUTES))
+    minutes = np.tile(np.arange(SESSION_MINUTES, dtype=np.int64), len(days))[:rows]
+    local = days.repeat(SESSION_MINUTES)[:rows] + pd.Timedelta(hours=9, minutes=30) \
+        + pd.to_timedelta(minutes, unit="min")
+    return local.tz_localize(EXCHANGE_TZ).tz_convert("UTC")
+
+
+def ohlcv(rows, seed=0):
+    """DataFrame OHLCV (index Date theo UTC, các cột như file yfinance)."""
+    rng = np.random.default_rng(seed)
+    index = session_index(rows)
+    step = 0.02 if rows <= MAX_DAILY_ROWS else 0.001
+    close = 130 * np.exp(np.cumsum(rng.normal(0, step, rows)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, step / 4, rows))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, step / 2, rows)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, step / 2, rows)))
+    return pd.DataFrame({
+        "Open": open_, "High": high, "Low": low, "Close": close,
+        "Volume": rng.integers(100_000_000, 600_000_000, rows) // (1 if rows <= MAX_DAILY_ROWS else 390),
+        "Dividends": 0.0, "Stock Splits": 0.0,
+    }, index=pd.DatetimeIndex(index, name="Date"))
+
+
+def date_strings(index, tz):
+    # "YYYY-MM-DD HH:MM:SS+hh:mm" theo múi giờ tz, định dạng vectơ hoá (nhanh hơn strftime)
+    index = pd.DatetimeIndex(index).as_unit("ns")
+    local = index.tz_convert(tz).tz_localize(None)
+    text = np.datetime_as_string(local.to_numpy(), unit="s").astype("U19")
+    text = np.char.replace(text, "T", " ")
+    offsets = (local.asi8 - index.asi8) // 60_000_000_000
+    labels = {int(m): f"{'+' if m >= 0 else '-'}{abs(m) // 60:02d}:{abs(m) % 60:02d}" for m in np.unique(offsets)}
+    suffix = np.empty(len(offsets), dtype="U6")
+    for minutes, label in labels.items():
+        suffix[offsets == minutes] = label
+    return np.char.add(text, suffix)
+
+
+def write_csvs(rows, directory, seed=0):
+    """Ghi nvda_stock_data.csv (giờ New York) và nvda_stock_data_cleaned.csv (UTC) vào
+    directory, trừ khi đã có từ lần trước với cùng rows và seed."""
+    os.makedirs(directory, exist_ok=True)
+    marker = os.path.join(directory, ".complete")
+    tag = f"{rows} {seed}"
+    if os.path.exists(marker) and open(marker).read() == tag:
+        return directory
+    df = ohlcv(rows, seed)
+    for name, tz in (("nvda_stock_data.csv", EXCHANGE_TZ), ("nvda_stock_data_cleaned.csv", "UTC")):
+        out = df.reset_index(drop=True)
+        out.insert(0, "Date", date_strings(df.index, tz))
+        out.to_csv(os.path.join(directory, name), index=False)
+    with open(marker, "w") as f:
+        f.write(tag)
+    return directory
+
+
+if __name__ == "__main__":
+    write_csvs(int(sys.argv[1]), sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 0)
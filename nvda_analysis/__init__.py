@@ -0,0 +1 @@
+"""Các module dùng chung cho dashboard (app.py) và các notebook phân tích NVDA."""
@@ -0,0 +1,252 @@
+"""Backtest vectơ hoá cho các tín hiệu của dashboard, quét cả lưới tham số trong một lượt.
+
+Mỗi chiến lược biến một họ chỉ số (SMA, RSI, MACD, Bollinger, cùng định nghĩa với
+nvda_analysis.indicators) thành vị thế 0/1 cho mọi tổ hợp tham số cùng lúc: chỉ số được
+tính cho mọi độ dài cửa sổ thành ma trận (T, số cửa sổ), ngưỡng được so sánh bằng
+broadcast, nên kết quả là mảng (T, *lưới) thay vì vòng lặp Python qua từng tổ hợp.
+
+    result = sweep(df["Close"], "rsi")                  # lưới mặc định DEFAULT_GRIDS["rsi"]
+    result.metrics["sharpe"]                            # mảng (lower, upper, window)
+    result.best("sharpe")                               # {"lower": 30, "upper": 70, ...}
+    equity = backtest(df["Close"], "rsi", result.best("sharpe"))
+
+Vị thế ở phiên t được quyết định bằng giá đóng cửa phiên t và hưởng lợi nhuận của phiên
+t+1 (không nhìn trước). cost là phí mỗi lần đổi vị thế, tính theo tỷ lệ giá trị.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from nvda_analysis import kernels
+from nvda_analysis import metrics as risk
+from nvda_analysis.metrics import TRADING_DAYS
+
+# Tham số đang dùng trên dashboard (SMA20/SMA50, RSI 14 với ngưỡng 30/70, MACD 12/26/9,
+# Bollinger 20 ngày, 2 độ lệch chuẩn)
+DASHBOARD_PARAMS = {
+    "sma": {"fast": 20, "slow": 50},
+    "rsi": {"lower": 30, "upper": 70, "window": 14},
+    "macd": {"fast": 12, "slow": 26, "signal": 9},
+    "bollinger": {"window": 20, "k": 2.0},
+}
+
+# Lưới quét mặc định (mỗi lưới chứa tham số của dashboard)
+DEFAULT_GRIDS = {
+    "sma": OrderedDict(fast=np.arange(5, 55, 5), slow=np.arange(20, 210, 10)),
+    "rsi": OrderedDict(lower=np.arange(10, 50, 5), upper=np.arange(55, 95, 5), window=np.arange(5, 31)),
+    "macd": OrderedDict(fast=np.arange(6, 22, 2), slow=np.arange(20, 42, 2), signal=np.arange(5, 17, 2)),
+    "bollinger": OrderedDict(window=np.arange(10, 65, 5), k=np.arange(1.0, 3.25, 0.25)),
+}
+
+STRATEGY_LABELS = {
+    "sma": "SMA crossover (long when fast SMA > slow SMA)",
+    "rsi": "RSI reversion (buy below lower, sell above upper)",
+    "macd": "MACD crossover (long when MACD > Signal Line)",
+    "bollinger": "Bollinger reversion (buy below lower band, sell above SMA)",
+}
+
+METRICS = ("sharpe", "sortino", "calmar", "total_return", "max_drawdown")
+
+
+def rolling_means_std(x, windows, ddof=1, with_std=True):
+    """(mean, std) trượt của x cho mọi cửa sổ trong windows: hai ma trận (T, len(windows)).
+
+    Mỗi cột là kernels.rolling_mean_std (tổng trượt có điểm neo, như SMA/Bollinger của
+    indicators.py); NaN khi chưa đủ cửa sổ hoặc cửa sổ chứa NaN. std là None nếu with_std=False.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    windows = np.asarray(windows, dtype=np.int64)
+    # (cửa sổ, T) để mỗi kernel ghi vào một hàng liền; trả về dạng chuyển vị (T, cửa sổ)
+    mean = np.empty((len(windows), len(x)))
+    std = np.empty((len(windows), len(x))) if with_std else None
+    for i, window in enumerate(windows):
+        kernels.rolling_mean_std(x, int(window), out_mean=mean[i], ddof=ddof, with_std=with_std,
+                                 out_std=std[i] if with_std else None)
+    return mean.T, None if std is None else std.T
+
+
+def rolling_means(x, windows):
+    """Trung bình trượt của x cho mọi cửa sổ trong windows: ma trận (T, len(windows))."""
+    return rolling_means_std(x, windows, with_std=False)[0]
+
+
+def emas(x, spans):
+    """EMA (adjust=False như pandas) của x cho mọi span: ma trận (T, len(spans))."""
+    frame = pd.Series(np.asarray(x, dtype=np.float64))
+    return np.column_stack([frame.ewm(span=int(span), adjust=False).mean().to_numpy() for span in spans])
+
+
+def rsi_windows(close, windows):
+    """RSI (trung bình trượt đơn giản của lãi/lỗ, như indicators.py) cho mọi cửa sổ."""
+    close = np.asarray(close, dtype=np.float64)
+    return np.column_stack([kernels.rsi(close, int(window)) for window in windows])
+
+
+def hold(entries, exits):
+    """Vị thế 0/1: vào lệnh khi entries, giữ đến khi exits (trục 0 là thời gian)."""
+    entries, exits = np.broadcast_arrays(entries, exits)
+    state = np.full(entries.shape, np.nan)
+    state[entries] = 1.0
+    state[exits] = 0.0
+    # forward-fill trạng thái cuối cùng đã biết theo trục thời gian
+    rows = np.arange(len(state)).reshape((-1,) + (1,) * (state.ndim - 1))
+    last = np.maximum.accumulate(np.where(np.isnan(state), 0, rows), axis=0)
+    filled = np.take_along_axis(state, last, axis=0)
+    return np.nan_to_num(filled, nan=0.0)
+
+
+def _grid(strategy, grid):
+    axes = OrderedDict(DEFAULT_GRIDS[strategy])
+    for name, values in (grid or {}).items():
+        if name not in axes:
+            raise KeyError(f"{strategy}: không có tham số '{name}'")
+        axes[name] = np.atleast_1d(np.asarray(values))
+    return axes
+
+
+def _axis(values, position, ndim):
+    # values đặt trên trục position của mảng (T, *lưới) để broadcast (bỏ [0]: chỉ theo lưới)
+    shape = [1] * (ndim + 1)
+    shape[position + 1] = len(values)
+    return np.asarray(values).reshape(shape)
+
+
+def sma_positions(close, fast, slow):
+    means = rolling_means(close, np.union1d(fast, slow))
+    lookup = {w: i for i, w in enumerate(np.union1d(fast, slow))}
+    fast_sma = means[:, [lookup[w] for w in fast]][:, :, None]
+    slow_sma = means[:, [lookup[w] for w in slow]][:, None, :]
+    valid = (_axis(fast, 0, 2) < _axis(slow, 1, 2))[0]
+    return (fast_sma > slow_sma).astype(np.float64), valid
+
+
+def rsi_positions(close, lower, upper, window):
+    rsi = rsi_windows(close, window)[:, None, None, :]
+    entries = rsi < _axis(lower, 0, 3)
+    exits = rsi > _axis(upper, 1, 3)
+    valid = (_axis(lower, 0, 3) < _axis(upper, 1, 3))[0]
+    return hold(entries, exits), valid
+
+
+def macd_positions(close, fast, slow, signal):
+    ema = emas(close, np.union1d(fast, slow))
+    lookup = {s: i for i, s in enumerate(np.union1d(fast, slow))}
+    macd = ema[:, [lookup[s] for s in fast]][:, :, None] - ema[:, [lookup[s] for s in slow]][:, None, :]
+    n, f, s = macd.shape
+    flat = pd.DataFrame(macd.reshape(n, f * s))
+    lines = np.stack([flat.ewm(span=int(span), adjust=False).mean().to_numpy().reshape(n, f, s)
+                      for span in signal], axis=-1)
+    valid = (_axis(fast, 0, 3) < _axis(slow, 1, 3))[0]
+    return (macd[..., None] > lines).astype(np.float64), valid
+
+
+def bollinger_positions(close, window, k):
+    close = np.asarray(close, dtype=np.float64)
+    mean, std = rolling_means_std(close, window)
+    lower_band = mean[:, :, None] - std[:, :, None] * _axis(k, 1, 2)
+    entries = close[:, None, None] < lower_band
+    exits = (close[:, None] > mean)[:, :, None]
+    return hold(entries, exits), np.ones((len(window), len(k)), dtype=bool)
+
+
+_POSITIONS = {
+    "sma": sma_positions,
+    "rsi": rsi_positions,
+    "macd": macd_positions,
+    "bollinger": bollinger_positions,
+}
+
+
+def simple_returns(close):
+    """Lợi nhuận từng phiên (như pct_change, phiên đầu là NaN)."""
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(len(close), np.nan)
+    out[1:] = close[1:] / close[:-1] - 1
+    return out
+
+
+def strategy_returns(positions, returns, cost=0.0):
+    """Lợi nhuận từng phiên của vị thế (T, ...): vị thế phiên t-1 nhân lợi nhuận phiên t."""
+    returns = np.nan_to_num(np.asarray(returns, dtype=np.float64), nan=0.0)
+    held = np.zeros_like(positions)
+    held[1:] = positions[:-1]
+    out = held * returns.reshape((-1,) + (1,) * (positions.ndim - 1))
+    if cost:
+        turnover = np.abs(np.diff(held, axis=0, prepend=0.0))
+        out -= cost * turnover
+    return out
+
+
+def summarize(returns, periods=TRADING_DAYS):
+    """METRICS (nvda_analysis.metrics) của lợi nhuận từng phiên (T, ...): mỗi chỉ số là mảng (...)."""
+    return risk.evaluate(returns, periods, METRICS)
+
+
+class SweepResult:
+    """Kết quả quét: axes (tên tham số -> giá trị), metrics (tên -> mảng theo các trục)."""
+
+    def __init__(self, strategy, axes, metrics, trades, exposure):
+        self.strategy = strategy
+        self.axes = axes
+        self.metrics = metrics
+        self.trades = trades
+        self.exposure = exposure
+
+    def __len__(self):
+        return int(np.prod([len(values) for values in self.axes.values()]))
+
+    def params(self, position):
+        return {name: values[i].item() for (name, values), i in zip(self.axes.items(), position)}
+
+    def best(self, metric="sharpe"):
+        """Tham số có metric lớn nhất (max_drawdown âm: lớn nhất là sụt giảm ít nhất)."""
+        values = self.metrics[metric]
+        if np.isnan(values).all():
+            return None
+        return self.params(np.unravel_index(np.nanargmax(values), values.shape))
+
+    def surface(self, metric="sharpe"):
+        """Ma trận theo hai tham số đầu, lấy giá trị tốt nhất qua các tham số còn lại."""
+        values = self.metrics[metric]
+        if values.ndim > 2:
+            with np.errstate(all="ignore"):
+                values = np.fmax.reduce(values.reshape(values.shape[:2] + (-1,)), axis=2)
+        return values
+
+    def frame(self):
+        """Bảng dạng dài: một dòng cho mỗi tổ hợp tham số hợp lệ có ít nhất một lệnh."""
+        grids = np.meshgrid(*self.axes.values(), indexing="ij")
+        out = pd.DataFrame({name: grid.ravel() for name, grid in zip(self.axes, grids)})
+        for name, values in self.metrics.items():
+            out[name] = values.ravel()
+        out["trades"] = self.trades.ravel()
+        out["exposure"] = self.exposure.ravel()
+        return out.dropna(subset=list(self.metrics), how="all").reset_index(drop=True)
+
+
+def sweep(close, strategy, grid=None, cost=0.0):
+    """Backtest strategy cho mọi tổ hợp tham số của grid (mặc định DEFAULT_GRIDS)."""
+    axes = _grid(strategy, grid)
+    close = np.asarray(close, dtype=np.float64)
+    positions, valid = _POSITIONS[strategy](close, *axes.values())
+    returns = strategy_returns(positions, simple_returns(close), cost)
+    metrics = summarize(returns)
+    trades = np.where(valid, (np.diff(positions, axis=0, prepend=0.0) > 0).sum(axis=0), 0)
+    # Tổ hợp không vào lệnh lần nào không phải chiến lược (total_return = max_drawdown = 0):
+    # bỏ khỏi best(), surface() và frame()
+    for name in metrics:
+        metrics[name] = np.where(trades > 0, metrics[name], np.nan)
+    exposure = np.where(valid, positions.mean(axis=0), np.nan)
+    return SweepResult(strategy, axes, metrics, trades, exposure)
+
+
+def backtest(close, strategy, params=None, cost=0.0):
+    """Đường vốn (bắt đầu từ 1) của một tổ hợp tham số (mặc định: tham số của dashboard)."""
+    params = dict(DASHBOARD_PARAMS[strategy], **(params or {}))
+    axes = _grid(strategy, {name: [value] for name, value in params.items()})
+    values = np.asarray(close, dtype=np.float64)
+    positions, _ = _POSITIONS[strategy](values, *axes.values())
+    returns = strategy_returns(positions, simple_returns(values), cost)
+    equity = np.cumprod(1 + returns.reshape(len(values)))
+    return pd.Series(equity, index=getattr(close, "index", None), name=strategy)
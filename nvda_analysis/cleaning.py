@@ -0,0 +1,395 @@
+"""Pipeline làm sạch dữ liệu OHLCV (tách từ nvda_data_cleaning.ipynb).
+
+Các bước mặc định lặp lại đúng notebook:
+
+  1. FillMissing      điền giá trị thiếu bằng giá trị gần nhất trước đó (ffill)
+  2. QuantileFilter   bỏ các dòng có Close ngoài khoảng phân vị 5% - 95%
+  3. NormalizeTimezone  chuyển Date về datetime UTC
+  4. Deduplicate      bỏ các dòng trùng Date (dữ liệu hiện tại không có)
+
+File được đọc theo từng khối (chunk) nên bộ nhớ không phụ thuộc kích thước file. Bước
+nào cần thống kê trên toàn bộ dữ liệu (phân vị) được "fit" trong một lượt đọc riêng,
+bằng QuantileSketch có bộ nhớ giới hạn, rồi mới lọc ở lượt ghi.
+
+    python -m nvda_analysis.cleaning nvda_stock_data.csv nvda_stock_data_cleaned.csv
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNKSIZE = 500_000
+
+# 'YYYY-MM-DD HH:MM:SS+HH:MM' (định dạng Date của yfinance)
+_ISO_LEN = 25
+
+
+def parse_iso_utc(values):
+    """pd.to_datetime(values, utc=True) cho chuỗi dạng 'YYYY-MM-DD HH:MM:SS-04:00'.
+
+    pandas parse từng chuỗi khi các dòng có múi giờ khác nhau (-04:00/-05:00 do đổi giờ
+    mùa hè), rất chậm. Ở đây phần giờ địa phương được NumPy parse cả mảng, phần lệch múi
+    giờ đọc thẳng từ mã ký tự. Chuỗi không đúng dạng trên thì dùng lại pd.to_datetime.
+    """
+    values = pd.Series(values)
+    if not len(values):
+        return pd.to_datetime(values, utc=True)
+    try:
+        text = values.to_numpy().astype(f"U{_ISO_LEN}")
+        codes = text.view(np.uint32).reshape(len(text), _ISO_LEN)
+        sign = codes[:, 19]
+        ok = ((codes[:, 10] == ord(" ")) | (codes[:, 10] == ord("T"))) & (codes[:, 22] == ord(":"))
+        ok &= (sign == ord("+")) | (sign == ord("-"))
+        if not ok.all() or (values.str.len() != _ISO_LEN).any():
+            raise ValueError
+        local = text.astype("U19").astype("datetime64[s]")
+    except (ValueError, TypeError, AttributeError):
+        return pd.to_datetime(values, utc=True)
+    digits = codes[:, [20, 21, 23, 24]].astype(np.int64) - ord("0")
+    offset = (digits[:, 0] * 10 + digits[:, 1]) * 3600 + (digits[:, 2] * 10 + digits[:, 3]) * 60
+    offset = np.where(sign == ord("-"), -offset, offset)
+    utc = local - offset.astype("timedelta64[s]")
+    # cùng kiểu (độ phân giải) với kết quả của pandas
+    dtype = pd.to_datetime(values.iloc[:1], utc=True).dtype
+    return pd.Series(pd.DatetimeIndex(utc).tz_localize("UTC"), index=values.index, name=values.name).astype(dtype)
+
+
+def format_iso_utc(values):
+    """Chuỗi 'YYYY-MM-DD HH:MM:SS+00:00' như DataFrame.to_csv() ghi, nhưng vector hoá.
+
+    Chỉ dùng cho cột UTC không có phần lẻ của giây; trường hợp khác trả về None.
+    """
+    if getattr(values.dt, "tz", None) is None or str(values.dt.tz) != "UTC" or values.isna().any():
+        return None
+    seconds = values.to_numpy(dtype="datetime64[s]")
+    if (values.to_numpy(dtype="datetime64[ns]") != seconds).any():
+        return None
+    text = np.char.replace(np.datetime_as_string(seconds, unit="s"), "T", " ")
+    return pd.Series(np.char.add(text, "+00:00"), index=values.index, name=values.name)
+
+
+class QuantileSketch:
+    """Ước lượng phân vị theo luồng, bộ nhớ giới hạn và gộp được (kiểu KLL).
+
+    Các giá trị được giữ trong nhiều tầng; tầng h có trọng số 2**h. Khi một tầng vượt quá
+    k phần tử, nó được sắp xếp và giữ lại một nửa (xen kẽ, vị trí bắt đầu ngẫu nhiên) để
+    đẩy lên tầng trên. Bộ nhớ cỡ k * log2(n / k); sai số thứ hạng cỡ n / k.
+
+    Khi chưa phải nén lần nào (n <= k), quantile() tính chính xác, cùng cách nội suy
+    tuyến tính với pandas Series.quantile().
+    """
+
+    def __init__(self, k=4096, seed=0):
+        self.k = k
+        self.count = 0
+        self.exact = True
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, buf in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], buf])
+        self.count += other.count
+        self.exact &= other.exact
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            buf = self.levels[h]
+            if len(buf) > self.k:
+                self.exact = False
+                buf = np.sort(buf)
+                rest = buf[:0]
+                if len(buf) % 2:
+                    # số lẻ phần tử: một phần tử (chọn ngẫu nhiên) ở lại tầng hiện tại
+                    i = self._rng.integers(len(buf))
+                    rest, buf = buf[i:i + 1], np.delete(buf, i)
+                promoted = buf[self._rng.integers(2)::2]
+                self.levels[h] = rest
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float("nan")
+        if self.exact:
+            return float(np.quantile(self.levels[0], q))
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(buf), 2.0 ** h) for h, buf in enumerate(self.levels)])
+        order = np.argsort(values)
+        values, cum = values[order], np.cumsum(weights[order])
+        i = np.searchsorted(cum, q * cum[-1], side="left")
+        return float(values[min(i, len(values) - 1)])
+
+
+class Stage:
+    """Một bước của pipeline.
+
+    transform(chunk) nhận và trả về một DataFrame (một khối dữ liệu). Bước cần thống kê
+    trên toàn bộ dữ liệu đặt needs_fit = True và cài start_fit() / fit(chunk): pipeline
+    gọi fit() với mọi khối (đã qua các bước trước) trong một lượt đọc riêng. reset() xoá
+    trạng thái nối giữa các khối trước mỗi lượt đọc.
+    """
+
+    name = "stage"
+    needs_fit = False
+
+    def reset(self):
+        pass
+
+    def start_fit(self):
+        pass
+
+    def fit(self, chunk):
+        pass
+
+    def transform(self, chunk):
+        return chunk
+
+
+class FillMissing(Stage):
+    """Điền giá trị thiếu: 'ffill' (mặc định, như notebook) hoặc 'drop' (bỏ dòng thiếu)."""
+
+    name = "fill"
+
+    def __init__(self, method="ffill", columns=None):
+        if method not in ("ffill", "drop"):
+            raise ValueError(f"unknown fill method: {method!r}")
+        self.method = method
+        self.columns = columns
+        self._last = None
+
+    def reset(self):
+        self._last = None
+
+    def transform(self, chunk):
+        columns = self.columns if self.columns is not None else list(chunk.columns)
+        if self.method == "drop":
+            return chunk.dropna(subset=columns)
+        if self._last is not None:
+            # giá trị cuối của khối trước dùng để điền các ô thiếu ở đầu khối này
+            filled = pd.concat([self._last, chunk[columns]]).ffill().iloc[1:]
+        else:
+            filled = chunk[columns].ffill()
+        chunk = chunk.copy()
+        chunk[columns] = filled
+        if len(chunk):
+            self._last = chunk[columns].iloc[-1:]
+        return chunk
+
+
+class QuantileFilter(Stage):
+    """Bỏ các dòng có column nằm ngoài [phân vị lower, phân vị upper]."""
+
+    name = "outliers"
+    needs_fit = True
+
+    def __init__(self, column="Close", lower=0.05, upper=0.95, k=4096):
+        self.column = column
+        self.lower = lower
+        self.upper = upper
+        self.k = k
+        self.sketch = QuantileSketch(k)
+        self.limits = None
+
+    def start_fit(self):
+        self.sketch, self.limits = QuantileSketch(self.k), None
+
+    def fit(self, chunk):
+        self.sketch.update(chunk[self.column].to_numpy(dtype=np.float64))
+
+    def _limits(self):
+        if self.limits is None:
+            self.limits = (self.sketch.quantile(self.lower), self.sketch.quantile(self.upper))
+        return self.limits
+
+    def transform(self, chunk):
+        lower, upper = self._limits()
+        values = chunk[self.column]
+        return chunk[(values <= upper) & (values >= lower)]
+
+
+class NormalizeTimezone(Stage):
+    """Chuyển cột thời gian (chuỗi có múi giờ như -04:00) sang datetime theo tz (mặc định UTC)."""
+
+    name = "timezone"
+
+    def __init__(self, column="Date", tz="UTC"):
+        self.column = column
+        self.tz = tz
+
+    def transform(self, chunk):
+        chunk = chunk.copy()
+        values = parse_iso_utc(chunk[self.column])
+        chunk[self.column] = values if self.tz == "UTC" else values.dt.tz_convert(self.tz)
+        return chunk
+
+
+class Deduplicate(Stage):
+    """Bỏ các dòng trùng khoá (mặc định Date), giữ dòng đầu tiên.
+
+    assume_sorted=True (dữ liệu đã theo thứ tự thời gian): các dòng trùng nằm liền nhau,
+    chỉ cần nhớ khoá cuối của khối trước nên bộ nhớ không đổi. assume_sorted=False: nhớ
+    mã băm của mọi khoá đã gặp (8 byte mỗi khoá).
+    """
+
+    name = "dedup"
+
+    def __init__(self, subset=("Date",), assume_sorted=True):
+        self.subset = list(subset)
+        self.assume_sorted = assume_sorted
+        self._last = None
+        self._seen = np.empty(0, dtype=np.uint64)
+
+    def reset(self):
+        self._last = None
+        self._seen = np.empty(0, dtype=np.uint64)
+
+    def transform(self, chunk):
+        if not len(chunk):
+            return chunk
+        keys = pd.util.hash_pandas_object(chunk[self.subset], index=False).to_numpy()
+        keep = ~pd.Series(keys).duplicated(keep="first").to_numpy()
+        if self.assume_sorted:
+            if self._last is not None:
+                keep &= keys != self._last
+            self._last = keys[-1]
+        else:
+            keep &= ~np.isin(keys, self._seen)
+            self._seen = np.union1d(self._seen, keys[keep])
+        return chunk[keep]
+
+
+def default_stages():
+    return [FillMissing(), QuantileFilter(), NormalizeTimezone(), Deduplicate()]
+
+
+class CleaningPipeline:
+    """Chạy các bước làm sạch trên DataFrame hoặc trên file CSV theo từng khối.
+
+    Sau mỗi lần chạy, report() trả về bảng số dòng vào/ra và thời gian của từng bước.
+    """
+
+    def __init__(self, stages=None, chunksize=DEFAULT_CHUNKSIZE):
+        self.stages = list(stages) if stages is not None else default_stages()
+        self.chunksize = chunksize
+        self._stats = {}
+
+    def _record(self, name, rows_in, rows_out, seconds):
+        stats = self._stats.setdefault(name, {"rows_in": 0, "rows_out": 0, "seconds": 0.0})
+        stats["rows_in"] += rows_in
+        stats["rows_out"] += rows_out
+        stats["seconds"] += seconds
+
+    def _apply(self, chunk, stages):
+        for stage in stages:
+            t0 = time.perf_counter()
+            out = stage.transform(chunk)
+            self._record(stage.name, len(chunk), len(out), time.perf_counter() - t0)
+            chunk = out
+        return chunk
+
+    def _run(self, chunks):
+        """chunks: hàm trả về một iterator mới qua các khối (mỗi lượt đọc gọi một lần)."""
+        self._stats = {}
+        for i, stage in enumerate(self.stages):
+            if not stage.needs_fit:
+                continue
+            # lượt fit: cho dữ liệu qua các bước trước rồi cập nhật thống kê của bước i
+            for prev in self.stages[:i]:
+                prev.reset()
+            stage.start_fit()
+            for chunk in self._timed_read(chunks(), "read (fit pass)"):
+                chunk = self._apply(chunk, self.stages[:i])
+                t0 = time.perf_counter()
+                stage.fit(chunk)
+                self._record(f"fit:{stage.name}", len(chunk), len(chunk), time.perf_counter() - t0)
+            # số dòng của lượt fit không tính vào lượt ghi
+            for prev in self.stages[:i]:
+                self._stats.pop(prev.name, None)
+        for stage in self.stages:
+            stage.reset()
+        for chunk in self._timed_read(chunks(), "read"):
+            yield self._apply(chunk, self.stages)
+
+    def _timed_read(self, chunks, name):
+        while True:
+            t0 = time.perf_counter()
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            self._record(name, len(chunk), len(chunk), time.perf_counter() - t0)
+            yield chunk
+
+    def clean_frame(self, df):
+        """Làm sạch một DataFrame trong bộ nhớ (ví dụ trong notebook)."""
+        def chunks():
+            return iter([df.iloc[i:i + self.chunksize] for i in range(0, max(len(df), 1), self.chunksize)])
+        parts = list(self._run(chunks))
+        return pd.concat(parts) if parts else df.iloc[:0]
+
+    def clean_csv(self, src, dst):
+        """Đọc src theo từng khối, làm sạch và ghi ra dst (ghi file tạm rồi đổi tên)."""
+        tmp = f"{dst}.{os.getpid()}.tmp"
+        header = True
+        try:
+            with open(tmp, "w", newline="") as f:
+                for chunk in self._run(lambda: iter(pd.read_csv(src, chunksize=self.chunksize))):
+                    t0 = time.perf_counter()
+                    chunk = chunk.copy()
+                    for name in chunk.columns:
+                        if isinstance(chunk[name].dtype, pd.DatetimeTZDtype):
+                            text = format_iso_utc(chunk[name])
+                            if text is not None:
+                                chunk[name] = text
+                    chunk.to_csv(f, index=False, header=header)
+                    self._record("write", len(chunk), len(chunk), time.perf_counter() - t0)
+                    header = False
+            os.replace(tmp, dst)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return self.report()
+
+    def report(self):
+        """Bảng số dòng vào/ra và thời gian (giây) của từng bước ở lần chạy gần nhất."""
+        return pd.DataFrame.from_dict(self._stats, orient="index", columns=["rows_in", "rows_out", "seconds"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Làm sạch file CSV OHLCV theo từng khối.")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--lower", type=float, default=0.05)
+    parser.add_argument("--upper", type=float, default=0.95)
+    parser.add_argument("--fill", choices=["ffill", "drop"], default="ffill")
+    parser.add_argument("--tz", default="UTC")
+    args = parser.parse_args()
+
+    stages = [
+        FillMissing(args.fill),
+        QuantileFilter("Close", args.lower, args.upper),
+        NormalizeTimezone("Date", args.tz),
+        Deduplicate(),
+    ]
+    pipeline = CleaningPipeline(stages, chunksize=args.chunksize)
+    print(pipeline.clean_csv(args.src, args.dst).to_string())
+
+
+if __name__ == "__main__":
+    main()
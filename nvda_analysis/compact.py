@@ -0,0 +1,67 @@
+"""Dạng gọn trong bộ nhớ của các bộ dữ liệu mà dashboard giữ suốt đời tiến trình.
+
+compact_frame(df, display) trả về bản sao gọn của df:
+
+  - Các cột hiển thị (display: chỉ số, giá chỉ dùng để vẽ) thành DISPLAY_DTYPE
+    (NVDA_DISPLAY_DTYPE, mặc định float32: nửa bộ nhớ, vẫn thừa so với 6 chữ số có nghĩa
+    của nvda_analysis.payload). Cột dùng để tính tiếp (giá của df_cleaned, Return) nên
+    để ngoài display để giữ float64.
+  - Volume thành int32 nếu vừa, ngược lại uint64 (số nguyên không âm), thay vì float64/int64.
+  - Dividends, Stock Splits (hầu như toàn 0) thành cột thưa: chỉ lưu các ngày khác 0.
+
+NVDA_COMPACT=0 tắt cả ba (compact_frame trả lại df nguyên vẹn) để so sánh bộ nhớ.
+
+    df = compact_frame(df, display=["SMA20", "RSI"])
+    frame_bytes(df)    # số byte các cột và index
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+ENABLED = os.environ.get("NVDA_COMPACT", "1").lower() not in ("0", "false", "no")
+DISPLAY_DTYPE = np.dtype(os.environ.get("NVDA_DISPLAY_DTYPE", "float32"))
+
+# Cột sự kiện doanh nghiệp: hầu hết các phiên bằng 0
+CORPORATE_ACTIONS = ("Dividends", "Stock Splits")
+
+
+def volume_dtype(values):
+    """Kiểu số nguyên nhỏ nhất (int32, rồi uint64) chứa đúng values, None nếu không có."""
+    values = np.asarray(values)
+    if not len(values):
+        return None
+    if values.dtype.kind == "f":
+        if not np.isfinite(values).all() or (values != np.round(values)).any():
+            return None
+    elif values.dtype.kind not in "iu":
+        return None
+    lo, hi = values.min(), values.max()
+    if lo >= np.iinfo(np.int32).min and hi <= np.iinfo(np.int32).max:
+        return np.dtype(np.int32)
+    if lo >= 0 and hi <= np.iinfo(np.uint64).max:
+        return np.dtype(np.uint64)
+    return None
+
+
+def compact_frame(df, display=(), dtype=DISPLAY_DTYPE):
+    """Bản sao gọn của df (xem đầu module); df không bị sửa."""
+    if not ENABLED:
+        return df
+    out = df.copy(deep=False)
+    for name in display:
+        if name in out and out[name].dtype.kind == "f":
+            out[name] = out[name].to_numpy().astype(dtype, copy=False)
+    if "Volume" in out:
+        target = volume_dtype(out["Volume"].to_numpy())
+        if target is not None:
+            out["Volume"] = out["Volume"].to_numpy().astype(target)
+    for name in CORPORATE_ACTIONS:
+        if name in out and not isinstance(out[name].dtype, pd.SparseDtype):
+            out[name] = pd.arrays.SparseArray(out[name].to_numpy(), fill_value=0.0)
+    return out
+
+
+def frame_bytes(df):
+    """Số byte các cột và index của df (cột thưa: chỉ phần khác 0)."""
+    return int(df.memory_usage(index=True, deep=True).sum())
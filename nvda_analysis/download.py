@@ -0,0 +1,316 @@
+"""Tải dữ liệu giá tăng dần cho nhiều mã (thay cho ô yf.Ticker(...).history(period="1y")).
+
+Mỗi mã được lưu trong một file CSV (định dạng của yfinance: Date, Open, High, Low, Close,
+Volume, ...). Downloader chỉ hỏi nguồn dữ liệu (provider) các khoảng thời gian file còn
+thiếu: từ phiên cuối cùng đã lưu đến hiện tại, và phần trước dòng đầu nếu start sớm hơn.
+Phiên cuối được tải lại và ghi đè dòng cuối của file (lần chạy trong giờ giao dịch lưu
+cây nến chưa đóng của hôm nay), các phiên mới được nối (append) vào cuối file; nếu ghi lỗi
+giữa chừng, file được khôi phục như cũ. Nếu phiên mới có cổ tức hoặc chia tách cổ phiếu,
+provider đã điều chỉnh lại giá của mọi phiên cũ (yfinance mặc định auto_adjust=True), nên
+cả file được tải và ghi lại thay vì nối thêm. Nhiều mã được tải song song bằng một thread
+pool có giới hạn, mỗi lần gọi provider được thử lại với thời gian chờ tăng dần
+(exponential backoff).
+
+    downloader = Downloader(YFinanceProvider(), "data/tickers", workers=8)
+    downloader.update(["NVDA", "AMD", "TSM"])           # data/tickers/<MÃ>.csv
+    downloader.update({"NVDA": "nvda_stock_data.csv"})  # hoặc chỉ định file của từng mã
+
+    python -m nvda_analysis.download NVDA AMD TSM --dir data/tickers
+
+CannedProvider đọc dữ liệu từ các file CSV có sẵn (<MÃ>.csv), dùng thay yfinance khi
+kiểm thử hoặc không có mạng. yfinance là tuỳ chọn: chỉ cần khi dùng YFinanceProvider.
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# Múi giờ của sàn (yfinance trả Date theo giờ New York cho cổ phiếu Mỹ)
+EXCHANGE_TZ = "America/New_York"
+# Lần tải đầu tiên của một mã (file chưa có): lấy từng này dữ liệu
+DEFAULT_PERIOD = pd.Timedelta(days=365)
+COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+
+class SymbolNotFound(LookupError):
+    """Provider không có dữ liệu cho mã này (không thử lại)."""
+
+
+class Provider:
+    """Nguồn dữ liệu: fetch() trả DataFrame index Date (có múi giờ), các cột COLUMNS,
+    gồm các phiên trong [start, end)."""
+
+    name = "provider"
+
+    def fetch(self, symbol, start, end):
+        raise NotImplementedError
+
+
+class YFinanceProvider(Provider):
+    name = "yfinance"
+
+    def __init__(self, interval="1d"):
+        import yfinance  # noqa: F401 - báo lỗi sớm nếu chưa cài
+        self.interval = interval
+
+    def fetch(self, symbol, start, end):
+        import yfinance as yf
+        return yf.Ticker(symbol).history(start=start, end=end, interval=self.interval)
+
+
+class CannedProvider(Provider):
+    """Đọc <directory>/<MÃ>.csv có sẵn; delay (giây) giả lập độ trễ mạng của mỗi lần gọi."""
+
+    name = "canned"
+
+    def __init__(self, directory, delay=0.0):
+        self.directory = directory
+        self.delay = delay
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _frame(self, symbol):
+        with self._lock:
+            if symbol not in self._frames:
+                path = os.path.join(self.directory, f"{symbol}.csv")
+                if not os.path.exists(path):
+                    raise SymbolNotFound(symbol)
+                df = pd.read_csv(path)
+                df["Date"] = pd.to_datetime(df["Date"], utc=True).dt.tz_convert(EXCHANGE_TZ)
+                self._frames[symbol] = df.set_index("Date").sort_index()
+            return self._frames[symbol]
+
+    def fetch(self, symbol, start, end):
+        if self.delay:
+            time.sleep(self.delay)
+        df = self._frame(symbol)
+        return df[(df.index >= start) & (df.index < end)]
+
+
+PROVIDERS = {
+    "yfinance": YFinanceProvider,
+    "canned": CannedProvider,
+}
+
+
+def _last_line(path, block=4096):
+    # (vị trí byte đầu dòng, nội dung) của dòng cuối, đọc từ cuối file (không đọc cả file)
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        tail = b""
+        while size and tail.count(b"\n") < 2:
+            step = min(block, size)
+            size -= step
+            f.seek(size)
+            tail = f.read(step) + tail
+    body = tail.rstrip(b"\r\n")
+    start = body.rfind(b"\n") + 1
+    return size + start, body[start:].decode()
+
+
+def stored_range(path):
+    """(header, Date đầu, Date cuối) của file CSV đã lưu; (None, None, None) nếu chưa có."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None, None, None
+    with open(path) as f:
+        header = f.readline().rstrip("\r\n").split(",")
+        first = f.readline().split(",", 1)[0]
+    last = _last_line(path)[1].split(",", 1)[0]
+    if not first:
+        return header, None, None
+    return header, pd.Timestamp(first), pd.Timestamp(last)
+
+
+def _format(df, header):
+    # Dòng CSV theo đúng thứ tự cột của file đã có
+    df = df.reindex(columns=header[1:])
+    df.index.name = header[0]
+    return df.to_csv(header=False)
+
+
+def append_rows(path, df, replace_last=False):
+    """Nối các dòng df vào cuối file (replace_last: ghi đè dòng cuối đang có); nếu lỗi,
+    khôi phục phần cuối file như trước khi ghi."""
+    header, _, _ = stored_range(path)
+    payload = _format(df, header).encode()
+    start = _last_line(path)[0] if replace_last else None
+    with open(path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if start is None:
+            start = size
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    payload = b"\n" + payload
+        f.seek(start)
+        old = f.read()
+        try:
+            f.seek(start)
+            f.write(payload)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.seek(start)
+            f.write(old)
+            f.truncate()
+            raise
+    return len(df)
+
+
+def write_rows(path, df, header=None):
+    """Ghi lại toàn bộ file (file mới, hoặc có thêm dữ liệu trước dòng đầu): file tạm + os.replace."""
+    header = header or ["Date"] + COLUMNS
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", newline="") as f:
+            f.write(",".join(header) + "\n")
+            f.write(_format(df, header))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return len(df)
+
+
+def _has_actions(df):
+    # Có cổ tức hoặc chia tách cổ phiếu (giá trị khác 0) trong df
+    actions = df.reindex(columns=["Dividends", "Stock Splits"]).fillna(0)
+    return bool((actions.to_numpy() != 0).any())
+
+
+class Downloader:
+    """Cập nhật file CSV của nhiều mã từ provider, song song và chỉ tải phần còn thiếu."""
+
+    def __init__(self, provider, directory=".", workers=8, retries=3, backoff=0.5, period=DEFAULT_PERIOD):
+        self.provider = provider
+        self.directory = directory
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.period = period
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def path(self, symbol):
+        return os.path.join(self.directory, f"{symbol}.csv")
+
+    def _lock(self, path):
+        with self._locks_guard:
+            return self._locks.setdefault(os.path.abspath(path), threading.Lock())
+
+    def _fetch(self, symbol, start, end, stats):
+        # Gọi provider, thử lại khi lỗi tạm thời; chờ backoff * 2**lần thử (có jitter)
+        for attempt in range(self.retries + 1):
+            stats["attempts"] += 1
+            try:
+                df = self.provider.fetch(symbol, start, end)
+                return df[(df.index >= start) & (df.index < end)]
+            except SymbolNotFound:
+                raise
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt * (0.5 + random.random()))
+
+    def missing_ranges(self, path, start=None, end=None):
+        """Các khoảng [start, end) cần tải: trước dòng đầu (nếu start sớm hơn) và từ dòng cuối."""
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp.now(tz=EXCHANGE_TZ)
+        if end.tzinfo is None:
+            end = end.tz_localize(EXCHANGE_TZ)
+        _, first, last = stored_range(path)
+        if first is None:
+            start = pd.Timestamp(start) if start is not None else end - self.period
+            return [(start.tz_localize(EXCHANGE_TZ) if start.tzinfo is None else start, end)]
+        ranges = []
+        if start is not None:
+            start = pd.Timestamp(start)
+            start = start.tz_localize(EXCHANGE_TZ) if start.tzinfo is None else start
+            if start < first:
+                ranges.append((start, first))
+        if last < end:
+            # tải lại cả phiên cuối: có thể là cây nến chưa đóng của lần chạy trước
+            ranges.append((last, end))
+        return ranges
+
+    def update_symbol(self, symbol, path=None, start=None, end=None):
+        """Tải phần còn thiếu của một mã; trả dict thống kê (số dòng thêm, số lần gọi, ...)."""
+        path = path or self.path(symbol)
+        stats = {"symbol": symbol, "path": path, "rows_added": 0, "attempts": 0, "seconds": 0.0, "error": None}
+        t0 = time.perf_counter()
+        try:
+            with self._lock(path):
+                header, first, last = stored_range(path)
+                for lo, hi in self.missing_ranges(path, start, end):
+                    df = self._fetch(symbol, lo, hi, stats).sort_index()
+                    df = df[~df.index.duplicated(keep="last")]
+                    if first is None:
+                        # file mới: ghi cả file (kể cả khi chưa có dòng nào, để có header)
+                        stats["rows_added"] += write_rows(path, df)
+                        header, first, last = stored_range(path)
+                    elif hi <= first:
+                        # dữ liệu cũ hơn dòng đầu: ghi lại cả file (hiếm, chỉ khi lùi start)
+                        old = pd.read_csv(path, index_col=0)
+                        new = df.reindex(columns=header[1:])
+                        new.index = new.index.astype(str)
+                        write_rows(path, pd.concat([new, old]), header)
+                        stats["rows_added"] += len(df)
+                        header, first, last = stored_range(path)
+                    else:
+                        added = int((df.index > last).sum())
+                        if _has_actions(df[df.index > last]):
+                            # giá cũ đã được điều chỉnh theo sự kiện mới: ghi lại cả file
+                            df = self._fetch(symbol, first, hi, stats).sort_index()
+                            write_rows(path, df[~df.index.duplicated(keep="last")], header)
+                        elif len(df) and df.index[0] == last:
+                            append_rows(path, df, replace_last=True)
+                        elif added:
+                            append_rows(path, df[df.index > last])
+                        stats["rows_added"] += added
+                        if added:
+                            last = df.index[-1]
+        except Exception as exc:
+            stats["error"] = f"{type(exc).__name__}: {exc}"
+        stats["seconds"] = time.perf_counter() - t0
+        return stats
+
+    def update(self, symbols, start=None, end=None):
+        """Cập nhật nhiều mã song song; symbols là list mã hoặc dict {mã: đường dẫn file}.
+
+        Trả bảng thống kê mỗi mã: path, rows_added, attempts, seconds, error.
+        """
+        paths = symbols if isinstance(symbols, dict) else {symbol: None for symbol in symbols}
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(paths)))) as pool:
+            futures = [pool.submit(self.update_symbol, symbol, path, start, end)
+                       for symbol, path in paths.items()]
+            rows = [future.result() for future in futures]
+        return pd.DataFrame(rows).set_index("symbol")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tải/cập nhật dữ liệu giá của nhiều mã (chỉ phần còn thiếu).")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--dir", default=os.path.join("data", "tickers"))
+    parser.add_argument("--provider", choices=sorted(PROVIDERS), default="yfinance")
+    parser.add_argument("--source", help="thư mục CSV có sẵn cho --provider canned")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--start", help="ngày bắt đầu (mặc định: 1 năm trước với mã chưa có file)")
+    args = parser.parse_args()
+
+    provider = CannedProvider(args.source) if args.provider == "canned" else YFinanceProvider()
+    downloader = Downloader(provider, args.dir, workers=args.workers, retries=args.retries)
+    print(downloader.update([s.upper() for s in args.symbols], start=args.start).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Giảm số điểm gửi lên trình duyệt cho các biểu đồ nến và biểu đồ đường.
+
+Số điểm tối đa (point budget) được tính từ độ rộng khung nhìn: vài điểm cho mỗi pixel
+là đủ, vẽ nhiều hơn chỉ làm JSON của figure phình to mà không nhìn thấy khác biệt.
+
+  - Nến (OHLC): gộp các nến liên tiếp thành nến thô hơn (open đầu, high max, low min,
+    close cuối, volume tổng).
+  - Đường: LTTB (Largest-Triangle-Three-Buckets) giữ hình dạng đường giá, hoặc min/max
+    theo từng nhóm (nhanh hơn, giữ mọi đỉnh/đáy).
+
+Khi người dùng phóng to (zoom), dashboard gọi lại với khoảng thời gian đang xem nên dữ
+liệu được lấy lại ở độ phân giải cao hơn.
+
+Ngoài giới hạn theo độ rộng khung nhìn, mỗi figure có tổng số điểm tối đa (FIGURE_POINTS,
+chia đều cho các trace): figure nhiều trace không gửi gấp nhiều lần số điểm. Trace có
+nhiều điểm hơn WEBGL_THRESHOLD được vẽ bằng WebGL (Scattergl): SVG chậm hẳn khi mỗi
+trace có vài chục nghìn điểm.
+"""
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+# Độ rộng khung nhìn (px) giả định trước khi trình duyệt báo kích thước thật
+DEFAULT_WIDTH = 1200
+POINTS_PER_PIXEL = 2
+PIXELS_PER_CANDLE = 3
+MIN_POINTS = 200
+MAX_POINTS = 10_000
+# Tổng số điểm tối đa của một figure (mọi trace cộng lại)
+FIGURE_POINTS = int(os.environ.get("NVDA_FIGURE_POINTS", 20_000))
+# Trace có nhiều điểm hơn ngưỡng này dùng WebGL thay vì SVG
+WEBGL_THRESHOLD = int(os.environ.get("NVDA_WEBGL_THRESHOLD", 5_000))
+
+
+def point_budget(width=None, points_per_pixel=POINTS_PER_PIXEL):
+    width = width or DEFAULT_WIDTH
+    return int(min(MAX_POINTS, max(MIN_POINTS, width * points_per_pixel)))
+
+
+def candle_budget(width=None):
+    return point_budget(width, 1 / PIXELS_PER_CANDLE)
+
+
+def figure_budget(traces, width=None):
+    """Số điểm tối đa của mỗi trace trong một figure có traces trace."""
+    return max(MIN_POINTS, min(point_budget(width), FIGURE_POINTS // max(1, traces)))
+
+
+def use_webgl(points):
+    return points > WEBGL_THRESHOLD
+
+
+def _as_float(x):
+    if isinstance(x, pd.DatetimeIndex):
+        # có thể có múi giờ: dùng trực tiếp số nano giây (UTC)
+        return x.asi8.astype(np.float64)
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """Chỉ số các điểm được giữ lại theo thuật toán LTTB (Steinarsson, 2013)."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    every = (n - 2) / (n_out - 2)
+    # nhóm i gồm các điểm [edges[i], edges[i+1]); điểm đầu và cuối luôn được giữ
+    edges = (np.floor(np.arange(n_out - 1) * every) + 1).astype(np.int64)
+    edges[-1] = n - 1
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / np.diff(edges)
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / np.diff(edges)
+    avg_x = np.append(avg_x[1:], x[-1])
+    avg_y = np.append(avg_y[1:], y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # diện tích tam giác (điểm đã chọn, điểm ứng viên, trung bình nhóm kế tiếp)
+        area = np.abs((x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax_indices(y, n_out):
+    """Chỉ số điểm nhỏ nhất và lớn nhất của mỗi nhóm (giữ đủ các đỉnh/đáy)."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    size = math.ceil(n / ((n_out - 2) // 2))
+    rows = math.ceil(n / size)
+    # nhóm cuối được lấp bằng điểm cuối cùng (argmin/argmax trả về vị trí xuất hiện đầu tiên)
+    padded = np.full(rows * size, y[-1])
+    padded[:n] = y
+    padded = padded.reshape(rows, size)
+    base = np.arange(rows) * size
+    keep = np.concatenate(([0, n - 1], base + np.argmin(padded, axis=1), base + np.argmax(padded, axis=1)))
+    return np.unique(keep)
+
+
+def _reduce(series, budget, method):
+    # Chỉ số các điểm giữ lại của một đoạn không có NaN
+    y = series.to_numpy(dtype=np.float64)
+    if method == "minmax":
+        return minmax_indices(y, budget)
+    return lttb_indices(series.index, y, budget)
+
+
+def line(series, budget, method="lttb"):
+    """(x, y) của một chuỗi thời gian sau khi giảm còn tối đa budget điểm.
+
+    Chuỗi đủ ngắn được giữ nguyên. Khi phải giảm, NaN ở đầu và cuối chuỗi (phần khởi động
+    của chỉ số) bị bỏ; khoảng trống NaN ở giữa được giữ: mỗi đoạn liên tục được giảm riêng
+    (số điểm chia theo độ dài đoạn) và giữa hai đoạn có một điểm NaN, để đường vẫn bị ngắt
+    như ở độ phân giải đầy đủ.
+    """
+    if len(series) <= budget:
+        return series.index, series.to_numpy()
+    valid = series.notna().to_numpy()
+    if not valid.any():
+        return series.index[:0], series.to_numpy()[:0]
+    first, last = int(np.argmax(valid)), len(valid) - int(np.argmax(valid[::-1]))
+    series, valid = series.iloc[first:last], valid[first:last]
+    if len(series) <= budget:
+        return series.index, series.to_numpy()
+    if valid.all():
+        idx = _reduce(series, budget, method)
+        return series.index[idx], series.to_numpy(dtype=np.float64)[idx]
+    # Các đoạn liên tục [starts[i], stops[i]) và khoảng trống giữa chúng
+    edges = np.flatnonzero(np.diff(valid.astype(np.int8)))
+    starts = np.concatenate(([0], edges[1::2] + 1))
+    stops = np.concatenate((edges[::2] + 1, [len(valid)]))
+    share = max(0, budget - (len(starts) - 1)) / int(valid.sum())
+    keep = []
+    for i, (lo, hi) in enumerate(zip(starts, stops)):
+        if i:
+            keep.append(np.array([stops[i - 1]]))   # điểm NaN đầu tiên của khoảng trống
+        keep.append(lo + _reduce(series.iloc[lo:hi], int(share * (hi - lo)), method))
+    idx = np.concatenate(keep)
+    return series.index[idx], series.to_numpy(dtype=np.float64)[idx]
+
+
+def resample_ohlc(df, budget):
+    """Gộp các nến liên tiếp để còn tối đa budget nến."""
+    n = len(df)
+    if n <= budget:
+        return df
+    size = math.ceil(n / budget)
+    starts = np.arange(0, n, size)
+    ends = np.minimum(starts + size, n) - 1
+    out = {
+        "Open": df["Open"].to_numpy()[starts],
+        "High": np.maximum.reduceat(df["High"].to_numpy(), starts),
+        "Low": np.minimum.reduceat(df["Low"].to_numpy(), starts),
+        "Close": df["Close"].to_numpy()[ends],
+    }
+    if "Volume" in df:
+        # cộng dồn bằng kiểu 64 bit như rollup.rollup: Volume có thể là int32 (nvda_analysis.compact)
+        volume = df["Volume"].to_numpy()
+        total = volume.dtype if volume.dtype == np.uint64 else np.promote_types(volume.dtype, np.int64)
+        out["Volume"] = np.add.reduceat(volume, starts, dtype=total)
+    return pd.DataFrame(out, index=df.index[starts])
+
+
+def window(df, x_range):
+    """Các dòng của df nằm trong khoảng x_range = (x0, x1), hoặc cả df nếu x_range là None."""
+    if x_range is None:
+        return df
+    x0, x1 = x_range
+    return df.loc[x0:x1]
+
+
+def _timestamp(value, tz):
+    ts = pd.Timestamp(value)
+    if tz is not None:
+        ts = ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+    return ts
+
+
+def parse_relayout(relayout, tz="UTC"):
+    """Đọc relayoutData của dcc.Graph.
+
+    Trả về (x0, x1) khi người dùng zoom, None khi trục x trở về autorange, và False
+    nếu sự kiện không liên quan tới trục x (hover, autosize, ...).
+    """
+    if not relayout:
+        return False
+    if relayout.get("xaxis.autorange"):
+        return None
+    if "xaxis.range[0]" in relayout and "xaxis.range[1]" in relayout:
+        lo, hi = relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+    elif "xaxis.range" in relayout:
+        lo, hi = relayout["xaxis.range"]
+    else:
+        return False
+    return _timestamp(lo, tz), _timestamp(hi, tz)
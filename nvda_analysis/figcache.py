@@ -0,0 +1,89 @@
+"""Bộ đệm JSON đã mã hoá của các figure, khoá theo (tên figure, phiên bản dữ liệu).
+
+Mỗi figure chỉ được rút gọn (nvda_analysis.payload) và chuyển sang JSON một lần cho mỗi
+phiên bản dữ liệu nguồn (bằng orjson nếu đã cài, qua plotly.io.json). Các lần mở tab sau
+chỉ gửi lại đúng các byte đó, kèm ETag để trình duyệt nhận 304 khi đã có bản giống hệt.
+
+    cache = FigureCache()
+    entry = cache.get("fig_RSI", version, lambda: figures.get("fig_RSI"))
+    entry.body, entry.etag
+
+FigureCache(encode=encode_layout) dùng cho JSON của layout các tab (component Dash).
+
+orjson là tuỳ chọn: nếu chưa cài, figure được mã hoá bằng bộ json chuẩn (chậm hơn).
+"""
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+from plotly.io.json import to_json_plotly
+
+from nvda_analysis.instrument import stage
+from nvda_analysis.payload import optimize
+
+try:
+    import orjson  # noqa: F401
+    ENGINE = "orjson"
+except ImportError:  # pragma: no cover - orjson là phụ thuộc tuỳ chọn
+    ENGINE = "json"
+
+CachedFigure = namedtuple("CachedFigure", "body etag")
+
+
+def encode_figure(fig):
+    """Bytes JSON đã rút gọn của figure (dạng plotly.js nhận được: data, layout)."""
+    return to_json_plotly(optimize(fig), engine=ENGINE).encode()
+
+
+def encode_layout(component):
+    """Bytes JSON của một cây component Dash (dạng dash-renderer nhận được)."""
+    return to_json_plotly(component, engine=ENGINE).encode()
+
+
+def frame_version(df):
+    """Phiên bản của một DataFrame: băm index và các cột số (giống nhau giữa các worker)."""
+    h = hashlib.blake2b(digest_size=8)
+    index = df.index
+    h.update(np.ascontiguousarray(index.asi8 if hasattr(index, "asi8") else index.to_numpy()).tobytes())
+    for name, values in df.select_dtypes("number").items():
+        h.update(str(name).encode())
+        h.update(np.ascontiguousarray(values.to_numpy()).tobytes())
+    return h.hexdigest()
+
+
+class FigureCache:
+    """JSON của figure theo (tên, phiên bản), giữ tối đa max_entries mục (LRU)."""
+
+    def __init__(self, max_entries=64, encode=encode_figure, stage_name="figure_encode"):
+        self.max_entries = max_entries
+        self.encode = encode
+        self.stage_name = stage_name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name, version, build):
+        """CachedFigure của figure name; build() dựng figure khi chưa có trong bộ đệm."""
+        key = (name, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        figure = build()
+        with stage(f"{self.stage_name}:{name}"):
+            body = self.encode(figure)
+        entry = CachedFigure(body, hashlib.blake2b(body, digest_size=16).hexdigest())
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, names=None):
+        with self._lock:
+            if names is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] in names]:
+                    del self._entries[key]
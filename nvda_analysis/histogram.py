@@ -0,0 +1,149 @@
+"""Histogram tính sẵn ở server: chỉ gửi số đếm của từng bin lên trình duyệt.
+
+histogram() chia bin đều (số bin cố định hoặc theo quy tắc Freedman–Diaconis) rồi đếm trong
+một lượt vectơ hoá (np.bincount), nên payload của figure là O(số bin) thay vì O(số dòng).
+
+StreamingHistogram đếm dần theo từng phần dữ liệu (vd. từng chunk CSV) và gộp được với
+nhau: các bin nằm trên lưới cố định độ rộng 2**exponent (cạnh bin tại k * 2**exponent),
+khi khoảng giá trị vượt quá max_bins thì gộp từng cặp bin kề nhau (tăng exponent).
+
+    counts, edges = histogram(df["Close"], bins=50)
+    counts, edges = histogram(df["Return"], bins="fd")
+"""
+import numpy as np
+
+# Giới hạn số bin khi dùng Freedman–Diaconis (dữ liệu đuôi dài cho rất nhiều bin)
+MAX_BINS = 200
+
+
+def _finite(values):
+    x = np.asarray(values, dtype=np.float64).ravel()
+    return x[np.isfinite(x)]
+
+
+def fd_width(x):
+    """Độ rộng bin theo Freedman–Diaconis: 2 * IQR / n^(1/3) (0 nếu IQR = 0)."""
+    if len(x) < 2:
+        return 0.0
+    q1, q3 = np.percentile(x, [25, 75])
+    return 2.0 * (q3 - q1) / np.cbrt(len(x))
+
+
+def bin_edges(values, bins="fd", max_bins=MAX_BINS):
+    """Cạnh của các bin đều trên [min, max]; bins là số bin hoặc "fd"."""
+    x = _finite(values)
+    if not len(x):
+        return np.array([0.0, 1.0])
+    lo, hi = float(x.min()), float(x.max())
+    if hi <= lo:
+        return np.array([lo - 0.5, hi + 0.5])
+    if bins == "fd":
+        width = fd_width(x)
+        bins = int(np.ceil((hi - lo) / width)) if width > 0 else 1
+    n = int(min(max(bins, 1), max_bins)) if max_bins else int(max(bins, 1))
+    return np.linspace(lo, hi, n + 1)
+
+
+def counts(values, edges):
+    """Số giá trị trong từng bin đều [edges[i], edges[i+1]) (bin cuối gồm cả cạnh phải)."""
+    x = _finite(values)
+    n = len(edges) - 1
+    x = x[(x >= edges[0]) & (x <= edges[-1])]
+    index = ((x - edges[0]) * (n / (edges[-1] - edges[0]))).astype(np.int64)
+    np.minimum(index, n - 1, out=index)
+    return np.bincount(index, minlength=n)
+
+
+def histogram(values, bins="fd", max_bins=MAX_BINS):
+    """(counts, edges) của values; bỏ qua NaN/inf."""
+    edges = bin_edges(values, bins, max_bins)
+    return counts(values, edges), edges
+
+
+def _coarsen(offset, bins):
+    # Gộp từng cặp bin: bin k của lưới mới gồm bin 2k và 2k+1 của lưới cũ
+    positions = np.arange(offset, offset + len(bins)) // 2
+    if not len(positions):
+        return offset // 2, bins
+    new_offset = int(positions[0])
+    return new_offset, np.bincount(positions - new_offset, weights=bins).astype(np.int64)
+
+
+class StreamingHistogram:
+    """Histogram cộng dồn, gộp được (merge) giữa các phần dữ liệu hoặc các tiến trình."""
+
+    def __init__(self, max_bins=MAX_BINS):
+        self.max_bins = max_bins
+        self.exponent = None
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    @property
+    def width(self):
+        return 2.0 ** self.exponent
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def _start(self, x):
+        # Độ rộng ban đầu: Freedman–Diaconis của phần dữ liệu đầu tiên, làm tròn xuống 2**k
+        width = fd_width(x) or (abs(float(x[0])) or 1.0) / self.max_bins
+        self.exponent = int(np.floor(np.log2(width)))
+        self.offset = int(np.floor(x.min() / self.width))
+
+    def _coarsen(self):
+        self.offset, self.counts = _coarsen(self.offset, self.counts)
+        self.exponent += 1
+
+    def _extend(self, first, last):
+        # Mở rộng mảng đếm để chứa các bin [first, last] (gộp bin nếu vượt max_bins)
+        if len(self.counts):
+            first = min(first, self.offset)
+            last = max(last, self.offset + len(self.counts) - 1)
+        while last - first + 1 > self.max_bins:
+            self._coarsen()
+            first, last = first // 2, last // 2
+        out = np.zeros(last - first + 1, dtype=np.int64)
+        out[self.offset - first:self.offset - first + len(self.counts)] = self.counts
+        self.offset, self.counts = first, out
+
+    def add(self, values):
+        x = _finite(values)
+        if not len(x):
+            return self
+        if self.exponent is None:
+            self._start(x)
+        first = int(np.floor(x.min() / self.width))
+        last = int(np.floor(x.max() / self.width))
+        self._extend(first, last)
+        k = np.floor(x / self.width).astype(np.int64) - self.offset
+        self.counts += np.bincount(k, minlength=len(self.counts))
+        return self
+
+    def merge(self, other):
+        """Cộng số đếm của other vào histogram này (hai lưới được đưa về cùng độ rộng)."""
+        if other.exponent is None:
+            return self
+        other_offset, other_counts = other.offset, other.counts
+        if self.exponent is None:
+            self.exponent = other.exponent
+        for _ in range(other.exponent - self.exponent):
+            self._coarsen()
+        for _ in range(self.exponent - other.exponent):
+            other_offset, other_counts = _coarsen(other_offset, other_counts)
+        exponent = self.exponent
+        self._extend(other_offset, other_offset + len(other_counts) - 1)
+        # _extend có thể đã gộp bin của histogram này; gộp other theo cùng số lần
+        for _ in range(self.exponent - exponent):
+            other_offset, other_counts = _coarsen(other_offset, other_counts)
+        start = other_offset - self.offset
+        self.counts[start:start + len(other_counts)] += other_counts
+        return self
+
+    def histogram(self):
+        """(counts, edges) như histogram()."""
+        if self.exponent is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(1)
+        edges = (self.offset + np.arange(len(self.counts) + 1)) * self.width
+        return self.counts.copy(), edges
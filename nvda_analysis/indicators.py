@@ -0,0 +1,230 @@
+"""Bộ tính chỉ số kỹ thuật dùng chung cho app.py và các notebook.
+
+Mỗi chỉ số là một nút trong đồ thị phụ thuộc, khoá bằng tuple (loại, tham số...),
+ví dụ ("sma", "Close", 20) phụ thuộc vào ("rolling_moments", "Close", 20). Các kết quả
+trung gian (tổng trượt, tổng bình phương trượt, EMA12/EMA26, ...) được tính một lần
+cho mỗi phiên bản dữ liệu rồi dùng lại cho mọi chỉ số cần đến. Các phép tính trượt
+dùng kernel NumPy trong nvda_analysis.kernels.
+
+    from nvda_analysis.indicators import add_indicators
+    df = add_indicators(df)    # thêm SMA20, SMA50, EMA20, RSI, MACD, ...
+"""
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from nvda_analysis import kernels
+from nvda_analysis.instrument import stage
+
+OHLCV = ("Open", "High", "Low", "Close", "Volume")
+
+# Tên cột trong DataFrame -> nút tương ứng trong đồ thị
+CLOSE = "Close"
+RETURN = ("pct_change", CLOSE)
+MACD = ("macd", CLOSE, 12, 26)
+SIGNAL = ("ema", MACD, 9)
+
+COLUMNS = {
+    "SMA20": ("sma", CLOSE, 20),
+    "SMA50": ("sma", CLOSE, 50),
+    "EMA20": ("ema", CLOSE, 20),
+    "RSI": ("rsi", CLOSE, 14),
+    "Return": RETURN,
+    "Volatility": ("rolling_std", RETURN, 30),
+    "Upper Band": ("bollinger_upper", CLOSE, 20, 2),
+    "Lower Band": ("bollinger_lower", CLOSE, 20, 2),
+    "EMA12": ("ema", CLOSE, 12),
+    "EMA26": ("ema", CLOSE, 26),
+    "MACD": MACD,
+    "Signal Line": SIGNAL,
+    "MACD Histogram": ("sub", MACD, SIGNAL),
+}
+
+# Các cột app.py và notebook phân tích thêm vào df_cleaned (theo đúng thứ tự cũ)
+DEFAULT_COLUMNS = [
+    "SMA20", "SMA50", "EMA20", "RSI", "Return", "Volatility",
+    "Upper Band", "Lower Band", "EMA12", "EMA26", "MACD", "Signal Line",
+]
+
+
+# EMA không có cửa sổ hữu hạn: tính từ EMA_WARMUP * span phiên trước thì sai lệch do điểm
+# khởi đầu còn (1 - 2 / (span + 1)) ** (EMA_WARMUP * span) ~ e^-12 lần chênh lệch ban đầu
+EMA_WARMUP = 6
+
+# Quy tắc tính: loại nút -> (hàm trả về các nút phụ thuộc, hàm tính)
+_RULES = {}
+# Số phiên trước đó mà một nút cần (ngoài phần các nút phụ thuộc đã cần)
+_LOOKBACK = {}
+
+
+def rule(kind, deps, lookback=None):
+    def decorator(func):
+        _RULES[kind] = (deps, func)
+        if lookback is not None:
+            _LOOKBACK[kind] = lookback
+        return func
+    return decorator
+
+
+@rule("diff", lambda src: [src], lookback=lambda src: 1)
+def _diff(x, src):
+    return kernels.diff(x)
+
+
+@rule("pct_change", lambda src: [src], lookback=lambda src: 1)
+def _pct_change(x, src):
+    return kernels.pct_change(x)
+
+
+# Trung bình và độ lệch chuẩn trượt dùng chung tổng trượt / tổng bình phương trượt
+@rule("rolling_moments", lambda src, window: [src], lookback=lambda src, window: window - 1)
+def _rolling_moments(x, src, window):
+    return kernels.rolling_mean_std(x, window)
+
+
+@rule("sma", lambda src, window: [("rolling_moments", src, window)])
+def _sma(moments, src, window):
+    return moments[0]
+
+
+@rule("rolling_std", lambda src, window: [("rolling_moments", src, window)])
+def _rolling_std(moments, src, window):
+    # Độ lệch chuẩn mẫu (ddof=1) như Series.rolling().std()
+    return moments[1]
+
+
+@rule("ema", lambda src, span: [src], lookback=lambda src, span: EMA_WARMUP * span)
+def _ema(x, src, span):
+    return pd.Series(x).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+@rule("macd", lambda src, fast, slow: [("ema", src, fast), ("ema", src, slow)])
+def _macd(ema_fast, ema_slow, src, fast, slow):
+    return ema_fast - ema_slow
+
+
+@rule("sub", lambda a, b: [a, b])
+def _sub(a, b, *_):
+    return a - b
+
+
+@rule("bollinger_upper", lambda src, window, k: [("sma", src, window), ("rolling_std", src, window)])
+def _bollinger_upper(sma, std, src, window, k):
+    return sma + std * k
+
+
+@rule("bollinger_lower", lambda src, window, k: [("sma", src, window), ("rolling_std", src, window)])
+def _bollinger_lower(sma, std, src, window, k):
+    return sma - std * k
+
+
+@rule("rsi", lambda src, window: [src], lookback=lambda src, window: window)
+def _rsi(x, src, window):
+    return kernels.rsi(x, window)
+
+
+def dependencies(key):
+    """Các nút mà nút key phụ thuộc trực tiếp (cột đầu vào như "Close" không có)."""
+    if isinstance(key, str):
+        return []
+    deps, _ = _RULES[key[0]]
+    return deps(*key[1:])
+
+
+def lookback(key):
+    """Số phiên trước một mốc cần có để giá trị của nút key tại mốc đó đúng như khi tính trên
+    toàn bộ lịch sử (với EMA: gần đúng, xem EMA_WARMUP)."""
+    if isinstance(key, str):
+        return lookback(COLUMNS[key]) if key in COLUMNS else 0
+    own = _LOOKBACK.get(key[0], lambda *params: 0)(*key[1:])
+    return own + max((lookback(dep) for dep in dependencies(key)), default=0)
+
+
+def warmup_bars(names=DEFAULT_COLUMNS):
+    """Số phiên khởi động (warm-up) cần đọc thêm trước cửa sổ hiển thị để tính các cột names."""
+    return max((lookback(name) for name in names), default=0)
+
+
+def dataset_version(columns):
+    """Mã phiên bản của bộ dữ liệu, tính từ nội dung các mảng đầu vào."""
+    h = hashlib.blake2b(digest_size=8)
+    for name in sorted(columns):
+        h.update(name.encode())
+        h.update(np.ascontiguousarray(columns[name]).tobytes())
+    return h.hexdigest()
+
+
+class IndicatorEngine:
+    """Tính các nút chỉ số theo đồ thị phụ thuộc, mỗi nút chỉ tính một lần."""
+
+    def __init__(self, ohlcv, version=None):
+        self.index = getattr(ohlcv, "index", None)
+        self.columns = {
+            name: np.asarray(ohlcv[name], dtype=np.float64)
+            for name in OHLCV if name in ohlcv
+        }
+        self.version = version if version is not None else dataset_version(self.columns)
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.columns[CLOSE])
+
+    def function(self, kind):
+        """Hàm tính của loại nút kind (lớp con có thể thay, vd. bản 2 chiều của panel)."""
+        return _RULES[kind][1]
+
+    def get(self, key):
+        if isinstance(key, str) and key in COLUMNS:
+            key = COLUMNS[key]
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        if isinstance(key, str):
+            value = self.columns[key]
+        else:
+            func = self.function(key[0])
+            inputs = [self.get(dep) for dep in dependencies(key)]
+            with stage("indicator:" + key[0]):
+                value = func(*inputs, *key[1:])
+        self._cache[key] = value
+        return value
+
+    def series(self, name):
+        return pd.Series(self.get(name), index=self.index, name=name)
+
+    def frame(self, names=DEFAULT_COLUMNS):
+        return pd.DataFrame({name: self.get(name) for name in names}, index=self.index)
+
+
+# Mỗi phiên bản dữ liệu dùng chung một engine (giữ vài phiên bản gần nhất)
+_ENGINES = OrderedDict()
+_MAX_ENGINES = 4
+
+
+def get_engine(ohlcv, version=None):
+    engine = IndicatorEngine(ohlcv, version)
+    cached = _ENGINES.get(engine.version)
+    if cached is not None:
+        _ENGINES.move_to_end(engine.version)
+        return cached
+    _ENGINES[engine.version] = engine
+    while len(_ENGINES) > _MAX_ENGINES:
+        _ENGINES.popitem(last=False)
+    return engine
+
+
+def add_indicators(df, names=DEFAULT_COLUMNS, cache=True):
+    """Trả về bản sao của df có thêm các cột chỉ số (SMA20, RSI, MACD, ...).
+
+    Các cột của df được dùng chung (bản sao nông), không nhân đôi bộ nhớ. cache=False dùng
+    engine riêng không lưu vào _ENGINES: các kết quả trung gian (tổng trượt, EMA12/EMA26
+    khi không nằm trong names, ...) được giải phóng ngay khi hàm trả về.
+    """
+    engine = get_engine(df) if cache else IndicatorEngine(df)
+    out = df.copy(deep=False)
+    for name in names:
+        out[name] = engine.get(name)
+    return out
@@ -0,0 +1,301 @@
+"""Đo thời gian và bộ nhớ của các đoạn xử lý chính, xuất theo định dạng text của Prometheus.
+
+stage(name) (context manager hoặc decorator) ghi thời gian của một đoạn vào histogram
+nvda_stage_seconds{stage=...} và mức RSS cao nhất của tiến trình (high-water mark) khi đoạn
+đó kết thúc. Với NVDA_TRACEMALLOC=1, mỗi đoạn còn ghi đỉnh bộ nhớ Python cấp phát thêm
+trong lúc chạy (tracemalloc; chậm hơn nhiều, chỉ bật khi cần tìm đoạn tốn bộ nhớ). Thời
+gian của đoạn lồng nhau là tổng gồm cả đoạn con (vd. figures:fig_RSI gồm data:df_analysis
+nếu dữ liệu chưa được dựng).
+
+observe_request() ghi độ trễ và kích thước response của từng callback Dash. render()
+trả toàn bộ số liệu dạng text cho endpoint /metrics. Số liệu là của từng tiến trình (mỗi
+worker gunicorn có bộ đếm riêng, Prometheus gộp theo nhãn instance).
+
+SamplingProfiler lấy mẫu stack của mọi thread theo chu kỳ (sys._current_frames), gộp
+thành dạng "collapsed stacks" (mỗi dòng: frame;frame;... số mẫu) để vẽ flame graph.
+
+NVDA_METRICS=0 tắt toàn bộ việc đo (stage() không làm gì).
+
+    with stage("csv_parse"):
+        df = pd.read_csv(path)
+
+    @stage("figures:fig_RSI")
+    def build_fig_RSI(): ...
+"""
+import collections
+import functools
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows không có module resource
+    resource = None
+
+ENABLED = os.environ.get("NVDA_METRICS", "1").lower() not in ("0", "false", "no")
+TRACEMALLOC = ENABLED and os.environ.get("NVDA_TRACEMALLOC", "0").lower() in ("1", "true", "yes")
+
+# Ngưỡng của histogram thời gian (giây) và kích thước (byte)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = tuple(256 * 4 ** k for k in range(10))  # 256 B .. 64 MB
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Một họ số liệu có nhãn; mỗi bộ giá trị nhãn là một chuỗi số liệu riêng."""
+
+    kind = "untyped"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            samples = list(self._samples())
+        lines += [f"{name}{labels} {_number(value)}" for name, labels, value in samples]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield self.name, _labels(self.labels, labels), value
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, *labels, value):
+        with self._lock:
+            self._values[labels] = value
+
+    def set_max(self, *labels, value):
+        with self._lock:
+            self._values[labels] = max(self._values.get(labels, value), value)
+
+    def _samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield self.name, _labels(self.labels, labels), value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, *labels, value):
+        with self._lock:
+            counts, total = self._values.get(labels, (None, 0.0))
+            if counts is None:
+                counts = [0] * len(self.buckets)
+            # số đếm riêng từng bin; render() cộng dồn thành dạng "le" của Prometheus
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[labels] = (counts, total + value)
+
+    def _samples(self):
+        for labels, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f"{self.name}_bucket", _labels(self.labels, labels, [("le", _number(bound))]), cumulative
+            yield f"{self.name}_sum", _labels(self.labels, labels), total
+            yield f"{self.name}_count", _labels(self.labels, labels), cumulative
+
+
+STAGE_SECONDS = Histogram("nvda_stage_seconds", "Thời gian của từng đoạn xử lý (giây).", ["stage"])
+STAGE_PEAK_RSS = Gauge("nvda_stage_peak_rss_bytes",
+                       "RSS cao nhất của tiến trình tính đến lúc đoạn xử lý kết thúc.", ["stage"])
+STAGE_TRACED_PEAK = Gauge("nvda_stage_traced_peak_bytes",
+                          "Đỉnh bộ nhớ Python cấp phát thêm trong đoạn xử lý (NVDA_TRACEMALLOC=1).", ["stage"])
+STAGE_ERRORS = Counter("nvda_stage_errors_total", "Số lần đoạn xử lý kết thúc bằng exception.", ["stage"])
+CALLBACK_SECONDS = Histogram("nvda_callback_seconds", "Độ trễ của từng callback Dash (giây).", ["callback"])
+CALLBACK_BYTES = Histogram("nvda_callback_response_bytes", "Kích thước response của từng callback Dash.",
+                           ["callback"], buckets=SIZE_BUCKETS)
+HTTP_SECONDS = Histogram("nvda_http_request_seconds", "Độ trễ của các request khác (giây).", ["route", "status"])
+HTTP_BYTES = Histogram("nvda_http_response_bytes", "Kích thước response của các request khác.",
+                       ["route"], buckets=SIZE_BUCKETS)
+PROCESS_RSS = Gauge("nvda_process_resident_bytes", "RSS hiện tại của tiến trình.")
+PROCESS_PEAK_RSS = Gauge("nvda_process_peak_resident_bytes", "RSS cao nhất của tiến trình từ khi chạy.")
+DATASET_BYTES = Gauge("nvda_dataset_bytes", "Số byte của từng bộ dữ liệu giữ trong tiến trình.", ["dataset"])
+
+METRICS = [STAGE_SECONDS, STAGE_PEAK_RSS, STAGE_TRACED_PEAK, STAGE_ERRORS, CALLBACK_SECONDS,
+           CALLBACK_BYTES, HTTP_SECONDS, HTTP_BYTES, PROCESS_RSS, PROCESS_PEAK_RSS, DATASET_BYTES]
+
+
+def peak_rss():
+    """RSS cao nhất của tiến trình (byte), 0 nếu hệ điều hành không hỗ trợ."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux trả KB, macOS trả byte
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+# Ngăn xếp các đoạn đang chạy của từng thread (để tính đỉnh tracemalloc của đoạn lồng nhau)
+_local = threading.local()
+
+
+class stage:
+    """Đo một đoạn xử lý; dùng được như context manager hoặc decorator."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(self.name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        if not ENABLED:
+            return self
+        if TRACEMALLOC:
+            stack = _local.__dict__.setdefault("stack", [])
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            stack.append([current, 0])
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not ENABLED:
+            return False
+        elapsed = time.perf_counter() - self._start
+        STAGE_SECONDS.observe(self.name, value=elapsed)
+        STAGE_PEAK_RSS.set_max(self.name, value=peak_rss())
+        if exc_type is not None:
+            STAGE_ERRORS.inc(self.name)
+        if TRACEMALLOC:
+            stack = _local.stack
+            start, child_peak = stack.pop()
+            peak = max(child_peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            STAGE_TRACED_PEAK.set_max(self.name, value=max(0, peak - start))
+        return False
+
+
+def observe_request(callback, seconds, size):
+    """Ghi một lần gọi callback Dash (callback: id.thuộc_tính của output)."""
+    if ENABLED:
+        CALLBACK_SECONDS.observe(callback, value=seconds)
+        CALLBACK_BYTES.observe(callback, value=size)
+
+
+def observe_http(route, status, seconds, size):
+    if ENABLED:
+        HTTP_SECONDS.observe(route, status, value=seconds)
+        HTTP_BYTES.observe(route, value=size)
+
+
+def render():
+    """Mọi số liệu dạng text của Prometheus (text/plain; version=0.0.4)."""
+    PROCESS_RSS.set(value=current_rss())
+    PROCESS_PEAK_RSS.set(value=peak_rss())
+    return "\n".join(metric.render() for metric in METRICS) + "\n"
+
+
+if TRACEMALLOC:
+    tracemalloc.start()
+
+
+class SamplingProfiler:
+    """Lấy mẫu stack của mọi thread mỗi interval giây trong một thread nền."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+        self.samples.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="nvda-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self):
+        """Dạng "collapsed stacks" (flamegraph.pl, speedscope): stack số_mẫu, nhiều nhất trước."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def profile(self, seconds):
+        """Lấy mẫu trong seconds giây rồi trả kết quả dạng collapsed stacks."""
+        self.start()
+        time.sleep(seconds)
+        return self.stop().collapsed()
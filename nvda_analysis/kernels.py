@@ -0,0 +1,341 @@
+"""Các kernel NumPy O(n) cho chỉ số trượt (rolling mean/std, RSI).
+
+Tổng trượt được cập nhật bằng hiệu S_i = S_{i-1} + (x_i - x_{i-w}) và tính cho cả mảng
+bằng np.cumsum. Để phương sai ổn định về số học:
+  - dữ liệu được trừ đi một giá trị tham chiếu K (giá tại điểm neo) trước khi bình phương;
+  - cứ mỗi anchor_every(window) điểm, tổng được tính lại chính xác bằng math.fsum trên cửa sổ
+    (điểm neo), nên sai số không tích luỹ theo độ dài chuỗi.
+
+Mọi phép tính đều là phép toán từng phần tử hoặc cộng dồn tuần tự, nên bộ tính tăng dần
+(nvda_analysis.streaming) có thể lặp lại đúng từng bit cùng kết quả.
+
+Các hàm nhận tham số out=... để ghi vào bộ đệm float64 cấp phát sẵn.
+"""
+import math
+
+import numpy as np
+
+# Khoảng cách tối thiểu giữa hai điểm neo (tính lại tổng chính xác), xem anchor_every()
+ANCHOR_EVERY = 1024
+# Số điểm neo xử lý trong một khối, giới hạn bộ nhớ tạm ~ BLOCK_ROWS * ANCHOR_EVERY phần tử
+# (ít điểm neo hơn mỗi khối khi anchor_every() lớn hơn ANCHOR_EVERY)
+BLOCK_ROWS = 256
+
+
+def anchor_every(window):
+    """Khoảng cách giữa hai điểm neo: ANCHOR_EVERY, hoặc 8 * window với cửa sổ dài (mỗi điểm
+    neo tốn một math.fsum trên cả cửa sổ; như vậy tổng chi phí đó luôn ≤ n/8 phần tử)."""
+    return max(ANCHOR_EVERY, 8 * window)
+
+
+def _buffer(out, n):
+    if out is None:
+        return np.empty(n, dtype=np.float64)
+    if out.shape != (n,) or out.dtype != np.float64:
+        raise ValueError(f"out phải là mảng float64 có {n} phần tử")
+    return out
+
+
+def anchor_sums(window_values, ref, squares=True):
+    """Tổng (và tổng bình phương) chính xác của cửa sổ đã trừ giá trị tham chiếu."""
+    y = window_values - ref
+    s1 = math.fsum(y)
+    s2 = math.fsum(y * y) if squares else 0.0
+    return s1, s2
+
+
+def anchor_ref(value):
+    return value if math.isfinite(value) else 0.0
+
+
+def _rolling_sums(x, window, squares, emit):
+    """Tính tổng trượt (đã trừ K) cho mọi cửa sổ đầy đủ, theo từng khối điểm neo.
+
+    Mỗi hàng của khối bắt đầu tại một điểm neo; emit(start, stop, K, S1, S2) nhận các
+    mảng 2 chiều (hàng = điểm neo) và phần tử đầu tiên của hàng là vị trí neo.
+    """
+    n = len(x)
+    first = window - 1
+    if n <= first:
+        return
+    every = anchor_every(window)
+    rows = -(-(n - first) // every)
+    block_rows = max(1, BLOCK_ROWS * ANCHOR_EVERY // every)
+    cap = min(rows, block_rows) * every
+    cur_buf = np.empty(cap, dtype=np.float64)
+    prev_buf = np.empty(cap, dtype=np.float64)
+    s1_buf = np.empty(cap, dtype=np.float64)
+    s2_buf = np.empty(cap, dtype=np.float64) if squares else None
+
+    for r0 in range(0, rows, block_rows):
+        nrows = min(rows, r0 + block_rows) - r0
+        size = nrows * every
+        start = first + r0 * every
+        stop = min(n, start + size)
+        length = stop - start
+
+        cur = cur_buf[:size]
+        prev = prev_buf[:size]
+        cur[:length] = x[start:stop]
+        # x_{i-w}; ở vị trí neo đầu tiên (i = w-1) giá trị này không được dùng
+        lo = start - window
+        if lo < 0:
+            prev[0] = 0.0
+            prev[1:length] = x[:length - 1]
+        else:
+            prev[:length] = x[lo:lo + length]
+        cur[length:] = 0.0
+        prev[length:] = 0.0
+        cur = cur.reshape(nrows, every)
+        prev = prev.reshape(nrows, every)
+
+        anchors = start + np.arange(nrows) * every
+        ref = np.array([anchor_ref(x[a]) for a in anchors])
+        cur -= ref[:, None]
+        prev -= ref[:, None]
+
+        s1 = np.subtract(cur, prev, out=s1_buf[:size].reshape(nrows, every))
+        s2 = None
+        if squares:
+            cur *= cur
+            prev *= prev
+            s2 = np.subtract(cur, prev, out=s2_buf[:size].reshape(nrows, every))
+        for k, a in enumerate(anchors):
+            s1[k, 0], sq = anchor_sums(x[a - first:a + 1], ref[k], squares)
+            if squares:
+                s2[k, 0] = sq
+        np.cumsum(s1, axis=1, out=s1)
+        if squares:
+            np.cumsum(s2, axis=1, out=s2)
+        emit(start, stop, ref[:, None], s1, s2)
+
+
+def _nan_windows(isnan, window):
+    """Mặt nạ các vị trí có cửa sổ chứa NaN."""
+    c = np.concatenate(([0], np.cumsum(isnan)))
+    invalid = np.zeros(len(isnan), dtype=bool)
+    invalid[window - 1:] = (c[window:] - c[:-window]) > 0
+    return invalid
+
+
+def rolling_mean_std(x, window, out_mean=None, out_std=None, ddof=1, with_std=True):
+    """Trung bình và độ lệch chuẩn trượt trong một lượt, giống Series.rolling(window).mean()/.std().
+
+    Các NaN ở đầu chuỗi (vd. Return ở dòng đầu) được bỏ qua: chuỗi coi như bắt đầu từ giá
+    trị hữu hạn đầu tiên. NaN ở giữa chuỗi làm mọi cửa sổ chứa nó thành NaN.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    mean = _buffer(out_mean, n)
+    std = _buffer(out_std, n) if with_std else None
+    invalid = None
+    isnan = np.isnan(x)
+    if isnan.any():
+        lead = int(np.argmin(isnan)) if not isnan.all() else n
+        if lead:
+            mean[:lead] = np.nan
+            if std is not None:
+                std[:lead] = np.nan
+            if lead < n:
+                rolling_mean_std(x[lead:], window, mean[lead:], None if std is None else std[lead:],
+                                 ddof, with_std)
+            return mean, std
+        invalid = _nan_windows(isnan, window)
+        x = np.where(isnan, 0.0, x)
+    elif np.shares_memory(x, mean) or (std is not None and np.shares_memory(x, std)):
+        x = x.copy()
+
+    def emit(start, stop, ref, s1, s2):
+        length = stop - start
+        if std is not None:
+            # var = (S2 - S1 * S1 / w) / (w - ddof)
+            var = s1 * s1
+            var /= window
+            np.subtract(s2, var, out=var)
+            var /= window - ddof
+            np.maximum(var, 0.0, out=var)
+            np.sqrt(var, out=var)
+            std[start:stop] = var.reshape(-1)[:length]
+        # mean = S1 / w + K
+        s1 /= window
+        s1 += ref
+        mean[start:stop] = s1.reshape(-1)[:length]
+
+    _rolling_sums(x, window, std is not None, emit)
+    head = min(n, window - 1)
+    mean[:head] = np.nan
+    if std is not None:
+        std[:head] = np.nan
+    if invalid is not None:
+        mean[invalid] = np.nan
+        if std is not None:
+            std[invalid] = np.nan
+    return mean, std
+
+
+def rolling_mean(x, window, out=None):
+    mean, _ = rolling_mean_std(x, window, out_mean=out, with_std=False)
+    return mean
+
+
+def rolling_std(x, window, out=None, ddof=1):
+    _, std = rolling_mean_std(x, window, out_std=out, ddof=ddof)
+    return std
+
+
+def rolling_max(x, window, out=None):
+    """Giá trị lớn nhất trượt, giống Series.rolling(window).max(), O(n) với mọi window.
+
+    Thuật toán van Herk/Gil-Werman: chia mảng thành các khối dài window, tính max cộng dồn
+    xuôi (prefix) và ngược (suffix) trong từng khối; cửa sổ [i-w+1, i] phủ đúng hai khối
+    nên max = max(suffix[i-w+1], prefix[i]). NaN làm mọi cửa sổ chứa nó thành NaN.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    out = _buffer(out, n)
+    if n < window:
+        out[:] = np.nan
+        return out
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, -np.inf)
+    padded[:n] = x
+    padded = padded.reshape(blocks, window)
+    prefix = np.maximum.accumulate(padded, axis=1).reshape(-1)
+    suffix = np.maximum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].reshape(-1)
+    out[:window - 1] = np.nan
+    np.maximum(suffix[:n - window + 1], prefix[window - 1:n], out=out[window - 1:])
+    isnan = np.isnan(x)
+    if isnan.any():
+        out[_nan_windows(isnan, window)] = np.nan
+    return out
+
+
+def diff(x, out=None):
+    x = np.asarray(x, dtype=np.float64)
+    out = _buffer(out, len(x))
+    if len(x):
+        out[0] = np.nan
+        np.subtract(x[1:], x[:-1], out=out[1:])
+    return out
+
+
+def pct_change(x, out=None):
+    x = np.asarray(x, dtype=np.float64)
+    out = _buffer(out, len(x))
+    if len(x):
+        out[0] = np.nan
+        np.divide(x[1:], x[:-1], out=out[1:])
+        out[1:] -= 1
+    return out
+
+
+def rsi(close, window=14, out=None):
+    """RSI dùng trung bình trượt đơn giản của gain/loss (như app.py):
+
+        gain = delta.where(delta > 0, 0).rolling(window).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window).mean()
+        RSI = 100 - 100 / (1 + gain / loss)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    out = _buffer(out, n)
+    delta = diff(close)
+    # delta NaN (dòng đầu) -> gain = loss = 0, giống delta.where(...)
+    delta[np.isnan(delta)] = 0.0
+    loss = np.minimum(delta, 0.0)
+    np.negative(loss, out=loss)
+    np.maximum(delta, 0.0, out=delta)
+    rolling_mean(delta, window, out=out)
+    # delta không còn dùng nữa -> dùng lại làm bộ đệm cho trung bình loss
+    avg_loss = rolling_mean(loss, window, out=delta)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 100 - 100 / (1 + gain / loss)
+        out /= avg_loss
+        out += 1
+        np.divide(100.0, out, out=out)
+        np.subtract(100.0, out, out=out)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Bản 2 chiều (thời gian x mã) cho panel nhiều mã: mỗi phép tính chạy trên cả ma trận
+# theo trục 0, không lặp Python theo từng mã.
+
+def rolling_mean_std_2d(x, window, ddof=1, with_std=True):
+    """Trung bình/độ lệch chuẩn trượt theo cột của ma trận (T, S).
+
+    Tổng trượt lấy từ np.cumsum theo từng khối ANCHOR_EVERY dòng: mỗi khối cộng dồn lại từ
+    đầu cửa sổ, trên dữ liệu đã trừ giá trị tham chiếu của khối (giá đầu khối của từng mã),
+    nên sai số không tích luỹ theo độ dài chuỗi. Cửa sổ có NaN cho kết quả NaN (kể cả các
+    dòng trước khi mã bắt đầu có dữ liệu).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n, m = x.shape
+    mean = np.full((n, m), np.nan)
+    std = np.full((n, m), np.nan) if with_std else None
+    if n < window:
+        return mean, std
+    isnan = np.isnan(x)
+    counts = np.zeros((n + 1, m), dtype=np.int64)
+    np.cumsum(isnan, axis=0, out=counts[1:])
+    invalid = (counts[window:] - counts[:-window]) > 0
+    fallback = np.zeros(m)
+    for start in range(window - 1, n, ANCHOR_EVERY):
+        stop = min(start + ANCHOR_EVERY, n)
+        seg = x[start - window + 1:stop]
+        ref = seg[0]
+        ref = np.where(np.isnan(ref), fallback, ref)
+        fallback = ref
+        y = np.where(np.isnan(seg), 0.0, seg - ref)
+        c1 = np.zeros((len(y) + 1, m))
+        np.cumsum(y, axis=0, out=c1[1:])
+        s1 = c1[window:] - c1[:-window]
+        if with_std:
+            np.multiply(y, y, out=y)
+            np.cumsum(y, axis=0, out=c1[1:])
+            s2 = c1[window:] - c1[:-window]
+            var = (s2 - s1 * s1 / window) / (window - ddof)
+            std[start:stop] = np.sqrt(np.maximum(var, 0.0))
+        mean[start:stop] = s1 / window + ref
+    mean[window - 1:][invalid] = np.nan
+    if with_std:
+        std[window - 1:][invalid] = np.nan
+    return mean, std
+
+
+def diff_2d(x):
+    x = np.asarray(x, dtype=np.float64)
+    out = np.empty_like(x)
+    out[:1] = np.nan
+    np.subtract(x[1:], x[:-1], out=out[1:])
+    return out
+
+
+def pct_change_2d(x):
+    x = np.asarray(x, dtype=np.float64)
+    out = np.empty_like(x)
+    out[:1] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(x[1:], x[:-1], out=out[1:])
+    out[1:] -= 1
+    return out
+
+
+def rsi_2d(close, window=14):
+    """RSI (trung bình trượt đơn giản, như rsi()) cho từng cột.
+
+    Mỗi mã được tính như thể chuỗi của nó bắt đầu từ giá hữu hạn đầu tiên, giống rsi()
+    trên DataFrame riêng của mã đó.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    delta = diff_2d(close)
+    delta[np.isnan(delta)] = 0.0
+    gain, _ = rolling_mean_std_2d(np.maximum(delta, 0.0), window, with_std=False)
+    loss, _ = rolling_mean_std_2d(-np.minimum(delta, 0.0), window, with_std=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100 - 100 / (1 + gain / loss)
+    # các dòng trước khi mã có đủ window giá (tính từ giá hữu hạn đầu tiên)
+    first = np.argmax(~np.isnan(close), axis=0)
+    rows = np.arange(len(close))[:, None]
+    out[rows < first + window - 1] = np.nan
+    return out
@@ -0,0 +1,119 @@
+"""Đọc dữ liệu OHLCV từ CSV, kèm bộ đệm dạng cột (Arrow/Feather) trên đĩa.
+
+Lần đọc đầu tiên vẫn parse CSV và chuyển cột Date (chuỗi có múi giờ như -04:00) sang
+datetime64[ns, UTC], sau đó ghi một file .arrow cạnh file CSV (thư mục .cache/). Các
+lần sau đọc thẳng file .arrow bằng memory-map, bỏ qua bước parse ngày tháng.
+
+File .arrow lưu mtime, kích thước và mã băm của CSV nguồn. Nếu CSV thay đổi (mtime,
+kích thước hoặc nội dung khác), bộ đệm bị bỏ và được tạo lại. Nếu chỉ mtime đổi (touch,
+git checkout) mà nội dung vẫn như cũ, mtime mới được ghi vào bộ đệm để các lần sau không
+phải băm lại cả file CSV.
+
+pyarrow là tuỳ chọn: nếu chưa cài, load_ohlcv() đọc CSV như cũ.
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from nvda_analysis.instrument import stage
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:  # pragma: no cover - pyarrow là phụ thuộc tuỳ chọn
+    pa = None
+
+CACHE_DIR = ".cache"
+_META_KEY = b"nvda_analysis.source"
+
+
+def read_csv(path):
+    """Cách đọc gốc của app.py: parse CSV, Date -> UTC, đặt Date làm index."""
+    with stage("csv_parse"):
+        df = pd.read_csv(path)
+    with stage("to_datetime"):
+        df["Date"] = pd.to_datetime(df["Date"], utc=True)
+    df.set_index("Date", inplace=True)
+    return df
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def sidecar_path(path):
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, CACHE_DIR, name + ".arrow")
+
+
+def _source_info(path, with_hash=True):
+    st = os.stat(path)
+    info = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+    if with_hash:
+        info["hash"] = file_hash(path)
+    return info
+
+
+def _read_sidecar(cache):
+    source = pa.memory_map(cache, "r")
+    table = ipc.open_file(source).read_all()
+    meta = json.loads(table.schema.metadata[_META_KEY])
+    return table, meta
+
+
+def _write_sidecar(table, cache, info):
+    metadata = dict(table.schema.metadata or {})
+    metadata[_META_KEY] = json.dumps(info).encode()
+    table = table.replace_schema_metadata(metadata)
+    os.makedirs(os.path.dirname(cache), exist_ok=True)
+    tmp = f"{cache}.{os.getpid()}.tmp"
+    # Không nén để có thể memory-map khi đọc; ghi ra file tạm rồi đổi tên (nguyên tử)
+    with ipc.new_file(tmp, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, cache)
+
+
+def _is_fresh(path, meta, verify_hash):
+    info = _source_info(path, with_hash=False)
+    if info["size"] != meta.get("size"):
+        return False
+    if info["mtime_ns"] == meta.get("mtime_ns") and not verify_hash:
+        return True
+    # mtime đổi (hoặc được yêu cầu kiểm tra): so nội dung
+    return file_hash(path) == meta.get("hash")
+
+
+def load_ohlcv(path, use_cache=True, verify_hash=False):
+    """Đọc CSV OHLCV thành DataFrame có index Date (UTC), dùng bộ đệm .arrow nếu còn hợp lệ."""
+    if pa is None or not use_cache:
+        return read_csv(path)
+    cache = sidecar_path(path)
+    if os.path.exists(cache):
+        try:
+            with stage("arrow_read"):
+                table, meta = _read_sidecar(cache)
+        except (OSError, KeyError, ValueError, pa.ArrowException):
+            table = None
+        if table is not None and _is_fresh(path, meta, verify_hash):
+            info = dict(meta, **_source_info(path, with_hash=False))
+            if info != meta:
+                # nội dung không đổi, chỉ mtime: ghi lại mtime (không parse lại CSV)
+                try:
+                    _write_sidecar(table, cache, info)
+                except OSError:
+                    pass
+            return table.to_pandas(split_blocks=True)
+    info = _source_info(path)
+    df = read_csv(path)
+    try:
+        _write_sidecar(pa.Table.from_pandas(df, preserve_index=True), cache, info)
+    except OSError:
+        # thư mục chỉ đọc: vẫn trả về dữ liệu, chỉ không có bộ đệm
+        pass
+    return df
@@ -0,0 +1,188 @@
+"""Chỉ số hiệu quả đầu tư: drawdown, thời gian drawdown, lợi nhuận/biến động năm hoá,
+Sharpe, Sortino, Calmar, cùng các bản trượt (rolling).
+
+Mỗi chỉ số là một lượt vectơ hoá O(n) trên lợi nhuận từng phiên (NaN được coi là 0 khi
+cộng dồn vốn và bị bỏ qua khi tính trung bình/độ lệch chuẩn). Các hàm nhận mảng (T, ...)
+tính theo trục 0, nên dùng được cho cả một chuỗi lẫn cả lưới chiến lược của
+nvda_analysis.backtest. Bản trượt dùng các kernel O(n) của nvda_analysis.kernels (tổng
+trượt cập nhật dần, max trượt van Herk/Gil-Werman), chi phí không phụ thuộc độ dài cửa sổ.
+
+    stats = summary(df["Return"], periods_per_year(df.index))
+    dd = drawdown(df["Return"])
+"""
+import numpy as np
+import pandas as pd
+
+from nvda_analysis import kernels
+
+TRADING_DAYS = 252
+# Số giờ giao dịch mỗi phiên (NYSE/NASDAQ), dùng để năm hoá dữ liệu trong ngày
+TRADING_HOURS = 6.5
+
+
+def periods_per_year(index):
+    """Số phiên mỗi năm suy ra từ khoảng cách trung vị giữa các mốc thời gian của index."""
+    if len(index) < 2:
+        return TRADING_DAYS
+    days = pd.Series(index).diff().median() / pd.Timedelta(days=1)
+    if days < 1:
+        return TRADING_DAYS * TRADING_HOURS / (days * 24)
+    if days < 5:
+        return TRADING_DAYS / days
+    return 365.25 / days
+
+
+def _returns(returns):
+    return np.asarray(returns, dtype=np.float64)
+
+
+def _filled(r):
+    # NaN -> 0 (không sao chép khi không có NaN)
+    return np.nan_to_num(r, nan=0.0) if np.isnan(r).any() else r
+
+
+def _wrap(values, like, name):
+    # Giữ index khi đầu vào là Series
+    if isinstance(like, pd.Series):
+        return pd.Series(values, index=like.index, name=name)
+    return values
+
+
+def equity(returns):
+    """Đường vốn bắt đầu từ 1: tích luỹ (1 + r)."""
+    r = _returns(returns)
+    return _wrap(np.cumprod(1 + _filled(r), axis=0), returns, "Equity")
+
+
+def drawdown(returns):
+    """Mức sụt giảm so với đỉnh trước đó (0 tại đỉnh, âm khi dưới đỉnh)."""
+    value = np.asarray(equity(returns))
+    return _wrap(value / np.maximum.accumulate(value, axis=0) - 1, returns, "Drawdown")
+
+
+def drawdown_duration(returns):
+    """Số phiên kể từ đỉnh gần nhất (0 tại đỉnh)."""
+    value = np.asarray(equity(returns))
+    rows = np.arange(len(value)).reshape((-1,) + (1,) * (value.ndim - 1))
+    at_peak = value >= np.maximum.accumulate(value, axis=0)
+    last_peak = np.maximum.accumulate(np.where(at_peak, rows, 0), axis=0)
+    return _wrap(rows - last_peak, returns, "Drawdown Duration")
+
+
+def max_drawdown(returns):
+    return np.min(np.asarray(drawdown(returns)), axis=0)
+
+
+def max_drawdown_duration(returns):
+    return np.max(np.asarray(drawdown_duration(returns)), axis=0)
+
+
+def annualized_return(returns, periods=TRADING_DAYS):
+    """Lợi nhuận kép năm hoá: (vốn cuối)^(periods / số phiên) - 1."""
+    r = _returns(returns)
+    n = np.sum(~np.isnan(r), axis=0)
+    growth = np.sum(np.log1p(_filled(r)), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.expm1(growth * periods / n)
+
+
+def annualized_volatility(returns, periods=TRADING_DAYS):
+    return np.nanstd(_returns(returns), axis=0, ddof=1) * np.sqrt(periods)
+
+
+def sharpe(returns, periods=TRADING_DAYS, risk_free=0.0):
+    """Sharpe năm hoá; risk_free là lãi suất phi rủi ro mỗi phiên."""
+    r = _returns(returns) - risk_free
+    mean = np.nanmean(r, axis=0)
+    std = np.nanstd(r, axis=0, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, mean / std * np.sqrt(periods), np.nan)
+
+
+def sortino(returns, periods=TRADING_DAYS, target=0.0):
+    """Sortino năm hoá: độ lệch chỉ tính các phiên dưới target (downside deviation)."""
+    r = _returns(returns) - target
+    mean = np.nanmean(r, axis=0)
+    downside = np.sqrt(np.nanmean(np.minimum(r, 0.0) ** 2, axis=0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(downside > 0, mean / downside * np.sqrt(periods), np.nan)
+
+
+def calmar(returns, periods=TRADING_DAYS):
+    """Lợi nhuận năm hoá chia cho độ lớn của max drawdown."""
+    worst = -max_drawdown(returns)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(worst > 0, annualized_return(returns, periods) / worst, np.nan)
+
+
+# Tên chỉ số của evaluate() -> nhãn trong summary()
+LABELS = {
+    "total_return": "Total Return",
+    "annualized_return": "Annualized Return",
+    "annualized_volatility": "Annualized Volatility",
+    "sharpe": "Sharpe Ratio",
+    "sortino": "Sortino Ratio",
+    "calmar": "Calmar Ratio",
+    "max_drawdown": "Max Drawdown",
+    "max_drawdown_duration": "Max Drawdown Duration",
+}
+
+
+def evaluate(returns, periods=TRADING_DAYS, names=tuple(LABELS)):
+    """Nhiều chỉ số cùng lúc: {tên: giá trị theo trục 0}, dùng chung đường vốn và drawdown."""
+    r = _returns(returns)
+    value = np.asarray(equity(r))
+    out = {}
+    if "total_return" in names:
+        out["total_return"] = value[-1] - 1
+    if {"max_drawdown", "calmar"} & set(names):
+        out["max_drawdown"] = np.min(value / np.maximum.accumulate(value, axis=0) - 1, axis=0)
+    if {"annualized_return", "calmar"} & set(names):
+        out["annualized_return"] = annualized_return(r, periods)
+    if "calmar" in names:
+        worst = -out["max_drawdown"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["calmar"] = np.where(worst > 0, out["annualized_return"] / worst, np.nan)
+    if "annualized_volatility" in names:
+        out["annualized_volatility"] = annualized_volatility(r, periods)
+    if "sharpe" in names:
+        out["sharpe"] = sharpe(r, periods)
+    if "sortino" in names:
+        out["sortino"] = sortino(r, periods)
+    if "max_drawdown_duration" in names:
+        out["max_drawdown_duration"] = max_drawdown_duration(r)
+    return {name: out[name] for name in names}
+
+
+def summary(returns, periods=TRADING_DAYS):
+    """Tất cả chỉ số của một chuỗi lợi nhuận, dạng Series (nhãn chỉ số -> giá trị)."""
+    return pd.Series({LABELS[name]: value.item() for name, value in evaluate(returns, periods).items()})
+
+
+def rolling_volatility(returns, window, periods=TRADING_DAYS):
+    """Biến động năm hoá trên cửa sổ trượt."""
+    return _wrap(kernels.rolling_std(_returns(returns), window) * np.sqrt(periods),
+                 returns, "Rolling Volatility")
+
+
+def rolling_sharpe(returns, window, periods=TRADING_DAYS):
+    mean, std = kernels.rolling_mean_std(_returns(returns), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = np.where(std > 0, mean / std * np.sqrt(periods), np.nan)
+    return _wrap(value, returns, "Rolling Sharpe")
+
+
+def rolling_sortino(returns, window, periods=TRADING_DAYS):
+    r = _returns(returns)
+    mean = kernels.rolling_mean(r, window)
+    downside = np.sqrt(kernels.rolling_mean(np.minimum(r, 0.0) ** 2, window))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = np.where(downside > 0, mean / downside * np.sqrt(periods), np.nan)
+    return _wrap(value, returns, "Rolling Sortino")
+
+
+def rolling_drawdown(returns, window):
+    """Mức sụt giảm so với đỉnh cao nhất trong window phiên gần nhất."""
+    value = np.asarray(equity(returns))
+    peak = kernels.rolling_max(value, window)
+    return _wrap(value / peak - 1, returns, "Rolling Drawdown")
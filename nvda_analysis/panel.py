@@ -0,0 +1,156 @@
+"""Dữ liệu nhiều mã (panel): mỗi trường OHLCV là một ma trận (thời gian x mã).
+
+Các mã được căn theo hợp các mốc thời gian; ô không có giao dịch là NaN. PanelEngine
+dùng chung đồ thị phụ thuộc với IndicatorEngine (cùng khoá nút, cùng tên cột như "SMA20",
+"RSI") nhưng mỗi nút là một ma trận, tính cho mọi mã trong một lượt bằng các kernel 2
+chiều của nvda_analysis.kernels.
+
+    panel = load_panel("data/tickers")
+    engine = PanelEngine(panel)
+    engine.frame("AMD")          # OHLCV + SMA20, RSI, MACD, ... của một mã
+
+Với các mã cùng lịch giao dịch, kết quả của một mã trùng (sai số dấu phẩy động) với
+add_indicators() trên DataFrame riêng của mã đó. Nếu một mã thiếu phiên ở giữa trong
+khi các mã khác có, cửa sổ chứa phiên thiếu đó cho kết quả NaN.
+"""
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from nvda_analysis import kernels
+from nvda_analysis.indicators import (
+    CLOSE, COLUMNS, DEFAULT_COLUMNS, OHLCV, IndicatorEngine, dataset_version,
+)
+from nvda_analysis.loader import load_ohlcv
+
+
+class Panel:
+    """index (T mốc thời gian), symbols (S mã), fields: tên trường -> ma trận float64 (T, S)."""
+
+    def __init__(self, index, symbols, fields):
+        self.index = index
+        self.symbols = list(symbols)
+        self.fields = fields
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, symbol):
+        return symbol in self._positions
+
+    def column(self, symbol):
+        return self._positions[symbol]
+
+    def rows(self, symbol):
+        """Các dòng mà mã có dữ liệu (Close hữu hạn)."""
+        return ~np.isnan(self.fields[CLOSE][:, self.column(symbol)])
+
+    def frame(self, symbol):
+        """DataFrame OHLCV của một mã (chỉ các phiên mã đó có giao dịch)."""
+        j = self.column(symbol)
+        rows = self.rows(symbol)
+        return pd.DataFrame({name: values[rows, j] for name, values in self.fields.items()},
+                            index=self.index[rows])
+
+    @classmethod
+    def from_frames(cls, frames):
+        """Panel từ {mã: DataFrame OHLCV có index thời gian}."""
+        symbols = list(frames)
+        indexes = [df.index for df in frames.values()]
+        index = indexes[0].append(indexes[1:]).unique().sort_values()
+        index.name = "Date"
+        fields = {}
+        for name in OHLCV:
+            if any(name in df for df in frames.values()):
+                fields[name] = np.full((len(index), len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            df = frames[symbol]
+            rows = index.get_indexer(df.index)
+            for name, values in fields.items():
+                if name in df:
+                    values[rows, j] = df[name].to_numpy(dtype=np.float64)
+        return cls(index, symbols, fields)
+
+    @classmethod
+    def from_long(cls, df, symbol="Symbol", date="Date"):
+        """Panel từ bảng dạng dài (mỗi dòng một cặp thời gian, mã)."""
+        wide = df.pivot_table(index=date, columns=symbol, values=[c for c in OHLCV if c in df],
+                              aggfunc="last")
+        symbols = list(wide.columns.get_level_values(1).unique())
+        fields = {
+            name: wide[name].reindex(columns=symbols).to_numpy(dtype=np.float64)
+            for name in OHLCV if name in df
+        }
+        return cls(pd.DatetimeIndex(wide.index, name="Date"), symbols, fields)
+
+    def to_long(self):
+        """Bảng dạng dài: Date, Symbol, Open, High, Low, Close, Volume (bỏ các ô trống)."""
+        n, m = self.fields[CLOSE].shape
+        out = pd.DataFrame({
+            "Date": np.repeat(self.index, m),
+            "Symbol": np.tile(np.asarray(self.symbols, dtype=object), n),
+            **{name: values.reshape(-1) for name, values in self.fields.items()},
+        })
+        return out[out[CLOSE].notna()].reset_index(drop=True)
+
+
+def load_panel(directory, extra=None):
+    """Đọc mọi file <MÃ>.csv trong directory thành Panel; extra: {mã: DataFrame} thêm vào."""
+    frames = dict(extra or {})
+    for path in sorted(glob.glob(os.path.join(directory, "*.csv"))):
+        symbol = os.path.splitext(os.path.basename(path))[0].upper()
+        frames.setdefault(symbol, load_ohlcv(path))
+    return Panel.from_frames(frames)
+
+
+# Hàm tính 2 chiều cho từng loại nút (cùng chữ ký với quy tắc trong indicators.py)
+_PANEL_FUNCTIONS = {
+    "diff": lambda x, src: kernels.diff_2d(x),
+    "pct_change": lambda x, src: kernels.pct_change_2d(x),
+    "rolling_moments": lambda x, src, window: kernels.rolling_mean_std_2d(x, window),
+    "sma": lambda moments, src, window: moments[0],
+    "rolling_std": lambda moments, src, window: moments[1],
+    # ewm của pandas chạy từng cột trong Cython, NaN đầu chuỗi được bỏ qua như bản 1 chiều
+    "ema": lambda x, src, span: pd.DataFrame(x).ewm(span=span, adjust=False).mean().to_numpy(),
+    "macd": lambda fast, slow, src, f, s: fast - slow,
+    "sub": lambda a, b, *_: a - b,
+    "bollinger_upper": lambda sma, std, src, window, k: sma + std * k,
+    "bollinger_lower": lambda sma, std, src, window, k: sma - std * k,
+    "rsi": lambda x, src, window: kernels.rsi_2d(x, window),
+}
+
+
+class PanelEngine(IndicatorEngine):
+    """IndicatorEngine trên Panel: mỗi nút là ma trận (T, S) tính cho mọi mã cùng lúc."""
+
+    def __init__(self, panel, version=None):
+        self.panel = panel
+        self.index = panel.index
+        self.columns = panel.fields
+        self.version = version if version is not None else dataset_version(self.columns)
+        self._cache = {}
+
+    def function(self, kind):
+        return _PANEL_FUNCTIONS[kind]
+
+    def store(self, key, values):
+        """Ghi sẵn giá trị của một nút (vd. kết quả tính ở tiến trình khác)."""
+        self._cache[COLUMNS.get(key, key) if isinstance(key, str) else key] = values
+
+    def compute(self, names=DEFAULT_COLUMNS):
+        """Tính trước các cột names cho toàn bộ panel."""
+        for name in names:
+            self.get(name)
+        return self
+
+    def frame(self, symbol, names=DEFAULT_COLUMNS):
+        """OHLCV và các cột chỉ số của một mã, chỉ các phiên mã đó có giao dịch."""
+        j = self.panel.column(symbol)
+        out = self.panel.frame(symbol)
+        rows = self.panel.rows(symbol)
+        for name in names:
+            out[name] = self.get(COLUMNS[name])[rows, j]
+        return out
@@ -0,0 +1,116 @@
+"""Tính chỉ số cho panel nhiều mã song song trên nhiều tiến trình.
+
+Các mã được chia thành từng nhóm (shard) theo cột của panel. Dữ liệu vào (các ma trận
+OHLCV) và kết quả (một ma trận cho mỗi cột chỉ số) nằm trong multiprocessing.shared_memory:
+tiến trình con chỉ nhận tên vùng nhớ và khoảng cột [j0, j1), tính bằng PanelEngine trên
+nhóm mã đó rồi ghi thẳng vào vùng nhớ kết quả, không pickle DataFrame qua lại.
+
+    engine = compute_parallel(panel, workers=8)
+    engine.frame("AMD")
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from nvda_analysis.indicators import COLUMNS, DEFAULT_COLUMNS
+from nvda_analysis.panel import Panel, PanelEngine
+
+# Số nhóm mã cho mỗi tiến trình (chia nhỏ để cân bằng tải)
+SHARDS_PER_WORKER = 4
+# Ít mã hơn mức này thì tính ngay trong tiến trình hiện tại (chi phí tạo tiến trình và
+# chép dữ liệu vào vùng nhớ dùng chung lớn hơn phần tiết kiệm được)
+MIN_PARALLEL_SYMBOLS = 64
+# Tiến trình con không được fork thẳng từ worker của dashboard: worker có nhiều thread (Flask,
+# watcher nạp lại dữ liệu) và đang giữ khoá của registry data khi dựng panel_engine, fork
+# sẽ chép cả các khoá đang bị giữ đó. forkserver fork từ một tiến trình sạch, một thread
+# (nạp sẵn module này); spawn trên hệ không có forkserver.
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _compute_shard(spec):
+    """Chạy trong tiến trình con: tính mọi cột chỉ số cho các mã [j0, j1)."""
+    in_name, out_name, fields, names, shape, j0, j1 = spec
+    n, m = shape
+    # Tiến trình con chỉ mở vùng nhớ; tiến trình cha tạo và giải phóng (unlink)
+    in_shm = shared_memory.SharedMemory(name=in_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        inputs = np.ndarray((len(fields), n, m), dtype=np.float64, buffer=in_shm.buf)
+        shard = Panel(None, range(j1 - j0), {
+            field: np.ascontiguousarray(inputs[i, :, j0:j1]) for i, field in enumerate(fields)
+        })
+        del inputs
+        engine = PanelEngine(shard, version=f"shard-{j0}")
+        outputs = np.ndarray((len(names), n, m), dtype=np.float64, buffer=out_shm.buf)
+        for i, name in enumerate(names):
+            outputs[i, :, j0:j1] = engine.get(name)
+        del outputs
+    finally:
+        in_shm.close()
+        out_shm.close()
+    return j0, j1
+
+
+def make_executor(workers=None):
+    """ProcessPoolExecutor để dùng lại giữa nhiều lần compute_parallel().
+
+    resource_tracker (theo dõi vùng nhớ dùng chung) được khởi động trước khi tạo tiến trình
+    con, để các tiến trình con dùng chung nó với tiến trình cha thay vì mỗi tiến trình một
+    bộ theo dõi riêng (sẽ báo "leaked shared_memory" khi thoát). Tiến trình con được tạo
+    theo START_METHOD.
+    """
+    resource_tracker.ensure_running()
+    context = multiprocessing.get_context(START_METHOD)
+    if START_METHOD == "forkserver":
+        context.set_forkserver_preload([__name__])
+    return ProcessPoolExecutor(workers or os.cpu_count() or 1, mp_context=context)
+
+
+def _shards(m, count):
+    edges = np.linspace(0, m, min(count, m) + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def compute_parallel(panel, names=DEFAULT_COLUMNS, workers=None, executor=None):
+    """PanelEngine của panel với các cột names đã tính sẵn, chia mã cho nhiều tiến trình.
+
+    workers=None: dùng mọi lõi CPU. workers=1 hoặc panel ít hơn MIN_PARALLEL_SYMBOLS mã
+    (và không có executor): tính ngay trong tiến trình hiện tại. executor: bộ tạo bởi
+    make_executor() để dùng lại giữa các lần gọi.
+    """
+    names = list(names)
+    engine = PanelEngine(panel)
+    workers = workers or os.cpu_count() or 1
+    n, m = panel.fields["Close"].shape
+    if executor is None and (workers == 1 or m < MIN_PARALLEL_SYMBOLS):
+        return engine.compute(names)
+
+    fields = list(panel.fields)
+    in_shm = shared_memory.SharedMemory(create=True, size=max(1, len(fields) * n * m * 8))
+    out_shm = shared_memory.SharedMemory(create=True, size=max(1, len(names) * n * m * 8))
+    try:
+        inputs = np.ndarray((len(fields), n, m), dtype=np.float64, buffer=in_shm.buf)
+        for i, field in enumerate(fields):
+            inputs[i] = panel.fields[field]
+        specs = [(in_shm.name, out_shm.name, fields, names, (n, m), j0, j1)
+                 for j0, j1 in _shards(m, workers * SHARDS_PER_WORKER)]
+        own = executor is None
+        pool = executor if executor is not None else make_executor(workers)
+        try:
+            list(pool.map(_compute_shard, specs))
+        finally:
+            if own:
+                pool.shutdown()
+        outputs = np.ndarray((len(names), n, m), dtype=np.float64, buffer=out_shm.buf)
+        for i, name in enumerate(names):
+            engine.store(COLUMNS[name], outputs[i].copy())
+        del inputs, outputs
+    finally:
+        in_shm.close()
+        in_shm.unlink()
+        out_shm.close()
+        out_shm.unlink()
+    return engine
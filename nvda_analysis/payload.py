@@ -0,0 +1,154 @@
+"""Rút gọn JSON của figure trước khi gửi lên trình duyệt.
+
+optimize(fig) trả về dict {data, layout} mà plotly.js vẽ ra giống hệt, nhưng nhỏ hơn:
+
+  - Số thực được làm tròn còn PRECISION chữ số có nghĩa (NVDA_FIGURE_PRECISION, mặc định
+    6) và gửi dạng mảng kiểu base64 ({"dtype", "bdata"}): float32 khi PRECISION <= 6,
+    float64 khi cần nhiều chữ số hơn. CSV gốc có tới 17 chữ số mà màn hình không cần.
+  - Số nguyên dùng kiểu nhỏ nhất chứa được (u1, i2, u4, ...); số nguyên vượt quá i4/u4
+    được gửi dạng f8, giữ đúng giá trị.
+  - Mốc thời gian thành chuỗi ngắn nhất đủ thông tin ("2024-06-20", "2024-06-20 14:30")
+    thay vì "2024-06-20T04:00:00+00:00"; plotly.js vốn bỏ qua offset múi giờ.
+  - template.data chỉ giữ các loại trace figure dùng (scatter và scattergl đi cùng nhau
+    vì callback zoom có thể đổi giữa hai loại).
+
+report(fig) trả (số byte JSON gốc, số byte sau khi rút gọn) để đo lượng tiết kiệm.
+
+    body = to_json_plotly(optimize(fig))
+    raw, optimized = report(fig)
+"""
+import base64
+import os
+
+import numpy as np
+import pandas as pd
+from plotly.io.json import to_json_plotly
+
+PRECISION = int(os.environ.get("NVDA_FIGURE_PRECISION", 6))
+
+# Số chữ số có nghĩa float32 giữ đúng (24 bit phần định trị)
+FLOAT32_DIGITS = 6
+
+# Kiểu mảng số nguyên của plotly.js, từ nhỏ đến lớn
+_INT_TYPES = ["u1", "i1", "u2", "i2", "u4", "i4"]
+
+# Các thuộc tính là mảng dữ liệu (theo từng điểm) của trace
+_ARRAYS = ("x", "y", "z", "open", "high", "low", "close", "customdata", "text", "width", "base")
+
+# Loại trace dùng chung mục template
+_TEMPLATE_GROUPS = [{"scatter", "scattergl"}]
+
+
+def round_significant(values, digits=PRECISION):
+    """Làm tròn từng phần tử còn digits chữ số có nghĩa (NaN, inf giữ nguyên)."""
+    values = np.asarray(values, dtype=np.float64)
+    magnitude = np.abs(values)
+    ok = np.isfinite(values) & (magnitude > 0)
+    exponent = np.zeros_like(values)
+    exponent[ok] = np.floor(np.log10(magnitude[ok]))
+    scale = 10.0 ** (digits - 1 - exponent)
+    with np.errstate(invalid="ignore"):
+        return np.where(ok, np.round(values * scale) / scale, values)
+
+
+def _typed(values, dtype, shape=None):
+    spec = {"dtype": dtype, "bdata": base64.b64encode(np.ascontiguousarray(values, dtype=dtype)).decode()}
+    if shape is not None:
+        spec["shape"] = shape
+    return spec
+
+
+def _decode(spec):
+    # "u1c" (Uint8ClampedArray) có cùng dạng byte với "u1"
+    return np.frombuffer(base64.b64decode(spec["bdata"]), dtype=spec["dtype"].rstrip("c"))
+
+
+def encode_numbers(values, precision=PRECISION, shape=None):
+    """Mảng kiểu base64 nhỏ nhất giữ được values (số thực: precision chữ số có nghĩa)."""
+    values = np.asarray(values)
+    if values.dtype.kind in "ui" and len(values):
+        lo, hi = values.min(), values.max()
+        for dtype in _INT_TYPES:
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                return _typed(values, dtype, shape)
+        # plotly.js không có mảng int64: gửi f8 (đúng từng số nguyên đến 2**53), không làm tròn
+        # như số thực để hiển thị (vd. Volume gộp theo tuần/tháng ~1e10)
+        return _typed(values, "f8", shape)
+    rounded = round_significant(values, precision)
+    return _typed(rounded, "f4" if precision <= FLOAT32_DIGITS else "f8", shape)
+
+
+def format_dates(values):
+    """Chuỗi thời gian (theo UTC, không offset) ngắn nhất mà không mất thông tin."""
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    ns = index.as_unit("ns").asi8
+    valid = ~index.isna()
+    unit = "us"
+    for candidate, step in (("D", 86_400 * 10 ** 9), ("m", 60 * 10 ** 9), ("s", 10 ** 9)):
+        if not (ns[valid] % step).any():
+            unit = candidate
+            break
+    text = np.datetime_as_string(index.to_numpy(), unit=unit)
+    return np.char.replace(text, "T", " ").astype(object).tolist()
+
+
+def compact_array(values, precision=PRECISION):
+    """Dạng gọn của một mảng dữ liệu: mảng kiểu cho số, chuỗi ngắn cho thời gian.
+
+    Giá trị khác (chuỗi, màu, mảng đã gọn, số lượng điểm nhỏ) được trả lại nguyên vẹn.
+    """
+    if isinstance(values, dict):
+        if "bdata" not in values:
+            return values
+        return encode_numbers(_decode(values), precision, values.get("shape"))
+    dtype = getattr(values, "dtype", None)
+    if isinstance(dtype, pd.DatetimeTZDtype) or isinstance(dtype, np.dtype) and dtype.kind == "M":
+        return format_dates(values)
+    if not isinstance(values, (np.ndarray, pd.Index, pd.Series, list, tuple)) or len(values) < 2:
+        return values
+    array = np.asarray(values)
+    if array.dtype == object:
+        first = next((v for v in array if v is not None), None)
+        if isinstance(first, (pd.Timestamp, np.datetime64)):
+            return format_dates(array)
+        return values
+    if array.dtype.kind in "uif" and array.ndim == 1:
+        return encode_numbers(array, precision)
+    return values
+
+
+def _prune_template(layout, types):
+    template = layout.get("template")
+    if not isinstance(template, dict) or "data" not in template:
+        return
+    keep = set(types)
+    for group in _TEMPLATE_GROUPS:
+        if keep & group:
+            keep |= group
+    layout["template"] = dict(template, data={k: v for k, v in template["data"].items() if k in keep})
+
+
+def optimize(fig, precision=PRECISION):
+    """Dict {data, layout} đã rút gọn của figure (go.Figure hoặc dict)."""
+    figure = fig.to_plotly_json() if hasattr(fig, "to_plotly_json") else fig
+    layout = dict(figure.get("layout", {}))
+    data = []
+    for trace in figure.get("data", []):
+        trace = dict(trace)
+        for key in _ARRAYS:
+            if key in trace:
+                trace[key] = compact_array(trace[key], precision)
+        if isinstance(trace.get("marker"), dict) and "color" in trace["marker"]:
+            trace["marker"] = dict(trace["marker"], color=compact_array(trace["marker"]["color"], precision))
+        data.append(trace)
+    _prune_template(layout, {trace.get("type", "scatter") for trace in data})
+    return {"data": data, "layout": layout}
+
+
+def report(fig, precision=PRECISION, engine="json"):
+    """(số byte JSON gốc, số byte JSON sau optimize) của figure."""
+    raw = len(to_json_plotly(fig, engine=engine).encode())
+    return raw, len(to_json_plotly(optimize(fig, precision), engine=engine).encode())
@@ -0,0 +1,73 @@
+import os
+import threading
+
+from nvda_analysis.instrument import stage
+
+
+def eager_mode():
+    # Đặt NVDA_EAGER=1 để dựng toàn bộ figure/layout ngay khi import (hành vi cũ)
+    return os.environ.get("NVDA_EAGER", "0").lower() in ("1", "true", "yes")
+
+
+class LazyRegistry:
+    """Bảng đăng ký các hàm dựng (dữ liệu, figure, layout của tab).
+
+    Mỗi mục chỉ được dựng ở lần gọi get() đầu tiên, sau đó kết quả được ghi nhớ
+    trong tiến trình (mỗi worker gunicorn có bộ nhớ đệm riêng).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._builders = {}
+        self._cache = {}
+        self._lock = threading.RLock()
+
+    def register(self, key):
+        def decorator(func):
+            if key in self._builders:
+                raise KeyError(f"{self.name}: '{key}' đã được đăng ký")
+            self._builders[key] = func
+            return func
+        return decorator
+
+    def __contains__(self, key):
+        return key in self._builders
+
+    def keys(self):
+        return list(self._builders)
+
+    def is_built(self, key):
+        return key in self._cache
+
+    @property
+    def lock(self):
+        # Giữ khoá này thì không có mục nào đang dựng dở và không mục nào bắt đầu dựng
+        return self._lock
+
+    def set(self, key, value):
+        # Thay kết quả đã ghi nhớ của key (vd. bộ dữ liệu mới dựng ở thread nền)
+        with self._lock:
+            self._cache[key] = value
+
+    def get(self, key):
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._cache:
+                with stage(f"{self.name}:{key}"):
+                    self._cache[key] = self._builders[key]()
+            return self._cache[key]
+
+    def build_all(self):
+        for key in self._builders:
+            self.get(key)
+
+    def invalidate(self, keys=None):
+        with self._lock:
+            if keys is None:
+                self._cache.clear()
+            else:
+                for key in keys:
+                    self._cache.pop(key, None)
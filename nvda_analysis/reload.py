@@ -0,0 +1,94 @@
+"""Phát hiện file dữ liệu thay đổi bằng cách hỏi định kỳ (polling), trong một thread nền.
+
+FileWatcher so (mtime, kích thước) của từng file mỗi interval giây (chỉ một lần os.stat mỗi
+file, không đọc nội dung). File đổi chỉ được báo khi đã đứng yên qua một lần hỏi (cùng
+mtime, kích thước với lần trước): notebook ghi CSV không nguyên tử, báo sớm sẽ đọc phải
+file ghi dở. callback(các file đã đổi) chạy trong thread của watcher; nếu nó ném exception,
+lỗi được giữ ở last_error (và trong nvda_stage_errors_total{stage="reload"}) rồi watcher
+tiếp tục, còn dữ liệu đang dùng giữ nguyên.
+
+File chưa tồn tại cũng được theo dõi: xuất hiện, đổi hay bị xoá đều tính là thay đổi.
+
+Thread thuộc về tiến trình gọi start(): tiến trình con được fork sau đó (vd. worker của
+gunicorn --preload) không có thread này, nên running là False ở đó và start() tạo thread
+mới. Gọi start() nhiều lần (kể cả từ nhiều thread) chỉ tạo một thread mỗi tiến trình.
+
+    watcher = FileWatcher(["nvda_stock_data.csv"], reload_datasets, interval=5).start()
+"""
+import os
+import threading
+
+from nvda_analysis.instrument import stage
+
+
+def file_state(path):
+    """(mtime_ns, kích thước) của path, None nếu không có."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class FileWatcher:
+    """Gọi callback(paths) khi các file trong paths thay đổi (hỏi mỗi interval giây)."""
+
+    def __init__(self, paths, callback, interval=5.0):
+        self.paths = list(paths)
+        self.callback = callback
+        self.interval = interval
+        self.last_error = None
+        self._known = {path: file_state(path) for path in self.paths}
+        self._pending = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._pid == os.getpid() and self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+        with self._start_lock:
+            if not self.running:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="nvda-reload", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self.running:
+            self._thread.join()
+        return self
+
+    def poll(self):
+        """Hỏi một lần; trả về (và báo cho callback) các file đã đổi và đã đứng yên."""
+        changed = []
+        for path in self.paths:
+            state = file_state(path)
+            if state == self._known[path]:
+                self._pending.pop(path, None)
+            elif self._pending.get(path, self._known[path]) == state:
+                changed.append(path)
+            else:
+                self._pending[path] = state
+        if not changed:
+            return changed
+        for path in changed:
+            self._known[path] = self._pending.pop(path)
+        try:
+            with stage("reload"):
+                self.callback(changed)
+            self.last_error = None
+        except Exception as exc:  # noqa: BLE001 - giữ dữ liệu cũ, thử lại ở lần đổi sau
+            self.last_error = exc
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
@@ -0,0 +1,149 @@
+"""Gộp nến OHLCV theo nhiều độ phân giải (5m, 1h, 1D, 1W, 1M), tính sẵn một lần.
+
+Ranh giới của mỗi nến gộp tính theo giờ của sàn (America/New_York), không theo UTC: cột
+Date có offset -04:00 (giờ mùa hè) hoặc -05:00 (giờ mùa đông), nên một phiên luôn thuộc
+đúng ngày, tuần (bắt đầu thứ Hai) và tháng của nó ở New York. Nến trong ngày (5m, 1h) được
+neo theo giờ mở cửa 9:30. Mỗi nến gộp: open của nến đầu, high lớn nhất, low nhỏ nhất,
+close của nến cuối, volume tổng; nhãn thời gian là thời điểm của nến gốc đầu tiên.
+
+Rollups tính sẵn mọi độ phân giải không mịn hơn dữ liệu gốc, mỗi bản từ bản mịn hơn gần
+nhất (PARENTS) nên chỉ bản đầu tiên phải duyệt toàn bộ dữ liệu gốc. select() chọn bản gộp
+lấp đầy khung nhìn nhiều nhất mà không vượt budget (số nến vẽ được theo độ rộng khung
+nhìn): bản mịn nhất có số nến trong khoảng đang xem <= budget; bản thô hơn để trống khung
+nhìn, bản mịn hơn gửi thừa nến. select() chỉ cắt mảng đã có thay vì gộp lại ở mỗi request.
+Dữ liệu gốc mịn hơn mọi độ phân giải (vd. nến 1 phút) là mức "base", dùng khi phóng to sát.
+
+    rollups = Rollups(df)                        # df: index Date có múi giờ, cột OHLCV
+    weekly = rollups.get("1W")
+    resolution, bars = rollups.select((x0, x1), budget=400)
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from nvda_analysis.download import EXCHANGE_TZ
+from nvda_analysis.indicators import OHLCV
+
+# Giờ mở cửa của sàn (giờ New York): mốc neo của các nến trong ngày
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+
+# Độ phân giải, từ mịn đến thô -> độ dài danh nghĩa (để so với khoảng cách của dữ liệu gốc)
+RESOLUTIONS = OrderedDict([
+    ("5m", pd.Timedelta(minutes=5)),
+    ("1h", pd.Timedelta(hours=1)),
+    ("1D", pd.Timedelta(days=1)),
+    ("1W", pd.Timedelta(weeks=1)),
+    ("1M", pd.Timedelta(days=30)),
+])
+
+BASE = "base"
+
+# Bản gộp được tính từ bản gộp mịn hơn có ranh giới lồng khớp (không từ dữ liệu gốc):
+# nến 5m neo 9:30 chia đúng giờ và nửa đêm, tuần và tháng là hợp của các ngày
+PARENTS = {"1h": "5m", "1D": "5m", "1W": "1D", "1M": "1D"}
+
+_NS_PER_DAY = 86_400 * 10 ** 9
+
+
+def _local_ns(index, tz):
+    # Số nano giây của giờ địa phương (giờ treo tường ở tz), để chia theo ngày/giờ
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert(tz).tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def bucket_keys(index, resolution, tz=EXCHANGE_TZ):
+    """Khoá nhóm (số nguyên tăng dần) của từng mốc thời gian ở độ phân giải resolution."""
+    local = _local_ns(index, tz)
+    if resolution in ("5m", "1h"):
+        return (local - SESSION_OPEN.value) // RESOLUTIONS[resolution].value
+    days = local // _NS_PER_DAY
+    if resolution == "1D":
+        return days
+    if resolution == "1W":
+        # 1970-01-01 là thứ Năm: (ngày + 3) // 7 đổi tuần vào mỗi thứ Hai
+        return (days + 3) // 7
+    if resolution == "1M":
+        months = local.astype("datetime64[ns]").astype("datetime64[M]")
+        return months.astype(np.int64)
+    raise KeyError(f"độ phân giải không hỗ trợ: {resolution}")
+
+
+def rollup(df, resolution, tz=EXCHANGE_TZ):
+    """Gộp các nến của df (đã sắp theo thời gian) theo resolution; O(n), một lượt reduceat."""
+    n = len(df)
+    if not n:
+        return df[[name for name in OHLCV if name in df]]
+    keys = bucket_keys(df.index, resolution, tz)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    out = {
+        "Open": df["Open"].to_numpy()[starts],
+        "High": np.maximum.reduceat(df["High"].to_numpy(), starts),
+        "Low": np.minimum.reduceat(df["Low"].to_numpy(), starts),
+        "Close": df["Close"].to_numpy()[ends],
+    }
+    if "Volume" in df:
+        # cộng dồn bằng kiểu 64 bit: Volume có thể là int32 (nvda_analysis.compact)
+        volume = df["Volume"].to_numpy()
+        total = volume.dtype if volume.dtype == np.uint64 else np.promote_types(volume.dtype, np.int64)
+        out["Volume"] = np.add.reduceat(volume, starts, dtype=total)
+    return pd.DataFrame(out, index=df.index[starts])
+
+
+def base_spacing(index):
+    """Khoảng cách trung vị giữa các mốc của dữ liệu gốc."""
+    if len(index) < 2:
+        return pd.Timedelta(days=1)
+    return pd.Timedelta(np.median(np.diff(pd.DatetimeIndex(index).as_unit("ns").asi8)))
+
+
+class Rollups:
+    """Các bản gộp của một bộ dữ liệu OHLCV, tính sẵn cho mọi độ phân giải dùng được."""
+
+    def __init__(self, df, tz=EXCHANGE_TZ):
+        self.tz = tz
+        spacing = base_spacing(df.index)
+        # Độ phân giải mịn hơn dữ liệu gốc không có ý nghĩa (vd. 5m từ nến ngày)
+        self.resolutions = [name for name, length in RESOLUTIONS.items() if length >= spacing * 0.99]
+        self._frames = OrderedDict()
+        if not self.resolutions or RESOLUTIONS[self.resolutions[0]] > spacing * 1.01:
+            self._frames[BASE] = df[[name for name in OHLCV if name in df]]
+            self.resolutions.insert(0, BASE)
+        for name in self.resolutions[len(self._frames):]:
+            parent = self._frames.get(PARENTS.get(name), df)
+            self._frames[name] = rollup(parent, name, tz)
+        self._times = {name: frame.index.as_unit("ns").asi8 for name, frame in self._frames.items()}
+
+    def get(self, resolution):
+        return self._frames[resolution]
+
+    def count(self, resolution, x_range=None):
+        """Số nến của resolution trong x_range = (x0, x1) (hai đầu tính cả)."""
+        times = self._times[resolution]
+        if x_range is None:
+            return len(times)
+        lo, hi = (pd.Timestamp(x).as_unit("ns").value for x in x_range)
+        return int(np.searchsorted(times, hi, "right") - np.searchsorted(times, lo, "left"))
+
+    def choose(self, x_range=None, budget=None):
+        """Độ phân giải mịn nhất có không quá budget nến trong x_range (mịn nhất nếu không
+        có budget, thô nhất nếu mọi bản gộp đều vượt budget)."""
+        if budget is None:
+            return self.resolutions[0]
+        for name in self.resolutions:
+            if self.count(name, x_range) <= budget:
+                return name
+        return self.resolutions[-1]
+
+    def select(self, x_range=None, budget=None):
+        """(độ phân giải, các nến gộp trong x_range) để vẽ với tối đa khoảng budget nến."""
+        resolution = self.choose(x_range, budget)
+        frame = self._frames[resolution]
+        if x_range is None:
+            return resolution, frame
+        times = self._times[resolution]
+        lo, hi = (pd.Timestamp(x).as_unit("ns").value for x in x_range)
+        return resolution, frame.iloc[np.searchsorted(times, lo, "left"):np.searchsorted(times, hi, "right")]
@@ -0,0 +1,119 @@
+"""Bộ dữ liệu chỉ đọc dùng chung giữa các worker qua file ánh xạ bộ nhớ (memory-map).
+
+Một tiến trình nạp (python app.py --preload) ghi mỗi bộ dữ liệu (df_raw, df_cleaned,
+df_analysis đã tính chỉ số) thành một thư mục gồm mỗi cột một file .npy và meta.json (tên
+cột, kiểu, phiên bản, mtime/kích thước các CSV nguồn). attach() mở các file .npy bằng
+np.load(mmap_mode="r") và dựng DataFrame không sao chép: mọi worker dùng chung các trang
+của page cache, nên RSS của dữ liệu không tăng theo số worker, và worker mới không phải
+parse CSV hay tính lại chỉ số.
+
+Phần mỗi worker vẫn giữ bản riêng: index thời gian (pandas sao chép khi gắn múi giờ UTC;
+các bộ dữ liệu có cùng index dùng chung một bản) và các cột thưa (Dividends, Stock Splits;
+chỉ vài phần tử khác 0).
+
+Ghi là nguyên tử: dữ liệu vào thư mục <tên>-<phiên bản>/, rồi file con trỏ <tên>.json được
+thay bằng os.replace. Worker đang dùng phiên bản cũ vẫn đọc được file đã bị xoá (Linux giữ
+file đến khi hết ánh xạ). attach() trả về None (worker tự nạp như cũ) nếu chưa có bản ghi
+hoặc CSV nguồn đã đổi so với lúc ghi.
+
+    publish(".cache/shared", "df_analysis", df, version, sources=["nvda_stock_data_cleaned.csv"])
+    df, version = attach(".cache/shared", "df_analysis", sources=["nvda_stock_data_cleaned.csv"])
+"""
+import hashlib
+import json
+import os
+import shutil
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from nvda_analysis.instrument import stage
+from nvda_analysis.loader import _source_info
+
+# Index đã dựng theo mã băm nội dung, dùng chung giữa các bộ dữ liệu của tiến trình
+_INDEXES = OrderedDict()
+_MAX_INDEXES = 4
+
+
+def pointer_path(directory, name):
+    return os.path.join(directory, name + ".json")
+
+
+def _sources(sources):
+    return {os.path.abspath(path): _source_info(path, with_hash=False) for path in sources}
+
+
+def publish(directory, name, df, version, sources=()):
+    """Ghi df (index thời gian UTC, cột số hoặc cột thưa) vào directory dưới tên name."""
+    target = os.path.join(directory, f"{name}-{version}")
+    tmp = f"{target}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    columns = []
+    for i, (column, values) in enumerate(df.items()):
+        entry = {"name": column, "file": f"{i}.npy"}
+        if isinstance(values.dtype, pd.SparseDtype):
+            array = values.array
+            entry.update(sparse=True, fill_value=float(array.fill_value), length=len(array))
+            np.save(os.path.join(tmp, entry["file"]),
+                    np.stack([array.sp_index.indices.astype(np.float64), array.sp_values.astype(np.float64)]))
+        else:
+            np.save(os.path.join(tmp, entry["file"]), np.ascontiguousarray(values.to_numpy()))
+        columns.append(entry)
+    index = np.ascontiguousarray(pd.DatetimeIndex(df.index).tz_convert("UTC").as_unit("ns").asi8)
+    np.save(os.path.join(tmp, "index.npy"), index)
+    meta = {"version": version, "index": hashlib.blake2b(index.tobytes(), digest_size=8).hexdigest(),
+            "index_name": df.index.name, "columns": columns, "sources": _sources(sources)}
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    if os.path.exists(target):
+        shutil.rmtree(tmp)
+    else:
+        os.replace(tmp, target)
+    pointer = pointer_path(directory, name)
+    with open(f"{pointer}.{os.getpid()}.tmp", "w") as f:
+        json.dump({"path": os.path.basename(target)}, f)
+    os.replace(f"{pointer}.{os.getpid()}.tmp", pointer)
+    # Bỏ các phiên bản cũ (worker đang ánh xạ chúng vẫn đọc được đến khi đóng)
+    for entry in os.listdir(directory):
+        if entry.startswith(name + "-") and entry != os.path.basename(target) and not entry.endswith(".tmp"):
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+    return target
+
+
+def _index(path, digest):
+    index = _INDEXES.get(digest)
+    if index is None:
+        values = np.load(path, mmap_mode="r")
+        index = pd.DatetimeIndex(values.view("M8[ns]"), copy=False).tz_localize("UTC")
+        _INDEXES[digest] = index
+        while len(_INDEXES) > _MAX_INDEXES:
+            _INDEXES.popitem(last=False)
+    _INDEXES.move_to_end(digest)
+    return index
+
+
+def attach(directory, name, sources=()):
+    """(DataFrame chỉ đọc ánh xạ từ file, phiên bản), hoặc None nếu chưa có hay đã cũ."""
+    try:
+        with open(pointer_path(directory, name)) as f:
+            path = os.path.join(directory, json.load(f)["path"])
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta["sources"] != _sources(sources):
+            return None
+        with stage("shared_attach:" + name):
+            index = _index(os.path.join(path, "index.npy"), meta["index"]).rename(meta["index_name"])
+            columns = {}
+            for entry in meta["columns"]:
+                values = np.load(os.path.join(path, entry["file"]), mmap_mode="r")
+                if entry.get("sparse"):
+                    dense = np.full(entry["length"], entry["fill_value"])
+                    dense[values[0].astype(np.int64)] = values[1]
+                    values = pd.arrays.SparseArray(dense, fill_value=entry["fill_value"])
+                columns[entry["name"]] = values
+            df = pd.DataFrame(columns, index=index, copy=False)
+    except (OSError, KeyError, ValueError):
+        return None
+    return df, meta["version"]
@@ -0,0 +1,208 @@
+"""Kho dữ liệu giá nhúng (SQLite), khoá theo (mã, thời điểm), thay cho việc đọc cả file CSV.
+
+Mỗi phiên là một dòng của bảng bars; bảng WITHOUT ROWID nên dữ liệu được lưu theo thứ tự
+khoá chính (symbol, ts) và một truy vấn khoảng như "NVDA, 2025-03-01..2025-04-30" chỉ là
+một lần tìm trên chỉ mục rồi đọc tuần tự các dòng trong khoảng. Thời điểm lưu dạng số
+nano giây UTC (như datetime64[ns, UTC] của load_ohlcv).
+
+Ghi chỉ nối thêm (append-only): append() bỏ qua các phiên không mới hơn phiên cuối đã
+lưu của mã đó, nên nhập lại một CSV đã cập nhật chỉ thêm các dòng mới. Cơ sở dữ liệu ở chế
+độ WAL: các tiến trình khác vẫn đọc được trong lúc có tiến trình đang ghi.
+
+read() nhận thêm warmup: số phiên đọc thêm trước start, để các chỉ số trượt (SMA, RSI,
+MACD, ...) của phiên đầu cửa sổ đúng như khi tính trên toàn bộ lịch sử; indicator_window()
+tự tính số phiên này từ đồ thị chỉ số (indicators.warmup_bars) rồi cắt bỏ sau khi tính.
+
+    store = BarStore("data/bars.sqlite")
+    store.append("NVDA", load_ohlcv("nvda_stock_data_cleaned.csv"))
+    df = store.read("NVDA", "2025-03-01", "2025-04-30")
+    df = indicator_window(store, "NVDA", "2025-03-01", "2025-04-30", ["SMA20", "RSI"])
+
+    python -m nvda_analysis.store data/bars.sqlite nvda_stock_data_cleaned.csv --symbol NVDA
+    python -m nvda_analysis.store data/bars.sqlite data/tickers/*.csv
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from nvda_analysis.indicators import DEFAULT_COLUMNS, IndicatorEngine, warmup_bars
+from nvda_analysis.loader import load_ohlcv
+
+# Cột của DataFrame -> cột của bảng bars
+FIELDS = {
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Volume": "volume",
+    "Dividends": "dividends",
+    "Stock Splits": "splits",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    open REAL, high REAL, low REAL, close REAL,
+    volume INTEGER, dividends REAL, splits REAL,
+    PRIMARY KEY (symbol, ts)
+) WITHOUT ROWID
+"""
+
+
+def _ns(value, end=False):
+    # Thời điểm -> nano giây UTC (mốc không có múi giờ được coi là UTC). Như df.loc, chuỗi
+    # thiếu phần giờ là cả khoảng đó: end="2025-04-30" tính đến hết ngày 30/4.
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        if end and isinstance(value, str):
+            ts = pd.Period(value).end_time
+        ts = ts.tz_localize("UTC")
+    return ts.tz_convert("UTC").value
+
+
+class BarStore:
+    """Bảng OHLCV của nhiều mã trong một file SQLite; mỗi thread dùng một kết nối riêng."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def symbols(self):
+        rows = self._connection().execute("SELECT DISTINCT symbol FROM bars ORDER BY symbol")
+        return [symbol for symbol, in rows]
+
+    def bounds(self, symbol):
+        """(phiên đầu, phiên cuối, số phiên) đã lưu của symbol; (None, None, 0) nếu chưa có."""
+        first, last, count = self._connection().execute(
+            "SELECT MIN(ts), MAX(ts), COUNT(*) FROM bars WHERE symbol = ?", (symbol,)
+        ).fetchone()
+        if not count:
+            return None, None, 0
+        return pd.Timestamp(first, tz="UTC"), pd.Timestamp(last, tz="UTC"), count
+
+    def version(self, symbol):
+        """Thay đổi khi symbol có thêm dòng (dùng làm khoá bộ đệm của figure/chỉ số)."""
+        first, last, count = self.bounds(symbol)
+        return f"{symbol}:{count}:{last.value if count else 0}"
+
+    def append(self, symbol, df):
+        """Nối các phiên của df (index Date có múi giờ) mới hơn phiên cuối đã lưu; trả số dòng thêm."""
+        conn = self._connection()
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index(kind="stable")
+        ts = pd.DatetimeIndex(df.index).tz_convert("UTC").as_unit("ns").asi8
+        with conn:
+            last, = conn.execute("SELECT MAX(ts) FROM bars WHERE symbol = ?", (symbol,)).fetchone()
+            keep = ts > last if last is not None else np.ones(len(ts), dtype=bool)
+            # bỏ mốc trùng trong chính df (giữ dòng sau cùng, như Downloader)
+            keep &= np.append(ts[1:] != ts[:-1], True)
+            if not keep.any():
+                return 0
+            columns = [df[name].to_numpy()[keep].tolist() if name in df else [None] * int(keep.sum())
+                       for name in FIELDS]
+            rows = zip([symbol] * int(keep.sum()), ts[keep].tolist(), *columns)
+            conn.executemany(
+                f"INSERT INTO bars (symbol, ts, {', '.join(FIELDS.values())}) "
+                f"VALUES ({', '.join('?' * (len(FIELDS) + 2))})",
+                rows,
+            )
+        return int(keep.sum())
+
+    def _warmup_start(self, symbol, start, warmup):
+        # Mốc của phiên thứ warmup trước start (hoặc phiên đầu tiên nếu không đủ)
+        row = self._connection().execute(
+            "SELECT ts FROM bars WHERE symbol = ? AND ts < ? ORDER BY ts DESC LIMIT 1 OFFSET ?",
+            (symbol, start, warmup - 1),
+        ).fetchone()
+        return row[0] if row else None
+
+    def read(self, symbol, start=None, end=None, warmup=0, columns=None):
+        """Các phiên của symbol trong [start, end] (hai đầu tính cả, như df.loc[start:end]),
+        cộng thêm warmup phiên ngay trước start. Trả DataFrame index Date (UTC) như load_ohlcv."""
+        columns = list(columns or FIELDS)
+        lo = _ns(start) if start is not None else None
+        if lo is not None and warmup > 0:
+            lo = self._warmup_start(symbol, lo, warmup)
+        where, params = ["symbol = ?"], [symbol]
+        if lo is not None:
+            where.append("ts >= ?")
+            params.append(lo)
+        if end is not None:
+            where.append("ts <= ?")
+            params.append(_ns(end, end=True))
+        rows = self._connection().execute(
+            f"SELECT ts, {', '.join(FIELDS[name] for name in columns)} FROM bars "
+            f"WHERE {' AND '.join(where)} ORDER BY ts",
+            params,
+        ).fetchall()
+        values = list(zip(*rows)) if rows else [()] * (len(columns) + 1)
+        index = pd.DatetimeIndex(np.asarray(values[0], dtype="datetime64[ns]"), name="Date").tz_localize("UTC")
+        # NULL (giá trị thiếu) -> NaN; Volume giữ kiểu số nguyên khi đủ dữ liệu
+        return pd.DataFrame({
+            name: np.asarray(column, dtype=np.float64 if None in column or not column else None)
+            for name, column in zip(columns, values[1:])
+        }, index=index)
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def indicator_window(store, symbol, start=None, end=None, names=DEFAULT_COLUMNS):
+    """OHLCV và các cột chỉ số names của symbol trong [start, end], chỉ đọc cửa sổ này cộng
+    các phiên khởi động mà các chỉ số cần (không đọc toàn bộ lịch sử)."""
+    df = store.read(symbol, start, end, warmup=warmup_bars(names))
+    engine = IndicatorEngine(df)
+    for name in names:
+        df[name] = engine.get(name)
+    if start is not None:
+        df = df[df.index >= pd.Timestamp(_ns(start), tz="UTC")]
+    return df
+
+
+def import_csv(store, path, symbol=None):
+    """Nối các dòng mới của một CSV OHLCV vào kho; symbol mặc định là tên file (<MÃ>.csv)."""
+    symbol = symbol or os.path.splitext(os.path.basename(path))[0].upper()
+    return symbol, store.append(symbol, load_ohlcv(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nhập (nối thêm) các CSV OHLCV vào kho SQLite.")
+    parser.add_argument("store")
+    parser.add_argument("csv", nargs="+")
+    parser.add_argument("--symbol", help="mã của file CSV (mặc định: tên file)")
+    args = parser.parse_args()
+    if args.symbol and len(args.csv) > 1:
+        parser.error("--symbol chỉ dùng với một file CSV")
+
+    store = BarStore(args.store)
+    for path in args.csv:
+        t0 = time.perf_counter()
+        symbol, added = import_csv(store, path, args.symbol)
+        first, last, count = store.bounds(symbol)
+        print(f"{symbol}: +{added} rows ({count} total, {first} .. {last}) in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Cập nhật chỉ số tăng dần khi có nến (bar) mới, không tính lại toàn bộ lịch sử.
+
+Mỗi nút trong đồ thị chỉ số (cùng khoá với nvda_analysis.indicators.COLUMNS) giữ trạng
+thái riêng: bộ đệm vòng của cửa sổ, tổng trượt, giá trị EMA trước đó... nên mỗi bar mới
+chỉ tốn O(1). Các phép tính lặp lại đúng thứ tự phép toán của bản batch (kernels.py và
+pandas ewm), nên khi phát lại (replay) toàn bộ dữ liệu, kết quả trùng từng bit.
+
+    stream = StreamingIndicators()
+    for bar in tail_csv("nvda_stock_data_cleaned.csv", follow=True):
+        row = stream.update(bar)    # {"SMA20": ..., "RSI": ..., ...}
+
+Bộ tính chỉ giữ trạng thái trượt, không giữ các dòng đã tính (bộ nhớ không tăng theo số
+bar của nguồn chạy mãi); StreamingIndicators(history=N) giữ N dòng gần nhất cho frame().
+"""
+import csv
+import math
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from nvda_analysis import kernels
+from nvda_analysis.indicators import COLUMNS, DEFAULT_COLUMNS, OHLCV, dependencies
+
+NAN = float("nan")
+
+
+class RollingMoments:
+    """Trung bình/độ lệch chuẩn trượt, cùng số học với kernels.rolling_mean_std."""
+
+    def __init__(self, window, with_std=True, ddof=1):
+        self.window = window
+        self.with_std = with_std
+        self.ddof = ddof
+        self.ring = np.zeros(window, dtype=np.float64)
+        self.ring_nan = np.zeros(window, dtype=bool)
+        self.nan_count = 0
+        self.count = 0      # số điểm kể từ giá trị hữu hạn đầu tiên
+        self.ref = 0.0
+        self.s1 = 0.0
+        self.s2 = 0.0
+
+    def step(self, x):
+        isnan = math.isnan(x)
+        if self.count == 0 and isnan:
+            # bỏ qua NaN ở đầu chuỗi
+            return NAN, NAN
+        w = self.window
+        i = self.count
+        pos = i % w
+        old = self.ring[pos]
+        if self.ring_nan[pos]:
+            self.nan_count -= 1
+        value = 0.0 if isnan else x
+        self.ring[pos] = value
+        self.ring_nan[pos] = isnan
+        self.nan_count += isnan
+        self.count += 1
+
+        if i < w - 1:
+            return NAN, NAN
+        if (i - (w - 1)) % kernels.anchor_every(w) == 0:
+            self.ref = kernels.anchor_ref(value)
+            window_values = np.roll(self.ring, -(pos + 1))
+            self.s1, self.s2 = kernels.anchor_sums(window_values, self.ref, self.with_std)
+        else:
+            cur = value - self.ref
+            prev = old - self.ref
+            self.s1 = self.s1 + (cur - prev)
+            if self.with_std:
+                self.s2 = self.s2 + (cur * cur - prev * prev)
+
+        if self.nan_count:
+            return NAN, NAN
+        mean = self.s1 / w + self.ref
+        if not self.with_std:
+            return mean, NAN
+        var = self.s1 * self.s1 / w
+        var = (self.s2 - var) / (w - self.ddof)
+        return mean, math.sqrt(max(var, 0.0))
+
+
+class EMA:
+    """EMA với adjust=False, lặp lại đúng vòng lặp của pandas Series.ewm(span=...).mean()."""
+
+    def __init__(self, span):
+        com = (span - 1) / 2
+        alpha = 1.0 / (1.0 + com)
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = alpha
+        self.old_wt = 1.0
+        self.weighted = None
+
+    def step(self, cur):
+        if self.weighted is None:
+            self.weighted = cur
+            return cur
+        weighted = self.weighted
+        if weighted == weighted:
+            self.old_wt *= self.old_wt_factor
+            if cur == cur:
+                if weighted != cur:
+                    weighted = self.old_wt * weighted + self.new_wt * cur
+                    weighted /= self.old_wt + self.new_wt
+                self.old_wt = 1.0
+        elif cur == cur:
+            weighted = cur
+        self.weighted = weighted
+        return weighted
+
+
+class Previous:
+    """Giữ giá trị của bar trước (cho diff / pct_change)."""
+
+    def __init__(self):
+        self.prev = None
+
+    def shift(self, x):
+        prev, self.prev = self.prev, x
+        return prev
+
+
+class RSI:
+    def __init__(self, window):
+        self.prev = Previous()
+        self.gain = RollingMoments(window, with_std=False)
+        self.loss = RollingMoments(window, with_std=False)
+
+    def step(self, close):
+        prev = self.prev.shift(close)
+        delta = NAN if prev is None else close - prev
+        if math.isnan(delta):
+            delta = 0.0
+        gain, _ = self.gain.step(max(delta, 0.0))
+        loss, _ = self.loss.step(-min(delta, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.float64(gain) / loss
+            return float(100.0 - 100.0 / (rs + 1))
+
+
+def _diff_node(params):
+    prev = Previous()
+
+    def step(x):
+        p = prev.shift(x)
+        return NAN if p is None else x - p
+    return step
+
+
+def _pct_change_node(params):
+    prev = Previous()
+
+    def step(x):
+        p = prev.shift(x)
+        if p is None:
+            return NAN
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return float(np.float64(x) / p - 1)
+    return step
+
+
+def _moments_node(params):
+    src, window = params
+    return RollingMoments(window).step
+
+
+def _ema_node(params):
+    src, span = params
+    return EMA(span).step
+
+
+def _rsi_node(params):
+    src, window = params
+    return RSI(window).step
+
+
+# loại nút -> hàm tạo bước cập nhật step(*giá trị các nút phụ thuộc)
+_STEPS = {
+    "diff": _diff_node,
+    "pct_change": _pct_change_node,
+    "rolling_moments": _moments_node,
+    "sma": lambda params: lambda moments: moments[0],
+    "rolling_std": lambda params: lambda moments: moments[1],
+    "ema": _ema_node,
+    "macd": lambda params: lambda fast, slow: fast - slow,
+    "sub": lambda params: lambda a, b: a - b,
+    "bollinger_upper": lambda params: lambda sma, std: sma + std * params[2],
+    "bollinger_lower": lambda params: lambda sma, std: sma - std * params[2],
+    "rsi": _rsi_node,
+}
+
+
+class StreamingIndicators:
+    """Bộ tính chỉ số tăng dần: update(bar) trả về giá trị mới của mọi cột trong O(1).
+
+    history: số dòng gần nhất giữ lại cho frame() (None: không giữ dòng nào).
+    """
+
+    def __init__(self, names=DEFAULT_COLUMNS, history=None):
+        self.names = list(names)
+        self._order = []
+        for name in self.names:
+            self._visit(COLUMNS[name])
+        self._plan = [(key, _STEPS[key[0]](key[1:]), dependencies(key)) for key in self._order]
+        self.history = deque(maxlen=history) if history else None
+
+    def _visit(self, key):
+        if isinstance(key, str) or key in self._order:
+            return
+        for dep in dependencies(key):
+            self._visit(dep)
+        self._order.append(key)
+
+    def update(self, bar):
+        values = {name: float(bar[name]) for name in OHLCV if name in bar}
+        for key, step, deps in self._plan:
+            values[key] = step(*[values[dep] for dep in deps])
+        row = {name: values[COLUMNS[name]] for name in self.names}
+        if self.history is not None:
+            self.history.append((bar.get("Date"), row))
+        return row
+
+    def frame(self):
+        """Các dòng giữ lại (tối đa history dòng gần nhất) thành DataFrame index Date."""
+        if self.history is None:
+            raise ValueError("StreamingIndicators(history=None) không giữ dòng nào; đặt history=N")
+        return _frame([date for date, _ in self.history], [row for _, row in self.history], self.names)
+
+
+def _frame(index, rows, names):
+    return pd.DataFrame(rows, index=pd.Index(index, name="Date"), columns=names)
+
+
+def replay(df, names=DEFAULT_COLUMNS):
+    """Phát lại df qua bộ tính tăng dần; kết quả trùng từng bit với add_indicators(df)."""
+    stream = StreamingIndicators(names)
+    rows = [stream.update(bar) for bar in df[[c for c in OHLCV if c in df]].to_dict("records")]
+    return _frame(df.index, rows, names)
+
+
+def _utc(value):
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def tail_csv(path, follow=False, poll_interval=1.0, stop=None):
+    """Đọc các bar từ file CSV (cột Date, Open, High, Low, Close, Volume, ...).
+
+    follow=True: giống `tail -f`, tiếp tục chờ các dòng mới được ghi thêm vào cuối file
+    cho tới khi stop() trả về True. follow=False: dòng cuối không có ký tự xuống dòng vẫn
+    được đọc (khi follow, đó là dòng đang được ghi dở nên phải chờ).
+    """
+    with open(path, newline="") as f:
+        header = next(csv.reader([f.readline()]))
+        pending = ""
+        while True:
+            line = f.readline()
+            if not line:
+                if not follow:
+                    bar = _bar(header, pending) if pending else None
+                    if bar is not None:
+                        yield bar
+                    return
+                if stop is not None and stop():
+                    return
+                time.sleep(poll_interval)
+                continue
+            pending += line
+            if not pending.endswith("\n"):
+                # dòng đang được ghi dở
+                continue
+            bar, pending = _bar(header, pending), ""
+            if bar is not None:
+                yield bar
+
+
+def _bar(header, line):
+    # Một dòng CSV -> dict bar (Date theo UTC); None nếu dòng trống
+    values = next(csv.reader([line]), [])
+    if not values:
+        return None
+    bar = dict(zip(header, values))
+    bar["Date"] = _utc(bar["Date"])
+    return bar
+
+
+def fake_feed(start_close=100.0, bars=None, freq="1min", start=None, seed=0, interval=0.0):
+    """Nguồn bar giả lập (random walk) để thử dashboard/stream khi không có dữ liệu thật."""
+    rng = np.random.default_rng(seed)
+    date = pd.Timestamp(start if start is not None else "2025-01-02 14:30", tz="UTC")
+    step = pd.Timedelta(freq)
+    close = start_close
+    i = 0
+    while bars is None or i < bars:
+        open_ = close
+        close = open_ * math.exp(rng.normal(0, 0.001))
+        wick = abs(rng.normal(0, 0.0005)) * open_
+        yield {
+            "Date": date,
+            "Open": open_,
+            "High": max(open_, close) + wick,
+            "Low": min(open_, close) - wick,
+            "Close": close,
+            "Volume": int(rng.integers(1_000, 100_000)),
+        }
+        date += step
+        i += 1
+        if interval:
+            time.sleep(interval)
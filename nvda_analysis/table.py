@@ -0,0 +1,186 @@
+"""Bảng dữ liệu phân trang phía server cho dash_table.DataTable.
+
+DataTable chạy ở chế độ page_action / sort_action / filter_action = "custom": trình duyệt
+chỉ gửi trang đang xem, thứ tự sắp xếp (sort_by) và chuỗi lọc (filter_query); server
+lọc/sắp xếp bằng NumPy trên toàn bộ DataFrame rồi chỉ chuyển các dòng của trang đó
+thành JSON. Thứ tự dòng sau khi lọc/sắp xếp được ghi nhớ (LRU) nên chuyển trang chỉ
+tốn một phép cắt mảng, kể cả với hàng triệu dòng.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Các phép so sánh của cú pháp filter_query (DataTable), dạng chữ -> dạng ký hiệu
+_ALIASES = {"eq": "=", "ne": "!=", "lt": "<", "le": "<=", "gt": ">", "ge": ">="}
+_OPERATORS = {"=", "!=", "<", "<=", ">", ">=", "contains", "datestartswith"}
+_TERM = re.compile(r"^\{(?P<column>[^}]+)\}\s+(?P<op>\S+)\s+(?P<value>.+)$")
+
+
+def _unquote(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'`":
+        return value[1:-1]
+    return value
+
+
+def parse_filter(query):
+    """Tách filter_query thành danh sách (cột, phép so sánh, giá trị chuỗi).
+
+    Ví dụ: '{Close} > 100 && {Date} datestartswith 2024-06'. Các phép có tiền tố
+    phân biệt hoa/thường của DataTable (i/s, như 'icontains', 's>') được coi như phép gốc.
+    """
+    terms = []
+    for part in (query or "").split(" && "):
+        match = _TERM.match(part.strip())
+        if match is None:
+            continue
+        op = match["op"].lower()
+        op = _ALIASES.get(op, op)
+        if op not in _OPERATORS and op[:1] in ("i", "s"):
+            op = _ALIASES.get(op[1:], op[1:])
+        if op in _OPERATORS:
+            terms.append((match["column"], op, _unquote(match["value"])))
+    return terms
+
+
+def _compare(values, op, value):
+    if op == "=":
+        return values == value
+    if op == "!=":
+        return values != value
+    if op == "<":
+        return values < value
+    if op == "<=":
+        return values <= value
+    if op == ">":
+        return values > value
+    return values >= value
+
+
+def _date_prefix_range(value, tz):
+    # '2024', '2024-06', '2024-06-20 04' -> [đầu, cuối] của khoảng thời gian đó
+    period = pd.Period(value)
+    start, end = period.start_time, period.end_time
+    if tz is not None:
+        start, end = start.tz_localize(tz), end.tz_localize(tz)
+    return start, end
+
+
+def _term_mask(column, op, value):
+    """Mặt nạ boolean của một điều kiện lọc trên cột (Series hoặc DatetimeIndex)."""
+    if isinstance(column, pd.DatetimeIndex) or pd.api.types.is_datetime64_any_dtype(column):
+        column = pd.DatetimeIndex(column)
+        if op in ("contains", "datestartswith"):
+            start, end = _date_prefix_range(value, column.tz)
+            return (column >= start) & (column <= end)
+        ts = pd.Timestamp(value)
+        if column.tz is not None:
+            ts = ts.tz_localize(column.tz) if ts.tzinfo is None else ts.tz_convert(column.tz)
+        return _compare(column, op, ts)
+    if op in ("contains", "datestartswith"):
+        return column.astype(str).str.contains(value, regex=False).to_numpy()
+    if pd.api.types.is_numeric_dtype(column):
+        return _compare(column.to_numpy(), op, float(value))
+    return _compare(column.astype(str).to_numpy(), op, value)
+
+
+class PagedTable:
+    """DataFrame phục vụ cho DataTable phân trang/sắp xếp/lọc phía server."""
+
+    def __init__(self, df, max_cached=16):
+        self.df = df
+        self.index_name = df.index.name or "index"
+        self.max_cached = max_cached
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _column(self, name):
+        if name == self.index_name:
+            return self.df.index
+        return self.df[name]
+
+    def columns(self):
+        """Khai báo cột cho DataTable.columns (index là cột đầu tiên)."""
+        out = []
+        for name in [self.index_name, *self.df.columns]:
+            values = self._column(name)
+            if pd.api.types.is_datetime64_any_dtype(values):
+                kind = "datetime"
+            elif pd.api.types.is_numeric_dtype(values):
+                kind = "numeric"
+            else:
+                kind = "text"
+            out.append({"name": name, "id": name, "type": kind})
+        return out
+
+    def _sort_key(self, name, descending):
+        values = self._column(name)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            # giữ int64 (float64 chỉ đúng đến 2**53 ns: các mốc cách nhau < ~256 ns sẽ bằng
+            # nhau); NaT (asi8 là giá trị int64 nhỏ nhất) được đặt cuối ở cả hai chiều
+            index = pd.DatetimeIndex(values)
+            key = -index.asi8 if descending else index.asi8.copy()
+            key[index.isna()] = np.iinfo(np.int64).max
+            return key
+        if pd.api.types.is_numeric_dtype(values):
+            key = np.asarray(values, dtype=np.float64)
+        else:
+            key = pd.factorize(np.asarray(values), sort=True)[0].astype(np.float64)
+        # đảo dấu cho chiều giảm dần; NaN vẫn nằm cuối
+        return -key if descending else key
+
+    def _compute_order(self, filter_query, sort_by):
+        rows = None
+        terms = parse_filter(filter_query)
+        if terms:
+            mask = np.ones(len(self.df), dtype=bool)
+            for name, op, value in terms:
+                try:
+                    mask &= np.asarray(_term_mask(self._column(name), op, value), dtype=bool)
+                except (KeyError, ValueError, TypeError):
+                    # cột không tồn tại hoặc giá trị không đọc được: không khớp dòng nào
+                    mask[:] = False
+            rows = np.flatnonzero(mask)
+        if sort_by:
+            # np.lexsort lấy khoá cuối làm khoá chính
+            keys = [self._sort_key(s["column_id"], s["direction"] == "desc") for s in reversed(sort_by)]
+            if rows is not None:
+                keys = [k[rows] for k in keys]
+            # một khoá: argsort (introsort) nhanh hơn lexsort ~3 lần; thứ tự các dòng bằng nhau
+            # khi đó không cố định, điều không quan trọng với một bảng hiển thị
+            order = np.argsort(keys[0]) if len(keys) == 1 else np.lexsort(keys)
+            rows = order if rows is None else rows[order]
+        return rows
+
+    def order(self, filter_query="", sort_by=()):
+        """Vị trí các dòng sau khi lọc và sắp xếp (None = giữ nguyên toàn bộ DataFrame)."""
+        sort_by = tuple((s["column_id"], s["direction"]) for s in sort_by or ())
+        key = (filter_query or "", sort_by)
+        with self._lock:
+            if key in self._orders:
+                self._orders.move_to_end(key)
+                return self._orders[key]
+        rows = self._compute_order(
+            filter_query, [{"column_id": c, "direction": d} for c, d in sort_by])
+        with self._lock:
+            self._orders[key] = rows
+            while len(self._orders) > self.max_cached:
+                self._orders.popitem(last=False)
+        return rows
+
+    def page(self, page_current=0, page_size=20, sort_by=(), filter_query=""):
+        """(records của trang, tổng số trang) cho callback của DataTable."""
+        rows = self.order(filter_query, sort_by)
+        total = len(self.df) if rows is None else len(rows)
+        page_count = max(1, -(-total // page_size))
+        start = min(page_current or 0, page_count - 1) * page_size
+        stop = start + page_size
+        chunk = self.df.iloc[start:stop] if rows is None else self.df.iloc[rows[start:stop]]
+        chunk = chunk.reset_index()
+        for name in chunk.columns:
+            if pd.api.types.is_datetime64_any_dtype(chunk[name]):
+                chunk[name] = chunk[name].astype(str)
+        return chunk.to_dict("records"), page_count